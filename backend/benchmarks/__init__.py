@@ -0,0 +1,4 @@
+"""
+성능 측정 도구
+로컬 대역(가짜 Bedrock / API Gateway 관리 API / moto DynamoDB)으로 채팅 경로 부하 테스트
+"""
@@ -0,0 +1,154 @@
+"""
+부하 테스트 실행 환경
+- DynamoDB 백엔드: moto(메모리) 또는 DynamoDB Local 등 엔드포인트
+- 핸들러가 사용하는 테이블 생성
+- 호출(invocation)별 DynamoDB API 호출 수 (botocore 이벤트 훅)와 소비 용량(RCU/WCU) 집계
+"""
+import os
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+# 핸들러 모듈에 하드코딩된 테이블과 같은 이름을 쓰도록 src 설정도 맞춤
+TABLE_PREFIX = 'nx-tt-dev-ver3'
+TABLE_ENV = {
+    'CONVERSATIONS_TABLE': f'{TABLE_PREFIX}-conversations',
+    'WEBSOCKET_TABLE': f'{TABLE_PREFIX}-websocket-connections',
+    'STREAM_CHECKPOINT_TABLE': f'{TABLE_PREFIX}-stream-checkpoints'
+}
+
+# src.config.database.TABLES에 없는 핸들러 전용 테이블
+HANDLER_TABLES: List[Dict[str, Any]] = [
+    {'name': f'{TABLE_PREFIX}-prompts', 'partition_key': 'id'},
+    {'name': f'{TABLE_PREFIX}-files', 'partition_key': 'promptId', 'sort_key': 'fileId'},
+    {'name': f'{TABLE_PREFIX}-usage-tracking', 'partition_key': 'PK', 'sort_key': 'SK'}
+]
+
+# 숫자형 키 속성 (나머지는 문자열)
+NUMBER_ATTRIBUTES = {'chunkIndex'}
+
+
+def configure_environment(dynamodb_endpoint: Optional[str] = None) -> None:
+    """핸들러 모듈 import 전에 호출 (모듈 로드 시 테이블 이름/클라이언트가 결정됨)"""
+    for key, value in TABLE_ENV.items():
+        os.environ.setdefault(key, value)
+    os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+    if dynamodb_endpoint:
+        os.environ['AWS_ENDPOINT_URL_DYNAMODB'] = dynamodb_endpoint
+    # moto/로컬 엔드포인트는 자격 증명 값을 검사하지 않음
+    os.environ.setdefault('AWS_ACCESS_KEY_ID', 'loadtest')
+    os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'loadtest')
+
+
+def start_moto():
+    """moto DynamoDB 목 시작 (moto 5의 mock_aws, 없으면 moto 4의 mock_dynamodb)"""
+    try:
+        from moto import mock_aws as mock
+    except ImportError:
+        try:
+            from moto import mock_dynamodb as mock
+        except ImportError:
+            raise SystemExit(
+                "moto is required for the in-memory DynamoDB backend: pip install 'moto[dynamodb]' "
+                "(or pass --dynamodb-endpoint to use DynamoDB Local)"
+            )
+    mocker = mock()
+    mocker.start()
+    return mocker
+
+
+def table_specs() -> List[Dict[str, Any]]:
+    """생성할 테이블 목록 (이름 중복 제거)"""
+    from src.config.database import TABLES
+
+    specs: Dict[str, Dict[str, Any]] = {}
+    for spec in list(TABLES.values()) + HANDLER_TABLES:
+        specs.setdefault(spec['name'], spec)
+    return list(specs.values())
+
+
+def _key_schema(partition_key: str, sort_key: Optional[str]) -> List[Dict[str, str]]:
+    schema = [{'AttributeName': partition_key, 'KeyType': 'HASH'}]
+    if sort_key:
+        schema.append({'AttributeName': sort_key, 'KeyType': 'RANGE'})
+    return schema
+
+
+def create_tables(dynamodb) -> List[str]:
+    """테이블 생성 (이미 있으면 건너뜀)"""
+    existing = set(dynamodb.meta.client.list_tables().get('TableNames', []))
+    created = []
+    for spec in table_specs():
+        if spec['name'] in existing:
+            continue
+        attributes = {spec['partition_key']}
+        if spec.get('sort_key'):
+            attributes.add(spec['sort_key'])
+
+        indexes = []
+        for index_name, index in spec.get('indexes', {}).items():
+            attributes.add(index['partition_key'])
+            if index.get('sort_key'):
+                attributes.add(index['sort_key'])
+            indexes.append({
+                'IndexName': index_name,
+                'KeySchema': _key_schema(index['partition_key'], index.get('sort_key')),
+                'Projection': {'ProjectionType': 'ALL'}
+            })
+
+        params = {
+            'TableName': spec['name'],
+            'KeySchema': _key_schema(spec['partition_key'], spec.get('sort_key')),
+            'AttributeDefinitions': [
+                {'AttributeName': name, 'AttributeType': 'N' if name in NUMBER_ATTRIBUTES else 'S'}
+                for name in sorted(attributes)
+            ],
+            'BillingMode': 'PAY_PER_REQUEST'
+        }
+        if indexes:
+            params['GlobalSecondaryIndexes'] = indexes
+        dynamodb.meta.client.create_table(**params)
+        created.append(spec['name'])
+    return created
+
+
+class InvocationStats:
+    """핸들러 호출 하나 동안의 DynamoDB 호출/소비 용량 집계"""
+
+    def __init__(self):
+        self.dynamodb_calls: Counter = Counter()
+        self.capacity = None
+
+    @property
+    def dynamodb_total(self) -> int:
+        return sum(self.dynamodb_calls.values())
+
+
+_current_invocation: ContextVar = ContextVar('loadtest_invocation', default=None)
+
+
+@contextmanager
+def invocation() -> Iterator[InvocationStats]:
+    """이 블록 안(같은 스레드)에서 발생한 DynamoDB 호출을 집계"""
+    from src.monitoring import capacity
+
+    stats = InvocationStats()
+    stats.capacity, capacity_token = capacity.begin()
+    token = _current_invocation.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_invocation.reset(token)
+        capacity.end(capacity_token)
+
+
+def _count_call(model=None, **kwargs) -> None:
+    stats = _current_invocation.get()
+    if stats is not None and model is not None:
+        stats.dynamodb_calls[model.name] += 1
+
+
+def install_call_counter(session) -> None:
+    """boto3 세션에 DynamoDB 호출 훅 등록 (이후 생성되는 클라이언트/리소스에 적용)"""
+    session.events.register('before-call.dynamodb', _count_call)
@@ -0,0 +1,190 @@
+"""
+부하 테스트용 AWS 대역
+- FakeBedrockRuntime: 첫 토큰 지연(TTFT) 분포와 토큰 속도를 설정할 수 있는 스트리밍 응답
+- FakeApiGatewayManagement: post_to_connection 호출을 기록만 하는 관리 API
+"""
+import json
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+from botocore.exceptions import ClientError
+
+from benchmarks.fixtures import FAKE_RESPONSE_TOKENS
+
+
+@dataclass
+class LatencyProfile:
+    """가짜 Bedrock 응답 특성"""
+
+    ttft_ms: float = 800.0          # 첫 토큰 지연 중앙값
+    ttft_sigma: float = 0.35        # 로그정규 분포 표준편차 (0이면 고정값)
+    tokens_per_second: float = 60.0
+    output_tokens: int = 300        # 응답당 토큰 수 (요청의 max_tokens가 더 작으면 그 값)
+    tokens_per_event: int = 1       # 스트림 이벤트 하나에 담는 토큰 수
+    throttle_rate: float = 0.0      # ThrottlingException 비율
+
+    def sample_ttft(self, rng: random.Random) -> float:
+        """첫 토큰 지연 (초)"""
+        if self.ttft_sigma <= 0:
+            return self.ttft_ms / 1000
+        return self.ttft_ms * math.exp(rng.gauss(0, self.ttft_sigma)) / 1000
+
+
+@dataclass
+class StreamRecord:
+    """가짜 스트림 하나의 기록"""
+
+    model_id: str
+    opened_at: float
+    first_token_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    tokens: int = 0
+    closed_early: bool = False
+
+
+def _event(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {'chunk': {'bytes': json.dumps(payload, ensure_ascii=False).encode('utf-8')}}
+
+
+class FakeEventStream:
+    """Bedrock EventStream 대역 - 일정에 맞춰 이벤트를 내보내고 close()로 중단 가능"""
+
+    def __init__(self, profile: LatencyProfile, record: StreamRecord, total_tokens: int,
+                 ttft: float, input_tokens: int):
+        self._profile = profile
+        self._record = record
+        self._total_tokens = total_tokens
+        self._ttft = ttft
+        self._input_tokens = input_tokens
+        self._closed = threading.Event()
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        record = self._record
+        yield _event({'type': 'message_start', 'message': {'usage': {'input_tokens': self._input_tokens}}})
+        yield _event({'type': 'content_block_start', 'index': 0, 'content_block': {'type': 'text', 'text': ''}})
+
+        # 토큰 i는 opened_at + ttft + i / rate 에 방출 (소비가 늦으면 그만큼 늦게 전달됨)
+        interval = 1.0 / self._profile.tokens_per_second if self._profile.tokens_per_second > 0 else 0
+        per_event = max(1, self._profile.tokens_per_event)
+        emitted = 0
+        while emitted < self._total_tokens:
+            due = record.opened_at + self._ttft + emitted * interval
+            if self._closed.wait(max(0.0, due - time.time())):
+                record.closed_early = True
+                return
+            count = min(per_event, self._total_tokens - emitted)
+            text = ''.join(
+                FAKE_RESPONSE_TOKENS[(emitted + i) % len(FAKE_RESPONSE_TOKENS)] for i in range(count)
+            )
+            if record.first_token_at is None:
+                record.first_token_at = time.time()
+            emitted += count
+            record.tokens = emitted
+            yield _event({'type': 'content_block_delta', 'index': 0, 'delta': {'type': 'text_delta', 'text': text}})
+
+        record.finished_at = time.time()
+        yield _event({'type': 'content_block_stop', 'index': 0})
+        yield _event({'type': 'message_delta', 'delta': {'stop_reason': 'end_turn'},
+                      'usage': {'output_tokens': emitted}})
+        yield _event({'type': 'message_stop'})
+
+    def close(self) -> None:
+        self._closed.set()
+        if self._record.finished_at is None:
+            self._record.closed_early = True
+            self._record.finished_at = time.time()
+
+
+class FakeBedrockRuntime:
+    """bedrock-runtime 클라이언트 대역"""
+
+    def __init__(self, profile: LatencyProfile, seed: Optional[int] = None):
+        self.profile = profile
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.streams: List[StreamRecord] = []
+        self.throttled = 0
+
+    def invoke_model_with_response_stream(self, modelId: str, body: str, **kwargs) -> Dict[str, Any]:
+        request = json.loads(body)
+        with self._lock:
+            throttle = self._rng.random() < self.profile.throttle_rate
+            ttft = self.profile.sample_ttft(self._rng)
+            if throttle:
+                self.throttled += 1
+
+        if throttle:
+            raise ClientError(
+                {'Error': {'Code': 'ThrottlingException', 'Message': 'Too many requests (fake)'},
+                 'ResponseMetadata': {'HTTPStatusCode': 429}},
+                'InvokeModelWithResponseStream'
+            )
+
+        total_tokens = self.profile.output_tokens
+        if request.get('max_tokens'):
+            total_tokens = min(total_tokens, int(request['max_tokens']))
+        input_chars = len(request.get('system', '')) + sum(
+            len(m.get('content', '')) if isinstance(m.get('content'), str) else 0
+            for m in request.get('messages', [])
+        )
+
+        record = StreamRecord(model_id=modelId, opened_at=time.time())
+        with self._lock:
+            self.streams.append(record)
+        return {
+            'body': FakeEventStream(self.profile, record, total_tokens, ttft, max(1, input_chars // 2)),
+            'contentType': 'application/json'
+        }
+
+
+class _GoneException(Exception):
+    """API Gateway GoneException 대역"""
+
+
+class _Exceptions:
+    GoneException = _GoneException
+
+
+@dataclass
+class PostRecord:
+    """post_to_connection 호출 기록"""
+
+    connection_id: str
+    posted_at: float
+    size: int
+    message: Dict[str, Any] = field(default_factory=dict)
+
+
+class FakeApiGatewayManagement:
+    """apigatewaymanagementapi 클라이언트 대역 - 연결별 전송 기록"""
+
+    exceptions = _Exceptions
+
+    def __init__(self, post_latency_ms: float = 0.0):
+        self.post_latency = post_latency_ms / 1000
+        self._lock = threading.Lock()
+        self._posts: Dict[str, List[PostRecord]] = {}
+        self._gone = set()
+
+    def post_to_connection(self, ConnectionId: str, Data: Any) -> Dict[str, Any]:
+        if ConnectionId in self._gone:
+            raise _GoneException(f"Connection {ConnectionId} is gone")
+        if self.post_latency:
+            time.sleep(self.post_latency)
+        raw = Data if isinstance(Data, (bytes, bytearray)) else str(Data).encode('utf-8')
+        record = PostRecord(ConnectionId, time.time(), len(raw), json.loads(raw))
+        with self._lock:
+            self._posts.setdefault(ConnectionId, []).append(record)
+        return {}
+
+    def disconnect(self, connection_id: str) -> None:
+        """이후 전송을 GoneException으로 실패시킴"""
+        self._gone.add(connection_id)
+
+    def posts(self, connection_id: str) -> List[PostRecord]:
+        with self._lock:
+            return list(self._posts.get(connection_id, []))
@@ -0,0 +1,160 @@
+"""
+벤치마크 공용 한국어 픽스처
+실제 서비스 입력과 비슷한 길이/문자 구성의 기사 본문, 지침, 사용자 메시지
+"""
+from typing import Dict, List
+
+# 보도자료 → 기사 변환 요청 (실제 T5/H8 엔진 입력 형태)
+USER_MESSAGES: List[str] = [
+    "다음 보도자료를 바탕으로 경제면 기사 제목 5개를 제안해 주세요.\n\n"
+    "한국은행은 17일 금융통화위원회를 열고 기준금리를 연 3.50%로 동결했다. "
+    "물가 상승률이 둔화 흐름을 보이고 있으나 가계부채 증가세와 환율 변동성이 여전히 크다는 판단이다.",
+    "아래 기사를 300자 이내로 요약하고, 핵심 수치를 빠짐없이 포함해 주세요.\n\n"
+    "산업통상자원부에 따르면 지난달 수출은 전년 같은 달보다 12.4% 증가한 582억 달러를 기록했다. "
+    "반도체 수출이 41% 늘며 증가세를 이끌었고, 자동차와 선박도 두 자릿수 증가율을 보였다. "
+    "무역수지는 38억 달러 흑자로 8개월 연속 흑자 기조를 이어갔다.",
+    "이 문장을 더 간결하게 다듬어 주세요: 정부는 이번 대책을 통해 서민들의 주거 부담을 "
+    "덜어주고 주택 시장의 안정을 도모하는 한편 공급 확대를 적극적으로 추진해 나갈 계획이라고 밝혔다.",
+    "부제목 3개와 리드 문단을 작성해 주세요. 주제: 중소기업 디지털 전환 지원 사업 확대",
+]
+
+# 엔진별 시스템 지침
+PROMPT_INSTRUCTIONS: Dict[str, str] = {
+    'T5': (
+        "당신은 서울경제신문의 편집 기자입니다. 제목은 20자 이내로 작성하고, "
+        "과장 표현과 물음표를 사용하지 않습니다. 숫자는 아라비아 숫자로 표기합니다."
+    ),
+    'H8': (
+        "당신은 서울경제신문의 데스크입니다. 기사는 역피라미드 구조로 작성하며, "
+        "첫 문단에 육하원칙을 모두 담습니다. 출처가 불분명한 수치는 사용하지 않습니다."
+    )
+}
+
+PROMPT_DESCRIPTIONS: Dict[str, str] = {
+    'T5': '경제 기사 제목 생성 엔진',
+    'H8': '기사 본문 작성/교열 엔진'
+}
+
+# 지식베이스 파일 (표기 원칙) - 반복해 실제 파일 크기 수준으로 키움
+STYLE_GUIDE = (
+    "# 서울경제 표기 원칙\n"
+    "1. 기관명은 처음 등장할 때 정식 명칭을 쓰고 이후 약칭을 쓴다. 예) 한국은행(한은)\n"
+    "2. 금액은 '억 원', '조 원' 단위로 띄어 쓴다.\n"
+    "3. 퍼센트는 '%'로, 퍼센트포인트는 '%포인트'로 표기한다.\n"
+    "4. 인용문은 큰따옴표로 묶고, 발언자의 직함을 함께 쓴다.\n"
+) * 40
+
+# 가짜 모델 응답 어휘 - 모든 토큰이 정확히 FAKE_TOKEN_CHARS 글자 (전달된 글자 수로 토큰 수 역산)
+FAKE_TOKEN_CHARS = 3
+FAKE_RESPONSE_TOKENS: List[str] = [
+    '한은 ', '금리 ', '동결 ', '물가 ', '둔화 ', '수출 ', '증가 ', '반도 ', '체가 ', '견인 ',
+    '무역 ', '흑자 ', '기조 ', '유지 ', '정부 ', '대책 ', '발표 ', '시장 ', '안정 ', '했다.'
+]
+
+# 마이크로벤치마크용 대용량 픽스처 -------------------------------------------------
+
+# 관리자 지침 (실제 운영 지침 길이 수준, 개수/길이/형식/금지 제약 포함)
+LONG_GUIDELINES = "\n".join([
+    "[역할] 당신은 서울경제신문 온라인 편집국의 제목 전문 에디터입니다.",
+    "[출력] 제목은 정확히 5개를 번호 목록으로 작성하고, 각 제목은 15~30자로 작성합니다.",
+    "[필수 항목] 각 제목 앞에 \"유형\"과 \"핵심 키워드\"를 표시합니다.",
+    "[금지] 물음표, 느낌표, 말줄임표는 사용하지 마세요. 확인되지 않은 수치는 제외합니다.",
+    "[문체] 유형마다 문체와 어조를 다르게 하고, 띄어쓰기와 맞춤법을 반드시 지킵니다.",
+] + [
+    f"{i}. 예시 유형 {i}: 정부 정책 발표 기사는 주체와 정책명을 앞세우고, 시장 반응은 뒤에 배치한다. "
+    f"수치는 원문 그대로 쓰되 단위는 '억 원', '%포인트'로 통일한다."
+    for i in range(1, 61)
+])
+
+# 제약을 대체로 만족하는 모델 응답 (검증 경로 전체를 통과하도록)
+MODEL_RESPONSE = "\n".join([
+    "1. 유형: 정책형 - 한은 기준금리 3.50% 동결 결정",
+    "2. 유형: 시장형 - 금리 동결에 채권시장 강세 흐름 지속",
+    "3. 유형: 해설형 - 물가 둔화에도 가계부채가 발목 잡아",
+    "4. 유형: 전망형 - 연내 인하 가능성 놓고 시장 전망 엇갈려",
+    "5. 유형: 인물형 - 이창용 총재 환율 변동성 여전히 크다",
+])
+
+# 대용량 지식베이스 파일 (약 200KB)
+LARGE_KNOWLEDGE_FILE = STYLE_GUIDE * 12
+
+
+def conversation_item(message_count: int = 50) -> dict:
+    """DynamoDB에서 읽은 형태의 대화 아이템 (사용자/어시스턴트 메시지 교대)"""
+    messages = []
+    for i in range(message_count):
+        if i % 2 == 0:
+            content = USER_MESSAGES[(i // 2) % len(USER_MESSAGES)]
+            role = 'user'
+        else:
+            content = MODEL_RESPONSE + "\n\n" + STYLE_GUIDE[:600 * (1 + i % 4)]
+            role = 'assistant'
+        messages.append({
+            'id': f'msg-{i:03d}',
+            'type': role,
+            'role': role,
+            'content': content,
+            'timestamp': f'2024-05-01T09:{i // 60:02d}:{i % 60:02d}Z',
+            'metadata': {'engine': 'T5'}
+        })
+    return {
+        'conversationId': 'bench-conversation',
+        'userId': 'bench@sedaily.com',
+        'engineType': 'T5',
+        'title': '기준금리 동결 기사 제목',
+        'messages': messages,
+        'createdAt': '2024-05-01T09:00:00Z',
+        'updatedAt': '2024-05-01T09:30:00Z',
+        'metadata': {}
+    }
+
+
+def prompt_item(file_count: int = 3) -> dict:
+    """DynamoDB에서 읽은 형태의 프롬프트 아이템 (지식베이스 파일 본문 포함)"""
+    return {
+        'promptId': 'bench-prompt',
+        'userId': 'bench@sedaily.com',
+        'engineType': 'T5',
+        'promptName': '경제 기사 제목',
+        'prompt': {
+            'description': PROMPT_DESCRIPTIONS['T5'],
+            'instruction': LONG_GUIDELINES,
+            'metadata': {}
+        },
+        'files': [
+            {
+                'fileName': f'표기원칙_{i}.md',
+                'fileContent': LARGE_KNOWLEDGE_FILE,
+                'fileType': 'text',
+                'metadata': {}
+            }
+            for i in range(file_count)
+        ],
+        'createdAt': '2024-05-01T09:00:00Z',
+        'updatedAt': '2024-05-01T09:30:00Z',
+        'isPublic': False,
+        'metadata': {}
+    }
+
+
+def usage_items(months: int = 12) -> list:
+    """사용량 테이블 조회 결과 형태 (Decimal 값)"""
+    from decimal import Decimal
+
+    items = []
+    for engine in ('T5', 'H8'):
+        for month in range(1, months + 1):
+            items.append({
+                'PK': 'user#bench@sedaily.com',
+                'SK': f'engine#{engine}#2024-{month:02d}',
+                'userId': 'bench@sedaily.com',
+                'engineType': engine,
+                'yearMonth': f'2024-{month:02d}',
+                'totalTokens': Decimal(120000 + month * 1000),
+                'inputTokens': Decimal(80000 + month * 700),
+                'outputTokens': Decimal(40000 + month * 300),
+                'messageCount': Decimal(300 + month),
+                'estimatedCost': Decimal('12.3456'),
+                'dailyUsage': {f'2024-{month:02d}-{d:02d}': Decimal(d * 100) for d in range(1, 29)}
+            })
+    return items
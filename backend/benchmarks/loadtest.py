@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""
+채팅 경로 로컬 부하 테스트
+handlers/websocket/message.handler와 REST 핸들러를 로컬 대역 위에서 동시 세션으로 실행하고
+TTFT, 토큰 속도, 턴당 WebSocket 전송 수, 턴당 DynamoDB 호출 수를 보고
+
+사용법 (backend 디렉터리에서):
+    python -m benchmarks.loadtest --sessions 20 --turns 3
+    python -m benchmarks.loadtest --sessions 50 --ttft-ms 1200 --tokens-per-second 40 --rest --json report.json
+    python -m benchmarks.loadtest --dynamodb-endpoint http://localhost:8000   # DynamoDB Local
+"""
+import argparse
+import importlib
+import json
+import logging
+import math
+import os
+import random
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import environment  # noqa: E402
+from benchmarks.fakes import FakeApiGatewayManagement, FakeBedrockRuntime, LatencyProfile  # noqa: E402
+from benchmarks.fixtures import (  # noqa: E402
+    FAKE_TOKEN_CHARS,
+    PROMPT_DESCRIPTIONS,
+    PROMPT_INSTRUCTIONS,
+    STYLE_GUIDE,
+    USER_MESSAGES
+)
+
+logger = logging.getLogger('loadtest')
+
+HANDLER_MODULES = {
+    'websocket.message': 'handlers.websocket.message',
+    'api.conversation': 'handlers.api.conversation',
+    'api.prompt': 'handlers.api.prompt',
+    'api.usage': 'handlers.api.usage'
+}
+
+
+class _LambdaContext:
+    """Lambda context 대역"""
+
+    function_name = 'loadtest'
+    memory_limit_in_mb = 1024
+
+    def __init__(self, timeout_seconds: float = 900):
+        self.aws_request_id = str(uuid.uuid4())
+        self._deadline = time.time() + timeout_seconds
+
+    def get_remaining_time_in_millis(self) -> int:
+        return max(0, int((self._deadline - time.time()) * 1000))
+
+
+@dataclass
+class TurnResult:
+    session: int
+    turn: int
+    status_code: int
+    latency_ms: float
+    ttft_ms: Optional[float]
+    tokens: float
+    tokens_per_second: Optional[float]
+    posts: int
+    post_bytes: int
+    dynamodb_calls: int
+    request_bytes: int = 0
+    read_capacity: float = 0.0
+    write_capacity: float = 0.0
+    dynamodb_by_operation: Dict[str, int] = field(default_factory=dict)
+    capacity_by_table: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+
+@dataclass
+class RestResult:
+    route: str
+    status_code: int
+    latency_ms: float
+    dynamodb_calls: int
+    read_capacity: float = 0.0
+    write_capacity: float = 0.0
+
+
+def _percentile(values: List[float], percentile: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, int(math.ceil(percentile / 100 * len(ordered))) - 1)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+def summarize(values: List[Optional[float]]) -> Dict[str, Optional[float]]:
+    present = [v for v in values if v is not None]
+    if not present:
+        return {'count': 0, 'mean': None, 'p50': None, 'p95': None, 'p99': None, 'max': None}
+    return {
+        'count': len(present),
+        'mean': sum(present) / len(present),
+        'p50': _percentile(present, 50),
+        'p95': _percentile(present, 95),
+        'p99': _percentile(present, 99),
+        'max': max(present)
+    }
+
+
+class Harness:
+    """대역 구성과 세션 실행"""
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.bedrock = FakeBedrockRuntime(
+            LatencyProfile(
+                ttft_ms=args.ttft_ms,
+                ttft_sigma=args.ttft_sigma,
+                tokens_per_second=args.tokens_per_second,
+                output_tokens=args.output_tokens,
+                tokens_per_event=args.tokens_per_event,
+                throttle_rate=args.throttle_rate
+            ),
+            seed=args.seed
+        )
+        self.apigateway = FakeApiGatewayManagement(args.post_latency_ms)
+        self.handlers: Dict[str, Callable] = {}
+        self.unavailable: Dict[str, str] = {}
+        self.rest_results: List[RestResult] = []
+
+    def setup(self) -> None:
+        import boto3
+
+        boto3.setup_default_session(region_name=os.environ['AWS_DEFAULT_REGION'])
+        environment.install_call_counter(boto3.DEFAULT_SESSION)
+
+        # 핸들러 모듈이 import 시 만드는 Bedrock 클라이언트를 대역으로 교체
+        from lib import bedrock_transport
+        bedrock_transport._client = self.bedrock
+
+        created = environment.create_tables(boto3.resource('dynamodb'))
+        logger.info(f"Created tables: {', '.join(created) or '(none)'}")
+
+        for name, module_name in HANDLER_MODULES.items():
+            try:
+                self.handlers[name] = importlib.import_module(module_name).handler
+            except ImportError as e:
+                self.unavailable[name] = str(e)
+
+        self._seed_prompts()
+
+    def _seed_prompts(self) -> None:
+        import boto3
+
+        table = boto3.resource('dynamodb').Table(f'{environment.TABLE_PREFIX}-prompts')
+        for engine, instruction in PROMPT_INSTRUCTIONS.items():
+            table.put_item(Item={
+                'id': engine,
+                'description': PROMPT_DESCRIPTIONS[engine],
+                'instruction': instruction,
+                'updatedAt': '2024-01-01T00:00:00Z'
+            })
+            if 'api.prompt' in self.handlers:
+                self.handlers['api.prompt']({
+                    'httpMethod': 'POST',
+                    'path': f'/prompts/{engine}/files',
+                    'pathParameters': {'promptId': engine},
+                    'body': json.dumps({'fileName': '표기원칙.md', 'fileContent': STYLE_GUIDE}, ensure_ascii=False)
+                }, _LambdaContext())
+
+    def _apigateway_client(self, real_client: Callable) -> Callable:
+        def client(service_name, *args, **kwargs):
+            if service_name == 'apigatewaymanagementapi':
+                return self.apigateway
+            return real_client(service_name, *args, **kwargs)
+        return client
+
+    def run(self) -> Dict[str, Any]:
+        import boto3
+
+        args = self.args
+        started = time.time()
+        turns: List[TurnResult] = []
+        with mock.patch.object(boto3, 'client', self._apigateway_client(boto3.client)):
+            if 'websocket.message' in self.handlers:
+                with ThreadPoolExecutor(max_workers=args.sessions, thread_name_prefix='session') as executor:
+                    for session_turns in executor.map(self.run_session, range(args.sessions)):
+                        turns.extend(session_turns)
+        elapsed = time.time() - started
+        return self.report(turns, elapsed)
+
+    def run_session(self, index: int) -> List[TurnResult]:
+        import boto3
+
+        args = self.args
+        rng = random.Random(None if args.seed is None else args.seed + index)
+        connection_id = f'loadtest-{index:04d}'
+        user_id = f'loadtest-{index:04d}@example.com'
+        engine = args.engines[index % len(args.engines)]
+
+        # $connect 핸들러가 남기는 연결 아이템
+        boto3.resource('dynamodb').Table(os.environ['WEBSOCKET_TABLE']).put_item(Item={
+            'connectionId': connection_id,
+            'userId': user_id,
+            'engineType': engine,
+            'connectedAt': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'ttl': int(time.time()) + 3600
+        })
+
+        # 세션 시작 시점 분산
+        time.sleep(rng.uniform(0, args.ramp_up_seconds))
+
+        conversation_id = None
+        history: List[Dict[str, str]] = []
+        results = []
+        for turn in range(args.turns):
+            message = USER_MESSAGES[(index + turn) % len(USER_MESSAGES)]
+            result, conversation_id, response = self.send_message(
+                index, turn, connection_id, user_id, engine, message, conversation_id, history
+            )
+            results.append(result)
+            history.extend([
+                {'role': 'user', 'content': message},
+                {'role': 'assistant', 'content': response}
+            ])
+            if args.rest:
+                self.run_rest(user_id, engine, conversation_id)
+            if args.think_ms:
+                time.sleep(rng.expovariate(1000 / args.think_ms))
+        return results
+
+    def send_message(self, index, turn, connection_id, user_id, engine, message, conversation_id, history):
+        body = {
+            'action': 'sendMessage',
+            'message': message,
+            'engineType': engine,
+            'conversationId': conversation_id,
+            'userId': user_id
+        }
+        if not (self.args.server_history and conversation_id):
+            # --server-history면 히스토리를 보내지 않고 서버 저장본 사용 (턴당 요청 크기 일정)
+            body['conversationHistory'] = history
+        event = {
+            'requestContext': {
+                'connectionId': connection_id,
+                'domainName': 'loadtest.local',
+                'stage': 'bench',
+                'routeKey': 'sendMessage'
+            },
+            'body': json.dumps(body, ensure_ascii=False)
+        }
+
+        posted_before = len(self.apigateway.posts(connection_id))
+        with environment.invocation() as stats:
+            started = time.time()
+            response = self.handlers['websocket.message'](event, _LambdaContext())
+            finished = time.time()
+        posts = self.apigateway.posts(connection_id)[posted_before:]
+
+        chunks = [p for p in posts if p.message.get('type') == 'ai_chunk']
+        text = ''.join(p.message.get('chunk', '') for p in chunks)
+        tokens = len(text) / FAKE_TOKEN_CHARS
+        stream_seconds = chunks[-1].posted_at - chunks[0].posted_at if len(chunks) > 1 else 0
+        end = next((p.message for p in posts if p.message.get('type') == 'chat_end'), {})
+
+        result = TurnResult(
+            session=index,
+            turn=turn,
+            status_code=int(response.get('statusCode', 0)),
+            latency_ms=(finished - started) * 1000,
+            ttft_ms=(chunks[0].posted_at - started) * 1000 if chunks else None,
+            tokens=tokens,
+            tokens_per_second=tokens / stream_seconds if stream_seconds > 0 else None,
+            posts=len(posts),
+            post_bytes=sum(p.size for p in posts),
+            request_bytes=len(event['body'].encode('utf-8')),
+            dynamodb_calls=stats.dynamodb_total,
+            read_capacity=stats.capacity.read,
+            write_capacity=stats.capacity.write,
+            dynamodb_by_operation=dict(stats.dynamodb_calls),
+            capacity_by_table={t: dict(u) for t, u in stats.capacity.by_table.items()}
+        )
+        return result, end.get('conversationId', conversation_id), text
+
+    def run_rest(self, user_id: str, engine: str, conversation_id: Optional[str]) -> None:
+        requests = []
+        if 'api.conversation' in self.handlers:
+            requests.append(('GET /conversations', 'api.conversation', {
+                'httpMethod': 'GET',
+                'pathParameters': None,
+                'queryStringParameters': {'userId': user_id, 'engineType': engine}
+            }))
+            if conversation_id:
+                requests.append(('GET /conversations/{id}', 'api.conversation', {
+                    'httpMethod': 'GET',
+                    'pathParameters': {'conversationId': conversation_id}
+                }))
+        if 'api.prompt' in self.handlers:
+            requests.append(('GET /prompts/{id}', 'api.prompt', {
+                'httpMethod': 'GET',
+                'path': f'/prompts/{engine}',
+                'pathParameters': {'promptId': engine}
+            }))
+        if 'api.usage' in self.handlers:
+            requests.append(('GET /usage/{userId}/all', 'api.usage', {
+                'httpMethod': 'GET',
+                'pathParameters': {'userId': user_id, 'engineType': 'all'}
+            }))
+
+        for route, handler_name, event in requests:
+            with environment.invocation() as stats:
+                started = time.time()
+                response = self.handlers[handler_name](event, _LambdaContext())
+                latency = (time.time() - started) * 1000
+            self.rest_results.append(RestResult(
+                route, int(response.get('statusCode', 0)), latency, stats.dynamodb_total,
+                stats.capacity.read, stats.capacity.write
+            ))
+
+    def report(self, turns: List[TurnResult], elapsed: float) -> Dict[str, Any]:
+        status_counts: Dict[str, int] = {}
+        for t in turns:
+            status_counts[str(t.status_code)] = status_counts.get(str(t.status_code), 0) + 1
+
+        operations: Dict[str, int] = {}
+        tables: Dict[str, Dict[str, float]] = {}
+        for t in turns:
+            for op, count in t.dynamodb_by_operation.items():
+                operations[op] = operations.get(op, 0) + count
+            for table, usage in t.capacity_by_table.items():
+                total = tables.setdefault(table, {'read': 0.0, 'write': 0.0})
+                total['read'] += usage['read']
+                total['write'] += usage['write']
+
+        rest: Dict[str, Any] = {}
+        for route in sorted({r.route for r in self.rest_results}):
+            results = [r for r in self.rest_results if r.route == route]
+            rest[route] = {
+                'latency_ms': summarize([r.latency_ms for r in results]),
+                'dynamodb_calls': summarize([r.dynamodb_calls for r in results]),
+                'read_capacity': summarize([r.read_capacity for r in results]),
+                'write_capacity': summarize([r.write_capacity for r in results]),
+                'errors': sum(1 for r in results if r.status_code >= 400)
+            }
+
+        streams = self.bedrock.streams
+        return {
+            'config': {k: v for k, v in vars(self.args).items() if k != 'json'},
+            'unavailable_handlers': self.unavailable,
+            'elapsed_seconds': elapsed,
+            'turns': len(turns),
+            'turns_per_second': len(turns) / elapsed if elapsed > 0 else None,
+            'status_codes': status_counts,
+            'turn_latency_ms': summarize([t.latency_ms for t in turns]),
+            'ttft_ms': summarize([t.ttft_ms for t in turns]),
+            'tokens_per_second': summarize([t.tokens_per_second for t in turns]),
+            'posts_per_turn': summarize([t.posts for t in turns]),
+            'post_bytes_per_turn': summarize([t.post_bytes for t in turns]),
+            'request_bytes_per_turn': summarize([t.request_bytes for t in turns]),
+            'dynamodb_calls_per_turn': summarize([t.dynamodb_calls for t in turns]),
+            'read_capacity_per_turn': summarize([t.read_capacity for t in turns]),
+            'write_capacity_per_turn': summarize([t.write_capacity for t in turns]),
+            'dynamodb_operations': {
+                op: count / len(turns) for op, count in sorted(operations.items())
+            } if turns else {},
+            'capacity_per_turn_by_table': {
+                table: {k: v / len(turns) for k, v in usage.items()}
+                for table, usage in sorted(tables.items(), key=lambda i: -(i[1]['read'] + i[1]['write']))
+            } if turns else {},
+            'bedrock': {
+                'streams': len(streams),
+                'throttled': self.bedrock.throttled,
+                'closed_early': sum(1 for s in streams if s.closed_early)
+            },
+            'rest': rest,
+            'turn_results': [asdict(t) for t in turns] if self.args.per_turn else None
+        }
+
+
+def _fmt(value: Optional[float]) -> str:
+    return '-' if value is None else f'{value:,.1f}'
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    for name, reason in report['unavailable_handlers'].items():
+        print(f"[skipped] {name}: {reason}")
+
+    print(f"\nturns: {report['turns']}  elapsed: {report['elapsed_seconds']:.1f}s  "
+          f"throughput: {_fmt(report['turns_per_second'])} turns/s  status: {report['status_codes']}")
+    print(f"bedrock streams: {report['bedrock']['streams']}  throttled: {report['bedrock']['throttled']}  "
+          f"closed early: {report['bedrock']['closed_early']}\n")
+
+    header = f"{'metric':<26}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}"
+    print(header)
+    print('-' * len(header))
+    for key in ('turn_latency_ms', 'ttft_ms', 'tokens_per_second', 'posts_per_turn',
+                'post_bytes_per_turn', 'request_bytes_per_turn', 'dynamodb_calls_per_turn',
+                'read_capacity_per_turn', 'write_capacity_per_turn'):
+        s = report[key]
+        print(f"{key:<26}{_fmt(s['mean']):>10}{_fmt(s['p50']):>10}{_fmt(s['p95']):>10}"
+              f"{_fmt(s['p99']):>10}{_fmt(s['max']):>10}")
+
+    if report['dynamodb_operations']:
+        print('\nDynamoDB calls per turn by operation:')
+        for op, count in report['dynamodb_operations'].items():
+            print(f"  {op:<24}{count:>8.2f}")
+
+    if report['capacity_per_turn_by_table']:
+        print('\nConsumed capacity per turn by table (RCU / WCU):')
+        for table, usage in report['capacity_per_turn_by_table'].items():
+            print(f"  {table:<40}{usage['read']:>8.2f}{usage['write']:>8.2f}")
+
+    if report['rest']:
+        # 요청당 소비 용량이 큰 경로부터
+        routes = sorted(
+            report['rest'].items(),
+            key=lambda i: -((i[1]['read_capacity']['mean'] or 0) + (i[1]['write_capacity']['mean'] or 0))
+        )
+        print(f"\n{'route':<28}{'p50 ms':>10}{'p95 ms':>10}{'ddb/req':>10}{'RCU/req':>10}{'WCU/req':>10}{'errors':>8}")
+        for route, s in routes:
+            print(f"{route:<28}{_fmt(s['latency_ms']['p50']):>10}{_fmt(s['latency_ms']['p95']):>10}"
+                  f"{_fmt(s['dynamodb_calls']['mean']):>10}{_fmt(s['read_capacity']['mean']):>10}"
+                  f"{_fmt(s['write_capacity']['mean']):>10}{s['errors']:>8}")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='채팅 경로 로컬 부하 테스트')
+    parser.add_argument('--sessions', type=int, default=10, help='동시 WebSocket 세션 수')
+    parser.add_argument('--turns', type=int, default=3, help='세션당 대화 턴 수')
+    parser.add_argument('--engines', nargs='+', default=['T5', 'H8'])
+    parser.add_argument('--ramp-up-seconds', type=float, default=1.0, help='세션 시작 분산 구간')
+    parser.add_argument('--think-ms', type=float, default=0, help='턴 사이 평균 대기 (지수 분포)')
+    parser.add_argument('--rest', action='store_true', help='턴마다 REST 조회 요청도 실행')
+    parser.add_argument('--server-history', action='store_true',
+                        help='conversationHistory를 보내지 않고 서버 저장본 사용')
+
+    parser.add_argument('--ttft-ms', type=float, default=800, help='가짜 Bedrock 첫 토큰 지연 중앙값')
+    parser.add_argument('--ttft-sigma', type=float, default=0.35, help='첫 토큰 지연 로그정규 표준편차')
+    parser.add_argument('--tokens-per-second', type=float, default=60)
+    parser.add_argument('--output-tokens', type=int, default=300)
+    parser.add_argument('--tokens-per-event', type=int, default=1)
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='ThrottlingException 비율')
+    parser.add_argument('--post-latency-ms', type=float, default=0, help='post_to_connection 지연')
+
+    parser.add_argument('--dynamodb-endpoint', help='moto 대신 사용할 DynamoDB 엔드포인트 (DynamoDB Local)')
+    parser.add_argument('--seed', type=int, default=1, help='난수 시드 (재현용)')
+    parser.add_argument('--json', help='보고서 JSON 저장 경로')
+    parser.add_argument('--per-turn', action='store_true', help='보고서에 턴별 결과 포함')
+    parser.add_argument('--verbose', action='store_true', help='핸들러 INFO 로그 출력')
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    if not args.verbose:
+        # 핸들러 로거는 setup_logger에서 INFO로 고정되므로 전역으로 차단
+        logging.disable(logging.INFO)
+
+    environment.configure_environment(args.dynamodb_endpoint)
+    mocker = None if args.dynamodb_endpoint else environment.start_moto()
+    try:
+        harness = Harness(args)
+        harness.setup()
+        report = harness.run()
+    finally:
+        if mocker is not None:
+            mocker.stop()
+
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2, default=str)
+        print(f"\nreport written to {args.json}")
+
+    # 대상 핸들러를 하나라도 불러오지 못했거나 측정한 턴이 없으면 실패 처리 (일부만 측정한 결과를 기준치로 쓰지 않도록)
+    if report['unavailable_handlers'] or not report['turns']:
+        print(f"\nerror: {len(report['unavailable_handlers'])} handler(s) skipped, {report['turns']} turns measured",
+              file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+메시지 경로 순수 함수 마이크로벤치마크
+한국어 픽스처로 호출당 시간을 측정하고, 저장된 기준값과 비교해 임계값 이상 느려지면 실패
+
+사용법 (backend 디렉터리에서):
+    python -m benchmarks.micro run                       # 측정 결과 출력
+    python -m benchmarks.micro run --filter Conversation # 이름에 Conversation이 들어간 항목만
+    python -m benchmarks.micro save                      # 기준값 저장 (benchmarks/baselines/micro.json)
+    python -m benchmarks.micro compare --threshold 0.15  # 기준 대비 15% 이상 느려지면 종료 코드 1
+"""
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import re
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import fixtures  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines', 'micro.json')
+
+# 환경 중 선택 의존성 항목 (기준과 다르면 compare를 거부)
+DEPENDENCY_KEYS = ('json_backend', 'zstandard', 'brotli')
+
+# 허용 저하 비율의 하한 = 측정 잡음(표준편차/최솟값)의 배수 - 잡음이 큰 항목은 임계값보다 크게 잡음
+NOISE_FACTOR = 2.0
+
+# 이름 → 준비 함수 (준비 함수는 측정할 인자 없는 호출 가능 객체를 반환)
+BENCHMARKS: Dict[str, Callable[[], Callable[[], Any]]] = {}
+
+
+def benchmark(name: str) -> Callable:
+    """벤치마크 등록 데코레이터"""
+    def decorator(setup: Callable[[], Callable[[], Any]]) -> Callable[[], Callable[[], Any]]:
+        BENCHMARKS[name] = setup
+        return setup
+    return decorator
+
+
+@benchmark('ConstraintExtractor.extract')
+def _constraint_extract():
+    from lib.bedrock_client_enhanced import ConstraintExtractor
+
+    text = fixtures.LONG_GUIDELINES + " " + fixtures.USER_MESSAGES[0]
+    return lambda: ConstraintExtractor.extract(text)
+
+
+@benchmark('ResponseValidator.validate')
+def _response_validate():
+    from lib.bedrock_client_enhanced import ConstraintExtractor, ResponseValidator
+
+    constraints = ConstraintExtractor.extract(fixtures.LONG_GUIDELINES)
+    return lambda: ResponseValidator.validate(fixtures.MODEL_RESPONSE, constraints)
+
+
+@benchmark('create_enhanced_system_prompt')
+def _system_prompt():
+    from lib.bedrock_client_enhanced import create_enhanced_system_prompt
+
+    item = fixtures.prompt_item()
+    prompt_data = {'prompt': item['prompt'], 'files': item['files'], 'userRole': 'user'}
+    return lambda: create_enhanced_system_prompt(prompt_data, 'T5')
+
+
+@benchmark('estimate_tokens')
+def _estimate_tokens():
+    from handlers.api.usage import estimate_tokens
+
+    text = fixtures.MODEL_RESPONSE + "\n" + fixtures.STYLE_GUIDE
+    return lambda: estimate_tokens(text)
+
+
+@benchmark('APIResponse.success (usage)')
+def _response_usage():
+    from utils.response import APIResponse
+
+    items = fixtures.usage_items()
+    return lambda: APIResponse.success({'success': True, 'data': items})
+
+
+@benchmark('APIResponse.success (conversation)')
+def _response_conversation():
+    from utils.response import APIResponse
+
+    item = fixtures.conversation_item(50)
+    return lambda: APIResponse.success(item)
+
+
+@benchmark('APIResponse.compress (conversation, gzip)')
+def _response_compress():
+    from utils.response import APIResponse
+
+    response = APIResponse.success(fixtures.conversation_item(50))
+    event = {'headers': {'accept-encoding': 'gzip'}}
+    return lambda: APIResponse.compress(response, event)
+
+
+@benchmark('ChunkFrameEncoder.encode')
+def _chunk_frame():
+    from utils.serialization import ChunkFrameEncoder
+
+    frames = ChunkFrameEncoder('req-loadtest-0001')
+    chunk = fixtures.MODEL_RESPONSE[:12]
+    return lambda: frames.encode(chunk, 42)
+
+
+@benchmark('dynamodb_codec.deserialize (usage query)')
+def _codec_usage():
+    from src.repositories.dynamodb_codec import deserialize_item, serialize_item
+
+    items = [serialize_item(item) for item in fixtures.usage_items()]
+    exact = frozenset({'estimatedCost'})
+    return lambda: [deserialize_item(item, exact) for item in items]
+
+
+@benchmark('dynamodb_codec.deserialize (conversation)')
+def _codec_conversation():
+    from src.repositories.dynamodb_codec import deserialize_item, serialize_item
+
+    item = serialize_item(fixtures.conversation_item(50))
+    return lambda: deserialize_item(item)
+
+
+@benchmark('Conversation.from_dict')
+def _conversation_from_dict():
+    from src.models import Conversation
+
+    item = fixtures.conversation_item(50)
+    return lambda: Conversation.from_dict(item)
+
+
+@benchmark('Conversation.from_dict (compressed)')
+def _conversation_from_dict_compressed():
+    from src.models import Conversation
+    from src.models.compression import encode_message
+
+    item = fixtures.conversation_item(50)
+    item['messages'] = [encode_message(m) for m in item['messages']]
+    return lambda: Conversation.from_dict(item)
+
+
+@benchmark('Conversation.from_dict (all messages)')
+def _conversation_from_dict_materialized():
+    from src.models import Conversation
+
+    item = fixtures.conversation_item(50)
+    return lambda: [m.content for m in Conversation.from_dict(item).messages]
+
+
+@benchmark('Conversation.to_dict')
+def _conversation_to_dict():
+    from src.models import Conversation
+
+    conversation = Conversation.from_dict(fixtures.conversation_item(50))
+    return lambda: conversation.to_dict()
+
+
+@benchmark('Prompt.from_dict')
+def _prompt_from_dict():
+    from src.models import Prompt
+
+    item = fixtures.prompt_item()
+    return lambda: Prompt.from_dict(item)
+
+
+def measure(func: Callable[[], Any], repeat: int, min_time: float) -> Dict[str, Any]:
+    """호출당 시간 측정 (한 번 반복이 min_time 이상 걸리도록 호출 횟수 보정)"""
+    func()  # 지연 import/캐시 워밍업
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or loops >= 1_000_000:
+            break
+        loops = max(loops * 2, int(loops * min_time / max(elapsed, 1e-9) * 1.2))
+
+    # timeit과 같이 측정 중에는 GC를 끔 (수집 시점에 따라 같은 코드도 수십 % 차이)
+    samples = []
+    gc.collect()
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for _ in range(loops):
+                func()
+            samples.append((time.perf_counter() - started) / loops * 1e6)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return {
+        'loops': loops,
+        'min_us': min(samples),
+        'median_us': statistics.median(samples),
+        'stdev_us': statistics.stdev(samples) if len(samples) > 1 else 0.0
+    }
+
+
+def run(name_filter: Optional[str], repeat: int, min_time: float) -> Dict[str, Any]:
+    pattern = re.compile(name_filter) if name_filter else None
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if pattern and not pattern.search(name):
+            continue
+        results[name] = measure(setup(), repeat, min_time)
+        r = results[name]
+        print(f"{name:<40}{r['min_us']:>12,.1f} us{r['median_us']:>12,.1f} us  (x{r['loops']})")
+    return {
+        'environment': environment(),
+        'results': results
+    }
+
+
+def environment() -> Dict[str, Any]:
+    """측정 환경 (인터프리터/플랫폼과 결과에 영향을 주는 선택 의존성)"""
+    from src.models import compression
+    from utils import response, serialization
+
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'system': platform.system(),
+        'json_backend': serialization.BACKEND,
+        'zstandard': compression.zstandard is not None,
+        'brotli': response.brotli is not None
+    }
+
+
+def dependency_mismatch(baseline: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """선택 의존성 차이 {항목: (기준, 현재)} - 다르면 같은 코드라도 결과가 크게 달라 비교 의미 없음"""
+    base_env = baseline.get('environment') or {}
+    current_env = current.get('environment') or {}
+    return {
+        key: (base_env.get(key), current_env[key])
+        for key in DEPENDENCY_KEYS
+        if base_env.get(key) != current_env[key]
+    }
+
+
+def allowed_change(base: Dict[str, Any], result: Dict[str, Any], threshold: float) -> float:
+    """항목별 허용 저하 비율 (threshold와 기준/현재 측정 잡음 중 큰 값)"""
+    noise = max(
+        base.get('stdev_us', 0.0) / base['min_us'],
+        result.get('stdev_us', 0.0) / result['min_us']
+    )
+    return max(threshold, NOISE_FACTOR * noise)
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float,
+    remeasure: Optional[Callable[[str], Dict[str, Any]]] = None,
+    confirm_runs: int = 2
+) -> List[str]:
+    """
+    기준 대비 느려진 항목 목록 (최솟값 기준 비교 - 잡음이 가장 적음)
+    허용치를 넘은 항목은 remeasure로 최대 confirm_runs번 다시 측정해 가장 빠른 값으로 판정
+    (한 번의 잡음으로 실패하지 않도록)
+    """
+    platform_keys = [key for key in current['environment'] if key not in DEPENDENCY_KEYS]
+    base_platform = {key: (baseline.get('environment') or {}).get(key) for key in platform_keys}
+    current_platform = {key: current['environment'][key] for key in platform_keys}
+    if base_platform != current_platform:
+        print(f"warning: baseline environment {base_platform} differs from current {current_platform}")
+
+    regressions = []
+    print(f"\n{'benchmark':<40}{'baseline':>12}{'current':>12}{'change':>10}{'allowed':>10}")
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if not base:
+            print(f"{name:<40}{'-':>12}{result['min_us']:>12,.1f}{'new':>10}")
+            continue
+        change = result['min_us'] / base['min_us'] - 1
+        allowed = allowed_change(base, result, threshold)
+        rechecks = 0
+        while change > allowed and remeasure and rechecks < confirm_runs:
+            rechecks += 1
+            rerun = remeasure(name)
+            if rerun['min_us'] < result['min_us']:
+                result = rerun
+                current['results'][name] = rerun
+            change = result['min_us'] / base['min_us'] - 1
+            allowed = allowed_change(base, result, threshold)
+        flag = f'  (rechecked x{rechecks})' if rechecks else ''
+        if change > allowed:
+            regressions.append(name)
+            flag = '  REGRESSION' + flag
+        print(f"{name:<40}{base['min_us']:>12,.1f}{result['min_us']:>12,.1f}{change:>+10.1%}{allowed:>10.0%}{flag}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='메시지 경로 마이크로벤치마크')
+    parser.add_argument('command', choices=['run', 'save', 'compare'])
+    parser.add_argument('--filter', help='벤치마크 이름 정규식')
+    parser.add_argument('--repeat', type=int, default=7, help='반복 측정 횟수')
+    parser.add_argument('--min-time', type=float, default=0.2, help='반복 1회 최소 시간 (초)')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='기준값 파일')
+    parser.add_argument('--threshold', type=float, default=0.15, help='허용 성능 저하 비율 (측정 잡음이 더 크면 잡음 기준)')
+    parser.add_argument('--confirm-runs', type=int, default=2, help='허용치를 넘은 항목의 재측정 횟수')
+    parser.add_argument('--output', help='측정 결과 JSON 저장 경로')
+    parser.add_argument('--allow-env-mismatch', action='store_true',
+                        help='JSON 백엔드/압축 라이브러리가 기준과 달라도 비교 (경고만 출력)')
+    args = parser.parse_args(argv)
+
+    # 측정 대상의 로그 출력(핸들러 I/O)은 제외
+    logging.disable(logging.CRITICAL)
+
+    current = run(args.filter, args.repeat, args.min_time)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(current, f, ensure_ascii=False, indent=2)
+
+    if args.command == 'save':
+        existing = {'results': {}}
+        if args.filter and os.path.exists(args.baseline):
+            # 일부만 다시 측정한 경우 나머지 기준값은 유지
+            with open(args.baseline, encoding='utf-8') as f:
+                existing = json.load(f)
+        existing['environment'] = current['environment']
+        existing['results'].update(current['results'])
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(existing, f, ensure_ascii=False, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"\nbaseline written to {args.baseline}")
+
+    elif args.command == 'compare':
+        if not os.path.exists(args.baseline):
+            print(f"baseline not found: {args.baseline} (run 'save' first)")
+            return 2
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        mismatch = dependency_mismatch(baseline, current)
+        if mismatch:
+            details = ', '.join(f"{key}: baseline={base} current={now}" for key, (base, now) in mismatch.items())
+            if not args.allow_env_mismatch:
+                print(f"\nrefusing to compare: optional dependencies differ from the baseline ({details}); "
+                      f"re-save the baseline or pass --allow-env-mismatch")
+                return 2
+            print(f"warning: optional dependencies differ from the baseline ({details})")
+        regressions = compare(
+            baseline,
+            current,
+            args.threshold,
+            remeasure=lambda name: measure(BENCHMARKS[name](), args.repeat, args.min_time),
+            confirm_runs=args.confirm_runs
+        )
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+        print(f"\nno regressions over {args.threshold:.0%}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,44 +4,135 @@ Conversation API Handler
 """
 import json
 import logging
+import os
 from datetime import datetime, timezone
 from decimal import Decimal
+from typing import Optional, Tuple
 
-from services.conversation_service import ConversationService
-from utils.response import APIResponse
-from utils.logger import setup_logger
+import boto3
+
+from handlers.websocket.conversation_manager import ConversationManager
+from src.monitoring import instrument_handler, instrument_resource
+from src.repositories import ConversationRepository
+from src.services import ConversationBulkService
+from utils.response import APIResponse, compress_response, make_etag, request_header
+from utils.logger import log_lambda_event, setup_logger
 
 # 로깅 설정
 logger = setup_logger(__name__)
 
+# 조건부 GET용 (updatedAt만 읽는 프로젝션 조회)
+dynamodb = instrument_resource(boto3.resource('dynamodb', region_name='us-east-1'))
+CONVERSATIONS_TABLE = os.environ.get('CONVERSATIONS_TABLE', 'nx-tt-dev-ver3-conversations')
+conversations_table = dynamodb.Table(CONVERSATIONS_TABLE)
+
+# 대량 작업 (일괄 삭제/보관/제목 변경, 사용자 전체 삭제)
+bulk_service = ConversationBulkService(ConversationRepository(CONVERSATIONS_TABLE))
+
+BULK_ACTIONS = ('delete', 'archive', 'unarchive', 'retitle')
+
+
+def conversation_etag(conversation_id: str, updated_at: Optional[str]) -> Optional[str]:
+    """대화 ETag (updatedAt이 없으면 조건부 응답 안 함)"""
+    if not updated_at:
+        return None
+    return make_etag('conversation', conversation_id, updated_at)
+
+
+def read_updated_at(conversation_id: str) -> Optional[str]:
+    """대화의 updatedAt만 조회 (본문/메시지는 전송/역직렬화하지 않음)"""
+    response = conversations_table.get_item(
+        Key={'conversationId': conversation_id},
+        ProjectionExpression='updatedAt'
+    )
+    return response.get('Item', {}).get('updatedAt')
+
+
+def request_path(event) -> str:
+    return (event.get('rawPath') or event.get('path') or '').rstrip('/')
 
 
+def authorized_identities(event) -> Tuple[str, ...]:
+    """
+    API Gateway 인증자가 확인한 사용자 식별자 (첫 번째가 기본 userId)
+    REST API Cognito 인증자는 authorizer.claims, HTTP API JWT 인증자는 authorizer.jwt.claims
+    인증자가 없는 경로(직접 호출, 로컬)는 빈 튜플
+    """
+    authorizer = (event.get('requestContext') or {}).get('authorizer') or {}
+    claims = authorizer.get('claims') or (authorizer.get('jwt') or {}).get('claims') or {}
+    # 프론트엔드의 userId는 username -> sub -> email 순서
+    values = [claims.get(name) for name in ('cognito:username', 'username', 'sub', 'email')]
+    return tuple(dict.fromkeys(value for value in values if value))
+
 
+def resolve_user_id(event, user_id: Optional[str]) -> str:
+    """
+    요청의 userId를 인증된 사용자로 확정
+    인증자가 있으면 userId 생략 시 인증된 사용자, 다른 사용자면 PermissionError
+    """
+    identities = authorized_identities(event)
+    if not identities:
+        return user_id
+    if not user_id:
+        return identities[0]
+    if user_id not in identities:
+        raise PermissionError('userId does not match the authenticated user')
+    return user_id
+
+
+def handle_bulk(event, body: dict):
+    """
+    POST /conversations/bulk
+    {"action": "delete|archive|unarchive|retitle", "userId": ..., "conversationIds": [...]}
+    retitle은 conversationIds 대신 "titles": {conversationId: title}
+    """
+    action = body.get('action')
+    user_id = resolve_user_id(event, body.get('userId'))
+    if action not in BULK_ACTIONS:
+        return APIResponse.error(f"action must be one of {', '.join(BULK_ACTIONS)}", 400)
+    if not user_id:
+        return APIResponse.error('userId is required', 400)
+    
+    if action == 'retitle':
+        titles = body.get('titles')
+        if not isinstance(titles, dict) or not titles:
+            return APIResponse.error('titles is required', 400)
+        result = bulk_service.bulk_update_titles(user_id, titles)
+    else:
+        conversation_ids = body.get('conversationIds')
+        if not isinstance(conversation_ids, list):
+            return APIResponse.error('conversationIds must be a list', 400)
+        if action == 'delete':
+            result = bulk_service.bulk_delete(user_id, conversation_ids)
+        else:
+            result = bulk_service.bulk_archive(user_id, conversation_ids, archived=action == 'archive')
+    
+    return APIResponse.success(result.to_dict())
+
+
+@instrument_handler('api.conversation')
+@compress_response
 def handler(event, context):
     """
     Lambda 핸들러 - 대화 관리 API
     """
-    logger.info(f"Event: {json.dumps(event)}")
+    log_lambda_event(logger, event, 'Conversation API Event')
     
     # API Gateway v2 형식 처리
     if 'version' in event and event['version'] == '2.0':
         # API Gateway v2 (HTTP API)
         http_method = event.get('requestContext', {}).get('http', {}).get('method')
-        path_params = event.get('pathParameters', {})
+        path_params = event.get('pathParameters') or {}
     else:
         # API Gateway v1 (REST API) 또는 직접 호출
         http_method = event.get('httpMethod')
-        path_params = event.get('pathParameters', {})
+        path_params = event.get('pathParameters') or {}
     
     # OPTIONS 요청 처리 (CORS)
     if http_method == 'OPTIONS':
         return APIResponse.cors_preflight()
     
     try:
-        
-        # Service 초기화
-        conversation_service = ConversationService()
-        
         # GET /conversations - 목록 조회
         if http_method == 'GET' and not path_params:
             # 쿼리 파라미터에서 userId와 engineType 추출
@@ -49,7 +140,7 @@ def handler(event, context):
             user_id = query_params.get('userId')
             engine_type = query_params.get('engineType') or query_params.get('engine')
             
-            conversations = conversation_service.list_conversations(user_id, engine_type)
+            conversations = ConversationManager.list_conversations(user_id, engine_type)
             
             return APIResponse.success({
                 'conversations': conversations,
@@ -58,18 +149,49 @@ def handler(event, context):
         
         # GET /conversations/{conversationId} - 상세 조회
         elif http_method == 'GET' and 'conversationId' in path_params:
-            conversation = conversation_service.get_conversation(
-                path_params['conversationId']
-            )
+            conversation_id = path_params['conversationId']
+            
+            # 폴링 클라이언트: 변경이 없으면 전체 조회 없이 304
+            if request_header(event, 'If-None-Match'):
+                not_modified = APIResponse.conditional(
+                    event,
+                    conversation_etag(conversation_id, read_updated_at(conversation_id)),
+                    APIResponse.REVALIDATE
+                )
+                if not_modified:
+                    return not_modified
+            
+            # 델타 조회 (?since=<messageId|timestamp>): 이후 메시지와 다음 요청용 highWaterMark만
+            since = (event.get('queryStringParameters') or {}).get('since')
+            if since:
+                delta = ConversationManager.get_messages_since(conversation_id, since)
+                if delta is None:
+                    return APIResponse.error('Conversation not found', 404)
+                return APIResponse.success(
+                    delta,
+                    cache_control=APIResponse.REVALIDATE,
+                    etag=conversation_etag(conversation_id, delta['updatedAt'])
+                )
+            
+            # 압축 저장된 메시지는 문자열로 복원해서 응답
+            conversation = ConversationManager.get_conversation(conversation_id)
             if conversation:
-                return APIResponse.success(conversation)
+                return APIResponse.success(
+                    conversation,
+                    cache_control=APIResponse.REVALIDATE,
+                    etag=conversation_etag(conversation_id, conversation.get('updatedAt'))
+                )
             else:
                 return APIResponse.error('Conversation not found', 404)
         
+        # POST /conversations/bulk - 일괄 삭제/보관/제목 변경
+        elif http_method == 'POST' and request_path(event).endswith('/bulk'):
+            return handle_bulk(event, json.loads(event.get('body') or '{}'))
+        
         # POST /conversations - 대화 저장
         elif http_method == 'POST':
             body = json.loads(event.get('body', '{}'))
-            saved = conversation_service.create_or_update_conversation(body)
+            saved = ConversationManager.save_conversation(body)
             return APIResponse.success(saved, 201)
         
         # PATCH /conversations/{conversationId} - 대화 부분 업데이트 (제목 수정 등)
@@ -78,17 +200,17 @@ def handler(event, context):
             conversation_id = path_params['conversationId']
             
             if 'title' in body:
-                success = conversation_service.update_title(conversation_id, body['title'])
+                success = ConversationManager.update_title(conversation_id, body['title'])
                 if success:
                     return APIResponse.success({'message': 'Conversation updated'})
                 else:
-                    return APIResponse.error('Failed to update conversation', 500)
+                    return APIResponse.error('Conversation not found', 404)
             else:
                 return APIResponse.error('No title field to update', 400)
         
         # DELETE /conversations/{conversationId} - 대화 삭제
         elif http_method == 'DELETE' and 'conversationId' in path_params:
-            success = conversation_service.delete_conversation(
+            success = ConversationManager.delete_conversation(
                 path_params['conversationId']
             )
             if success:
@@ -96,9 +218,26 @@ def handler(event, context):
             else:
                 return APIResponse.error('Failed to delete conversation', 500)
         
+        # DELETE /conversations?all=true&confirm=<userId>[&userId=...][&nextToken=...] - 사용자 대화 전체 삭제
+        # 되돌릴 수 없으므로 삭제할 userId를 confirm으로 한 번 더 받음 (인증자가 있으면 userId는 인증된 사용자)
+        elif http_method == 'DELETE' and not path_params:
+            query_params = event.get('queryStringParameters') or {}
+            user_id = resolve_user_id(event, query_params.get('userId'))
+            if not user_id or query_params.get('all') != 'true':
+                return APIResponse.error('userId and all=true are required', 400)
+            if query_params.get('confirm') != user_id:
+                return APIResponse.error('confirm must equal the userId whose conversations are deleted', 400)
+            return APIResponse.success(
+                bulk_service.delete_all_for_user(user_id, query_params.get('nextToken'))
+            )
+        
         else:
             return APIResponse.error('Method not allowed', 405)
             
+    except PermissionError as e:
+        return APIResponse.error(str(e), 403)
+    except ValueError as e:
+        return APIResponse.error(str(e), 400)
     except Exception as e:
         logger.error(f"Error in conversation handler: {e}", exc_info=True)
         return APIResponse.error(str(e), 500)
\ No newline at end of file
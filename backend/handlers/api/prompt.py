@@ -5,24 +5,95 @@ Prompt CRUD API Handler
 import json
 import uuid
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import boto3
 from boto3.dynamodb.conditions import Key
 
-from utils.logger import setup_logger
-from utils.response import APIResponse
+from lib.file_content_store import (
+    delete_file_content,
+    file_metadata,
+    load_file_content,
+    store_file_content
+)
+from src.monitoring import instrument_handler, instrument_resource
+from utils.logger import lazy, log_lambda_event, redact, setup_logger
+from utils.response import APIResponse, compress_response, make_etag, request_header
 
 logger = setup_logger(__name__)
 
 # DynamoDB 테이블 초기화
-dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+dynamodb = instrument_resource(boto3.resource('dynamodb', region_name='us-east-1'))
 prompts_table = dynamodb.Table('nx-tt-dev-ver3-prompts')
 files_table = dynamodb.Table('nx-tt-dev-ver3-files')
 
+# 파일 목록 조회 시 읽을 속성 (본문 제외)
+FILE_METADATA_PROJECTION = (
+    'promptId, fileId, fileName, fileType, createdAt, updatedAt, '
+    'contentKey, contentStorage, contentSize, contentHash, tokenCount'
+)
 
+
+def query_file_metadata(engine_type: str, include_legacy_content: bool = False) -> List[Dict[str, Any]]:
+    """
+    엔진의 파일 메타데이터 목록 (본문은 S3에 있고 필요할 때만 조회)
+    include_legacy_content: S3 이전 전 파일(contentKey 없음)은 아이템의 fileContent를 따로 읽어 채움
+    (프롬프트 구성 경로 - 마이그레이션 전에도 지식 파일이 빠지지 않도록)
+    """
+    response = files_table.query(
+        KeyConditionExpression=Key('promptId').eq(engine_type),
+        ProjectionExpression=FILE_METADATA_PROJECTION
+    )
+    files = response.get('Items', [])
+    if include_legacy_content:
+        for file_item in files:
+            if not file_item.get('contentKey'):
+                file_item['fileContent'] = read_legacy_content(file_item)
+    return files
+
+
+def read_legacy_content(file_item: Dict[str, Any]) -> str:
+    """아이템에 직접 저장된 본문 (S3 이전 전 데이터)"""
+    item = files_table.get_item(
+        Key={'promptId': file_item['promptId'], 'fileId': file_item['fileId']},
+        ProjectionExpression='fileContent'
+    ).get('Item', {})
+    if 'fileContent' not in item:
+        logger.warning(
+            f"File {file_item['promptId']}/{file_item['fileId']} has neither contentKey nor fileContent"
+        )
+    return item.get('fileContent') or ''
+
+
+def prompt_etag(engine_type: str, prompt: Dict[str, Any], files: List[Dict[str, Any]]) -> Optional[str]:
+    """프롬프트 + 파일 목록 응답의 ETag (프롬프트 updatedAt과 파일별 버전)"""
+    prompt_version = prompt.get('updatedAt') or prompt.get('createdAt')
+    if not prompt_version:
+        return None
+    file_versions = sorted(
+        f"{f.get('fileId')}:{f.get('updatedAt') or f.get('createdAt')}:{f.get('contentHash', '')}"
+        for f in files
+    )
+    return make_etag('prompt', engine_type, prompt_version, *file_versions)
+
+
+def read_prompt_etag(engine_type: str) -> Optional[str]:
+    """버전 속성만 프로젝션으로 읽어 현재 ETag 계산 (조건부 GET용)"""
+    prompt = prompts_table.get_item(
+        Key={'id': engine_type},
+        ProjectionExpression='updatedAt, createdAt'
+    ).get('Item', {})
+    files = files_table.query(
+        KeyConditionExpression=Key('promptId').eq(engine_type),
+        ProjectionExpression='fileId, createdAt, updatedAt, contentHash'
+    ).get('Items', [])
+    return prompt_etag(engine_type, prompt, files)
+
+
+@instrument_handler('api.prompt')
+@compress_response
 def handler(event, context):
     """Lambda 핸들러 - 프롬프트 관리 API"""
-    logger.info(f"Prompt API Event: {json.dumps(event)}")
+    log_lambda_event(logger, event, 'Prompt API Event')
     
     # API Gateway v2 형식 처리
     if 'version' in event and event['version'] == '2.0':
@@ -45,9 +116,9 @@ def handler(event, context):
         body = {}
         if event.get('body'):
             body = json.loads(event['body']) if isinstance(event['body'], str) else event['body']
-            logger.info(f"Request body: {body}")
+            logger.debug("Request body: %s", lazy(redact, body))
         
-        logger.info(f"Method: {http_method}, Path: {path}, PathParams: {path_params}")
+        logger.info("Method: %s, Path: %s, PathParams: %s", http_method, path, path_params)
         
         # 라우팅
         if '/prompts' in path:
@@ -56,7 +127,7 @@ def handler(event, context):
                 return handle_files(http_method, path_params, body)
             else:
                 # 프롬프트 관련 작업
-                return handle_prompts(http_method, path_params, body)
+                return handle_prompts(http_method, path_params, body, event)
         
         return APIResponse.error('Not Found', 404)
         
@@ -65,7 +136,7 @@ def handler(event, context):
         return APIResponse.error(str(e))
 
 
-def handle_prompts(method: str, path_params: Dict, body: Dict) -> Dict:
+def handle_prompts(method: str, path_params: Dict, body: Dict, event: Optional[Dict] = None) -> Dict:
     """프롬프트 (설명, 지침) CRUD 처리"""
     
     # promptId와 engineType 둘 다 지원 (API Gateway 호환성)
@@ -75,19 +146,28 @@ def handle_prompts(method: str, path_params: Dict, body: Dict) -> Dict:
         # 특정 엔진의 프롬프트 조회
         if engine_type:
             try:
+                # 폴링 클라이언트: 변경이 없으면 본문 조회 없이 304
+                if event and request_header(event, 'If-None-Match'):
+                    not_modified = APIResponse.conditional(
+                        event, read_prompt_etag(engine_type), APIResponse.REVALIDATE
+                    )
+                    if not_modified:
+                        return not_modified
+                
                 response = prompts_table.get_item(Key={'id': engine_type})
                 item = response.get('Item', {})
                 
-                # 해당 엔진의 파일들도 함께 조회
-                files_response = files_table.query(
-                    KeyConditionExpression=Key('promptId').eq(engine_type)
-                )
-                files = files_response.get('Items', [])
+                # 해당 엔진의 파일들도 함께 조회 (메타데이터만)
+                files = query_file_metadata(engine_type)
                 
-                return APIResponse.success({
-                    'prompt': item,
-                    'files': files
-                })
+                return APIResponse.success(
+                    {
+                        'prompt': item,
+                        'files': files
+                    },
+                    cache_control=APIResponse.REVALIDATE,
+                    etag=prompt_etag(engine_type, item, files)
+                )
             except Exception as e:
                 logger.error(f"Error getting prompt {engine_type}: {e}")
                 return APIResponse.error(str(e))
@@ -143,13 +223,26 @@ def handle_files(method: str, path_params: Dict, body: Dict) -> Dict:
     file_id = path_params.get('fileId')
     
     if method == 'GET':
-        # 특정 엔진의 파일 목록 조회
-        if engine_type:
+        # 특정 파일 조회 (본문 포함)
+        if engine_type and file_id:
             try:
-                response = files_table.query(
-                    KeyConditionExpression=Key('promptId').eq(engine_type)
+                response = files_table.get_item(
+                    Key={'promptId': engine_type, 'fileId': file_id}
                 )
-                return APIResponse.success({'files': response.get('Items', [])})
+                item = response.get('Item')
+                if not item:
+                    return APIResponse.error('File not found', 404)
+                return APIResponse.success({
+                    'file': {**file_metadata(item), 'fileContent': load_file_content(item)}
+                })
+            except Exception as e:
+                logger.error(f"Error getting file {file_id} for {engine_type}: {e}")
+                return APIResponse.error(str(e))
+        
+        # 특정 엔진의 파일 목록 조회 (메타데이터만)
+        if engine_type:
+            try:
+                return APIResponse.success({'files': query_file_metadata(engine_type)})
             except Exception as e:
                 logger.error(f"Error getting files for {engine_type}: {e}")
                 return APIResponse.error(str(e))
@@ -161,17 +254,21 @@ def handle_files(method: str, path_params: Dict, body: Dict) -> Dict:
         
         try:
             new_file_id = str(uuid.uuid4())
+            file_content = body.get('fileContent', '')
             item = {
                 'promptId': engine_type,
                 'fileId': new_file_id,
                 'fileName': body.get('fileName', 'untitled.txt'),
-                'fileContent': body.get('fileContent', ''),
-                'createdAt': datetime.utcnow().isoformat() + 'Z'
+                'createdAt': datetime.utcnow().isoformat() + 'Z',
+                # 본문은 S3에 저장하고 메타데이터만 기록
+                **store_file_content(engine_type, new_file_id, file_content)
             }
             
             files_table.put_item(Item=item)
             
-            return APIResponse.success({'file': item}, 201)
+            return APIResponse.success({'file': {**item, 'fileContent': file_content}}, 201)
+        except ValueError as e:
+            return APIResponse.error(str(e), 400)
         except Exception as e:
             logger.error(f"Error creating file for {engine_type}: {e}")
             return APIResponse.error(str(e))
@@ -184,26 +281,38 @@ def handle_files(method: str, path_params: Dict, body: Dict) -> Dict:
         try:
             update_expr = []
             expr_attr_values = {}
+            remove_expr = ''
             
             if 'fileName' in body:
                 update_expr.append('fileName = :name')
                 expr_attr_values[':name'] = body['fileName']
             
             if 'fileContent' in body:
-                update_expr.append('fileContent = :content')
-                expr_attr_values[':content'] = body['fileContent']
+                # 본문은 S3에 저장 (기존 아이템에 남아 있던 본문은 제거)
+                content_meta = store_file_content(engine_type, file_id, body['fileContent'])
+                for attr, value in content_meta.items():
+                    update_expr.append(f'{attr} = :{attr}')
+                    expr_attr_values[f':{attr}'] = value
+                remove_expr = ' REMOVE fileContent'
             
             if update_expr:
                 update_expr.append('updatedAt = :updated')
                 expr_attr_values[':updated'] = datetime.utcnow().isoformat() + 'Z'
                 
-                files_table.update_item(
+                response = files_table.update_item(
                     Key={'promptId': engine_type, 'fileId': file_id},
-                    UpdateExpression='SET ' + ', '.join(update_expr),
-                    ExpressionAttributeValues=expr_attr_values
+                    UpdateExpression='SET ' + ', '.join(update_expr) + remove_expr,
+                    ExpressionAttributeValues=expr_attr_values,
+                    ReturnValues='UPDATED_OLD'
                 )
+                
+                # 본문이 바뀌었으면 이전 블롭 참조 해제
+                if 'fileContent' in body:
+                    delete_file_content(response.get('Attributes', {}))
             
             return APIResponse.success({'message': 'File updated successfully'})
+        except ValueError as e:
+            return APIResponse.error(str(e), 400)
         except Exception as e:
             logger.error(f"Error updating file {file_id} for {engine_type}: {e}")
             return APIResponse.error(str(e))
@@ -214,9 +323,11 @@ def handle_files(method: str, path_params: Dict, body: Dict) -> Dict:
             return APIResponse.error('engineType and fileId are required', 400)
         
         try:
-            files_table.delete_item(
-                Key={'promptId': engine_type, 'fileId': file_id}
+            response = files_table.delete_item(
+                Key={'promptId': engine_type, 'fileId': file_id},
+                ReturnValues='ALL_OLD'
             )
+            delete_file_content(response.get('Attributes', {}))
             
             return APIResponse.success({'message': 'File deleted successfully'})
         except Exception as e:
@@ -13,28 +13,18 @@ from boto3.dynamodb.conditions import Key
 import os
 from urllib.parse import unquote
 
-from utils.logger import setup_logger
-from utils.response import APIResponse
+from src.monitoring import instrument_handler, instrument_resource
+from utils.logger import log_lambda_event, setup_logger
+from utils.response import APIResponse, compress_response
 
 # 로깅 설정
 logger = setup_logger(__name__)
 
 # DynamoDB 초기화
-dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+dynamodb = instrument_resource(boto3.resource('dynamodb', region_name='us-east-1'))
 usage_table = dynamodb.Table('nx-tt-dev-ver3-usage-tracking')
 
 
-def decimal_to_float(obj):
-    """DynamoDB Decimal을 float로 변환"""
-    if isinstance(obj, Decimal):
-        return float(obj)
-    elif isinstance(obj, dict):
-        return {k: decimal_to_float(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [decimal_to_float(v) for v in obj]
-    return obj
-
-
 def estimate_tokens(text):
     """토큰 추정 (한글/영어 구분)"""
     if not text:
@@ -111,8 +101,8 @@ def get_or_create_usage(user_id, engine_type):
         raise
 
 
-def update_usage(user_id, engine_type, input_text, output_text, user_plan='free'):
-    """사용량 업데이트 (간단 버전)"""
+def update_usage(user_id, engine_type, input_text, output_text, user_plan='free', truncated=False):
+    """사용량 업데이트 (간단 버전, truncated: 연결 종료/취소로 중단된 생성)"""
     try:
         # 토큰 계산
         input_tokens = estimate_tokens(input_text)
@@ -127,13 +117,20 @@ def update_usage(user_id, engine_type, input_text, output_text, user_plan='free'
         get_or_create_usage(user_id, engine_type)
         
         # 간단한 업데이트 (ADD 사용으로 원자적 증가)
-        response = usage_table.update_item(
-            Key={'PK': pk, 'SK': sk},
-            UpdateExpression="""
+        add_expr = """
                 ADD totalTokens :total,
                     inputTokens :input,
                     outputTokens :output,
-                    messageCount :one
+                    messageCount :one"""
+        # 중단된 생성은 별도 집계 (버려진 탭 등으로 인한 비용 파악)
+        if truncated:
+            add_expr += """,
+                    truncatedCount :one,
+                    truncatedOutputTokens :output"""
+        
+        response = usage_table.update_item(
+            Key={'PK': pk, 'SK': sk},
+            UpdateExpression=add_expr + """
                 SET updatedAt = :timestamp,
                     lastUsedAt = :timestamp
             """,
@@ -147,7 +144,9 @@ def update_usage(user_id, engine_type, input_text, output_text, user_plan='free'
             ReturnValues='ALL_NEW'
         )
         
-        updated_item = decimal_to_float(response['Attributes'])
+        # Decimal 값은 응답 직렬화(utils.serialization)에서 숫자로 변환됨
+        updated_item = response['Attributes']
+        total_used = int(updated_item['totalTokens'])
         
         # 플랜별 월간 한도 설정
         plan_limits = {
@@ -157,14 +156,14 @@ def update_usage(user_id, engine_type, input_text, output_text, user_plan='free'
         }
         
         monthly_limit = plan_limits.get(user_plan, 10000)
-        percentage = min(100, (updated_item['totalTokens'] / monthly_limit) * 100)
+        percentage = min(100, (total_used / monthly_limit) * 100)
         
         return {
             'success': True,
             'usage': updated_item,
             'tokensUsed': total_tokens,
             'percentage': round(percentage, 1),
-            'remaining': max(0, monthly_limit - updated_item['totalTokens'])
+            'remaining': max(0, monthly_limit - total_used)
         }
         
     except ClientError as e:
@@ -184,7 +183,7 @@ def get_usage(user_id, engine_type):
         )
         
         if 'Item' in response:
-            return decimal_to_float(response['Item'])
+            return response['Item']
         
         # 없으면 기본값 반환
         return {
@@ -212,7 +211,7 @@ def get_all_usage(user_id):
             KeyConditionExpression=Key('PK').eq(pk)
         )
         
-        items = [decimal_to_float(item) for item in response.get('Items', [])]
+        items = response.get('Items', [])
         
         # 엔진별로 정리
         usage_by_engine = {}
@@ -236,10 +235,12 @@ def get_all_usage(user_id):
         return {}
 
 
+@instrument_handler('api.usage')
+@compress_response
 def handler(event, context):
     """Lambda 메인 핸들러"""
     try:
-        logger.info(f"Usage API Event: {json.dumps(event)}")
+        log_lambda_event(logger, event, 'Usage API Event')
         
         # API Gateway v2 형식 처리
         if 'version' in event and event['version'] == '2.0':
@@ -5,10 +5,9 @@ import json
 import boto3
 from datetime import datetime
 from src.config.database import get_table_name
-from utils.logger import get_logger
-from utils.response import create_response
+from utils.logger import setup_logger
 
-logger = get_logger(__name__)
+logger = setup_logger(__name__)
 dynamodb = boto3.resource('dynamodb')
 
 def handler(event, context):
@@ -16,13 +15,15 @@ def handler(event, context):
     try:
         connection_id = event['requestContext']['connectionId']
         
-        # 쿼리 파라미터에서 사용자 정보 추출
+        # 사용자 정보 추출 (Lambda 인증자가 확인한 사용자 우선, 없으면 쿼리 파라미터)
+        # 연결 행의 userId는 스트림 이어받기(resumeStream)의 소유자 확인에 사용
         query_params = event.get('queryStringParameters', {}) or {}
-        user_id = query_params.get('userId', 'anonymous')
+        authorizer = event['requestContext'].get('authorizer') or {}
+        user_id = authorizer.get('userId') or authorizer.get('principalId') or query_params.get('userId', 'anonymous')
         engine_type = query_params.get('engineType', 'T5')
         
         # 연결 정보 저장
-        table = dynamodb.Table(get_table_name('websocket-connections'))
+        table = dynamodb.Table(get_table_name('websocket_connections'))
         table.put_item(
             Item={
                 'connectionId': connection_id,
@@ -34,8 +35,8 @@ def handler(event, context):
         )
         
         logger.info(f"WebSocket connected: {connection_id} for user {user_id}")
-        return create_response(200, {'message': 'Connected'})
+        return {'statusCode': 200, 'body': json.dumps({'message': 'Connected'})}
         
     except Exception as e:
         logger.error(f"Connection error: {str(e)}")
-        return create_response(500, {'error': str(e)})
\ No newline at end of file
+        return {'statusCode': 500, 'body': json.dumps({'error': str(e)})}
\ No newline at end of file
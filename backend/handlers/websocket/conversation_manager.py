@@ -4,24 +4,49 @@
 import boto3
 import json
 import logging
-from datetime import datetime
 import uuid
 
+from src.models import high_water_mark, messages_since, utc_timestamp
+from src.models.compression import decode_message, encode_message
+from boto3.dynamodb.conditions import Key
+
+from src.monitoring import instrument_repository, instrument_resource, trace_class
+
 logger = logging.getLogger(__name__)
 
 # DynamoDB 설정
-dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+dynamodb = instrument_resource(boto3.resource('dynamodb', region_name='us-east-1'))
 conversations_table = dynamodb.Table('nx-tt-dev-ver3-conversations')
 
+# 대화별로 저장하는 최근 메시지 수
+MAX_STORED_MESSAGES = 50
+
+# 대화 목록 조회 시 읽을 속성 (메시지 제외)
+SUMMARY_PROJECTION = 'conversationId, userId, engineType, title, createdAt, updatedAt, archived'
+
+@trace_class()
+@instrument_repository()
 class ConversationManager:
     """대화 내역을 DynamoDB에서 관리"""
     
     @staticmethod
-    def save_message(conversation_id: str, role: str, content: str, engine_type: str = 'T5', user_id: str = None):
-        """개별 메시지 저장"""
+    def save_message(conversation_id: str, role: str, content: str, engine_type: str = 'T5', user_id: str = None,
+                     truncated: bool = False):
+        """개별 메시지 저장 (truncated: 생성 중단으로 잘린 응답)"""
         try:
-            timestamp = datetime.utcnow().isoformat() + 'Z'
+            timestamp = utc_timestamp()
             message_id = str(uuid.uuid4())
+            message = {
+                'id': message_id,
+                'type': 'user' if role == 'user' else 'assistant',  # 프론트엔드 호환성
+                'role': role,  # 백워드 호환성
+                'content': content,
+                'timestamp': timestamp
+            }
+            if truncated:
+                message['truncated'] = True
+            # 대용량 본문은 압축 저장 (기존 메시지는 읽은 형식 그대로 다시 기록)
+            stored_message = encode_message(message)
             
             # 기존 대화 조회
             response = conversations_table.get_item(
@@ -32,17 +57,11 @@ class ConversationManager:
                 # 기존 대화에 메시지 추가
                 item = response['Item']
                 messages = item.get('messages', [])
-                messages.append({
-                    'id': message_id,
-                    'type': 'user' if role == 'user' else 'assistant',  # 프론트엔드 호환성
-                    'role': role,  # 백워드 호환성
-                    'content': content,
-                    'timestamp': timestamp
-                })
+                messages.append(stored_message)
                 
-                # 최근 50개 메시지만 유지 (메모리 관리)
-                if len(messages) > 50:
-                    messages = messages[-50:]
+                # 최근 메시지만 유지 (메모리 관리)
+                if len(messages) > MAX_STORED_MESSAGES:
+                    messages = messages[-MAX_STORED_MESSAGES:]
                 
                 # 업데이트 (userId가 없으면 추가)
                 update_expr = 'SET messages = :msgs, updatedAt = :updated'
@@ -66,13 +85,7 @@ class ConversationManager:
                 item = {
                     'conversationId': conversation_id,
                     'engineType': engine_type,
-                    'messages': [{
-                        'id': message_id,
-                        'type': 'user' if role == 'user' else 'assistant',  # 프론트엔드 호환성
-                        'role': role,  # 백워드 호환성
-                        'content': content,
-                        'timestamp': timestamp
-                    }],
+                    'messages': [stored_message],
                     'createdAt': timestamp,
                     'updatedAt': timestamp,
                     'title': content[:50] if role == 'user' else 'New Conversation'
@@ -84,7 +97,7 @@ class ConversationManager:
                 
                 conversations_table.put_item(Item=item)
             
-            logger.info(f"Message saved: {conversation_id} - {role}")
+            logger.info("Message saved: %s - %s", conversation_id, role)
             return True
             
         except Exception as e:
@@ -101,8 +114,9 @@ class ConversationManager:
             
             if 'Item' in response:
                 messages = response['Item'].get('messages', [])
-                # 최근 N개만 반환
-                return messages[-limit:] if len(messages) > limit else messages
+                # 최근 N개만 반환 (압축 본문은 반환할 메시지만 복원)
+                recent = messages[-limit:] if len(messages) > limit else messages
+                return [decode_message(msg) for msg in recent]
             
             return []
             
@@ -110,11 +124,60 @@ class ConversationManager:
             logger.error(f"Error getting conversation history: {str(e)}")
             return []
     
+    @staticmethod
+    def get_history_until(conversation_id: str, last_message_id: str = None):
+        """
+        서버에 저장된 히스토리 (클라이언트가 conversationHistory를 보내지 않은 경우, lastMessageId는 선택)
+        last_message_id가 있으면 그 메시지까지 (클라이언트가 본 범위), 없거나 찾지 못하면 저장된 전체
+        """
+        try:
+            response = conversations_table.get_item(
+                Key={'conversationId': conversation_id},
+                ProjectionExpression='messages'
+            )
+            messages = response.get('Item', {}).get('messages', [])
+            if last_message_id:
+                for index in range(len(messages) - 1, -1, -1):
+                    if messages[index].get('id') == last_message_id:
+                        messages = messages[:index + 1]
+                        break
+                else:
+                    logger.info(f"Message {last_message_id} not in stored history of {conversation_id}")
+            return [decode_message(msg) for msg in messages]
+            
+        except Exception as e:
+            logger.error(f"Error getting stored history: {str(e)}")
+            return []
+    
+    @staticmethod
+    def get_messages_since(conversation_id: str, since: str = None):
+        """
+        since(메시지 id 또는 타임스탬프) 이후 메시지만 조회 - 대화가 없으면 None
+        반환: {'messages', 'highWaterMark', 'reset', 'updatedAt'}
+        """
+        response = conversations_table.get_item(
+            Key={'conversationId': conversation_id},
+            ProjectionExpression='messages, updatedAt'
+        )
+        if 'Item' not in response:
+            return None
+        
+        stored = response['Item'].get('messages', [])
+        newer, reset = messages_since(stored, since)
+        return {
+            'conversationId': conversation_id,
+            'messages': [decode_message(msg) for msg in newer],
+            # 새 메시지가 없어도 현재 마지막 메시지 (다음 요청의 since)
+            'highWaterMark': high_water_mark(stored),
+            'reset': reset,
+            'updatedAt': response['Item'].get('updatedAt')
+        }
+    
     @staticmethod
     def create_or_update_conversation(conversation_id: str, engine_type: str = 'T5', title: str = None):
         """대화 생성 또는 메타데이터 업데이트"""
         try:
-            timestamp = datetime.utcnow().isoformat() + 'Z'
+            timestamp = utc_timestamp()
             
             # 기존 대화 확인
             response = conversations_table.get_item(
@@ -153,4 +216,94 @@ class ConversationManager:
             
         except Exception as e:
             logger.error(f"Error creating/updating conversation: {str(e)}")
-            return False
\ No newline at end of file
+            return False
+    
+    @staticmethod
+    def get_conversation(conversation_id: str):
+        """REST 응답용 대화 (압축 저장된 메시지는 문자열로 복원) - 없으면 None"""
+        response = conversations_table.get_item(
+            Key={'conversationId': conversation_id}
+        )
+        item = response.get('Item')
+        if not item:
+            return None
+        item['messages'] = [decode_message(msg) for msg in item.get('messages', [])]
+        return item
+    
+    @staticmethod
+    def list_conversations(user_id: str, engine_type: str = None, limit: int = 100):
+        """사용자 대화 목록 (userId-index 최신순, 메시지는 읽지 않음)"""
+        if not user_id:
+            return []
+        params = {
+            'IndexName': 'userId-index',
+            'KeyConditionExpression': Key('userId').eq(user_id),
+            'ProjectionExpression': SUMMARY_PROJECTION,
+            'ScanIndexForward': False,
+            'Limit': limit
+        }
+        items = []
+        while True:
+            response = conversations_table.query(**params)
+            items.extend(
+                item for item in response.get('Items', [])
+                if not engine_type or item.get('engineType') == engine_type
+            )
+            last_key = response.get('LastEvaluatedKey')
+            if not last_key or len(items) >= limit:
+                return items[:limit]
+            params['ExclusiveStartKey'] = last_key
+    
+    @staticmethod
+    def save_conversation(data: dict):
+        """
+        REST로 받은 대화 전체 저장 (메시지는 저장 형식으로 압축, 생성 시각 유지)
+        반환: 저장한 대화 (메시지는 받은 평문 그대로)
+        """
+        conversation_id = data.get('conversationId') or str(uuid.uuid4())
+        timestamp = utc_timestamp()
+        messages = list(data.get('messages') or [])[-MAX_STORED_MESSAGES:]
+        
+        existing = conversations_table.get_item(
+            Key={'conversationId': conversation_id},
+            ProjectionExpression='createdAt'
+        ).get('Item', {})
+        
+        item = {
+            **{k: v for k, v in data.items() if k not in ('messages', 'conversationId')},
+            'conversationId': conversation_id,
+            'engineType': data.get('engineType', 'T5'),
+            'title': data.get('title') or 'New Conversation',
+            'createdAt': existing.get('createdAt') or data.get('createdAt') or timestamp,
+            'updatedAt': timestamp
+        }
+        conversations_table.put_item(Item={**item, 'messages': [encode_message(msg) for msg in messages]})
+        
+        logger.info(f"Conversation saved: {conversation_id} ({len(messages)} messages)")
+        return {**item, 'messages': messages}
+    
+    @staticmethod
+    def update_title(conversation_id: str, title: str):
+        """대화 제목 변경 (대화가 없으면 False)"""
+        try:
+            conversations_table.update_item(
+                Key={'conversationId': conversation_id},
+                UpdateExpression='SET title = :title, updatedAt = :updated',
+                ConditionExpression='attribute_exists(conversationId)',
+                ExpressionAttributeValues={
+                    ':title': title,
+                    ':updated': utc_timestamp()
+                }
+            )
+            return True
+        except conversations_table.meta.client.exceptions.ConditionalCheckFailedException:
+            return False
+    
+    @staticmethod
+    def delete_conversation(conversation_id: str):
+        """대화 삭제"""
+        conversations_table.delete_item(
+            Key={'conversationId': conversation_id}
+        )
+        logger.info(f"Conversation deleted: {conversation_id}")
+        return True
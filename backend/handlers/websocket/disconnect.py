@@ -1,12 +1,12 @@
 """
 WebSocket 연결 해제 핸들러
 """
+import json
 import boto3
 from src.config.database import get_table_name
-from utils.logger import get_logger
-from utils.response import create_response
+from utils.logger import setup_logger
 
-logger = get_logger(__name__)
+logger = setup_logger(__name__)
 dynamodb = boto3.resource('dynamodb')
 
 def handler(event, context):
@@ -15,14 +15,14 @@ def handler(event, context):
         connection_id = event['requestContext']['connectionId']
         
         # 연결 정보 삭제
-        table = dynamodb.Table(get_table_name('websocket-connections'))
+        table = dynamodb.Table(get_table_name('websocket_connections'))
         table.delete_item(
             Key={'connectionId': connection_id}
         )
         
         logger.info(f"WebSocket disconnected: {connection_id}")
-        return create_response(200, {'message': 'Disconnected'})
+        return {'statusCode': 200, 'body': json.dumps({'message': 'Disconnected'})}
         
     except Exception as e:
         logger.error(f"Disconnect error: {str(e)}")
-        return create_response(500, {'error': str(e)})
\ No newline at end of file
+        return {'statusCode': 500, 'body': json.dumps({'error': str(e)})}
\ No newline at end of file
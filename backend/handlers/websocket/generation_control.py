@@ -0,0 +1,144 @@
+"""
+생성 제어 - 클라이언트가 요청한 응답 생성 취소 플래그 및 연결 종료 감지
+취소 요청과 스트리밍은 서로 다른 Lambda 호출에서 처리되므로 연결 테이블의 행에 플래그 저장
+"""
+import logging
+import os
+import time
+import uuid
+from typing import Optional
+
+import boto3
+
+from src.monitoring import instrument_resource
+
+logger = logging.getLogger(__name__)
+
+# DynamoDB 설정
+dynamodb = instrument_resource(boto3.resource('dynamodb', region_name='us-east-1'))
+connections_table = dynamodb.Table(
+    os.environ.get('WEBSOCKET_TABLE', 'nx-tt-dev-ver3-websocket-connections')
+)
+
+# 인증 정보 없이 연결된 경우의 userId
+ANONYMOUS_USER = 'anonymous'
+
+# 취소 플래그 폴링 주기 (시간 또는 청크 수 중 먼저 도달하는 쪽)
+POLL_INTERVAL_SECONDS = float(os.environ.get('CANCEL_POLL_INTERVAL', '0.25'))
+POLL_EVERY_CHUNKS = int(os.environ.get('CANCEL_POLL_EVERY_CHUNKS', '50'))
+
+
+class ClientGoneError(Exception):
+    """WebSocket 클라이언트 연결이 이미 끊어짐 (GoneException)"""
+
+    def __init__(self, connection_id: str):
+        super().__init__(f"Connection {connection_id} is gone")
+        self.connection_id = connection_id
+
+
+def remove_connection(connection_id: str) -> None:
+    """끊어진 연결 행 정리"""
+    try:
+        connections_table.delete_item(Key={'connectionId': connection_id})
+    except Exception as e:
+        logger.warning(f"Error removing gone connection {connection_id}: {str(e)}")
+
+
+def connection_user_id(connection_id: str) -> Optional[str]:
+    """
+    $connect에서 연결 행에 기록한 사용자 (인증자 컨텍스트 우선)
+    연결 행이 없거나 익명 연결이면 None
+    """
+    try:
+        response = connections_table.get_item(
+            Key={'connectionId': connection_id},
+            ProjectionExpression='userId'
+        )
+    except Exception as e:
+        logger.warning(f"Error reading connection {connection_id}: {str(e)}")
+        return None
+    user_id = response.get('Item', {}).get('userId')
+    return user_id if user_id and user_id != ANONYMOUS_USER else None
+
+
+class CancellationRegistry:
+    """연결/요청 ID별 취소 플래그 저장소"""
+
+    @staticmethod
+    def cancel(connection_id: str, request_id: str) -> bool:
+        """요청 취소 표시 (연결 행의 cancelledRequests 집합에 추가)"""
+        try:
+            connections_table.update_item(
+                Key={'connectionId': connection_id},
+                UpdateExpression='ADD cancelledRequests :rid',
+                ConditionExpression='attribute_exists(connectionId)',
+                ExpressionAttributeValues={':rid': {request_id}}
+            )
+            logger.info(f"Generation cancel requested: {connection_id} / {request_id}")
+            return True
+        except Exception as e:
+            logger.error(f"Error setting cancel flag: {str(e)}")
+            return False
+
+    @staticmethod
+    def is_cancelled(connection_id: str, request_id: str) -> bool:
+        """취소 여부 조회"""
+        try:
+            response = connections_table.get_item(
+                Key={'connectionId': connection_id},
+                ProjectionExpression='cancelledRequests'
+            )
+            return request_id in response.get('Item', {}).get('cancelledRequests', set())
+        except Exception as e:
+            logger.warning(f"Error reading cancel flag: {str(e)}")
+            return False
+
+
+class CancellationToken:
+    """스트리밍 루프용 취소 확인기 - 조회 결과를 캐시하여 DynamoDB 읽기를 제한"""
+
+    def __init__(
+        self,
+        connection_id: str,
+        request_id: str,
+        poll_interval: float = POLL_INTERVAL_SECONDS,
+        poll_every_chunks: int = POLL_EVERY_CHUNKS
+    ):
+        self.connection_id = connection_id
+        self.request_id = request_id
+        self.poll_interval = poll_interval
+        self.poll_every_chunks = poll_every_chunks
+        self._cancelled = False
+        self._last_poll = time.time()
+        self._checks_since_poll = 0
+
+    def is_cancelled(self) -> bool:
+        """캐시된 취소 여부 (폴링 주기가 지났을 때만 DynamoDB 조회)"""
+        if self._cancelled:
+            return True
+
+        self._checks_since_poll += 1
+        now = time.time()
+        if (now - self._last_poll < self.poll_interval
+                and self._checks_since_poll < self.poll_every_chunks):
+            return False
+
+        self._last_poll = now
+        self._checks_since_poll = 0
+        self._cancelled = CancellationRegistry.is_cancelled(self.connection_id, self.request_id)
+        return self._cancelled
+
+    def cancel(self) -> None:
+        """로컬 취소 (연결 종료 등 이 호출 안에서 감지한 경우)"""
+        self._cancelled = True
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+
+def new_request_id(requested: Optional[str] = None) -> str:
+    """클라이언트가 보낸 요청 ID 사용, 없으면 생성"""
+    if requested:
+        return str(requested)
+    return str(uuid.uuid4())
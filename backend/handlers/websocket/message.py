@@ -3,21 +3,43 @@ WebSocket Message Handler
 WebSocket 메시지 처리 Lambda 핸들러
 """
 import json
+import time
 import boto3
 import logging
 from datetime import datetime
 
-from services.websocket_service import WebSocketService
-from utils.logger import setup_logger
+from handlers.websocket.websocket_service import WebSocketService
+from handlers.websocket.generation_control import (
+    CancellationRegistry,
+    CancellationToken,
+    ClientGoneError,
+    connection_user_id,
+    new_request_id,
+    remove_connection
+)
+from handlers.websocket.stream_checkpoint import (
+    RESUME_GRACE_SECONDS,
+    STATUS_CANCELLED,
+    STATUS_DONE,
+    STATUS_STREAMING,
+    StreamCheckpointer,
+    StreamCheckpointStore
+)
+from handlers.websocket.conversation_manager import ConversationManager
+from src.monitoring import instrument_handler, metrics, traced_root
+from utils.logger import log_lambda_event, setup_logger
+from utils.serialization import ChunkFrameEncoder, dumps_bytes
 
 logger = setup_logger(__name__)
 
 
+@traced_root('websocket.message')
+@instrument_handler('websocket.message', start_turn=False)
 def handler(event, context):
     """
     WebSocket 메시지 핸들러 - Service Layer 사용
     """
-    logger.info(f"Message event: {json.dumps(event)}")
+    log_lambda_event(logger, event, 'Message event')
     
     # WebSocket 연결 정보
     connection_id = event['requestContext']['connectionId']
@@ -57,6 +79,38 @@ def handler(event, context):
                     'body': json.dumps({'message': 'History cleared'})
                 }
         
+        # 생성 취소 액션
+        elif action == 'cancelGeneration':
+            request_id = body.get('requestId')
+            if not request_id:
+                raise ValueError("requestId is required to cancel generation")
+            
+            success = CancellationRegistry.cancel(connection_id, request_id)
+            send_message_to_client(connection_id, {
+                'type': 'generation_cancel_requested' if success else 'error',
+                'requestId': request_id,
+                'message': '응답 생성을 중단합니다.' if success else '생성 취소 실패'
+            }, apigateway_client)
+            
+            return {
+                'statusCode': 200,
+                'body': json.dumps({'message': 'Cancel requested'})
+            }
+        
+        # 스트림 이어받기 액션 (재연결 후 놓친 청크 재전송)
+        elif action == 'resumeStream':
+            request_id = body.get('requestId')
+            if not request_id:
+                raise ValueError("requestId is required to resume a stream")
+            last_index = int(body.get('lastChunkIndex', -1))
+            
+            resumed = resume_stream(connection_id, request_id, last_index, apigateway_client)
+            
+            return {
+                'statusCode': 200 if resumed else 404,
+                'body': json.dumps({'message': 'Stream resumed' if resumed else 'Stream not resumable'})
+            }
+        
         # 메시지 전송 액션
         elif action == 'sendMessage':
             # 파라미터 추출
@@ -64,10 +118,26 @@ def handler(event, context):
             engine_type = body.get('engineType', 'T5')
             conversation_id = body.get('conversationId')
             user_id = body.get('userId', body.get('email', connection_id))
-            conversation_history = body.get('conversationHistory', [])
+            conversation_history = body.get('conversationHistory')
+            history_source = 'client'
+            if conversation_history is None and conversation_id:
+                # 히스토리 없이 (선택적으로 마지막으로 받은 메시지 id만) 보낸 경우 - 서버 저장본 사용
+                conversation_history = ConversationManager.get_history_until(
+                    conversation_id, body.get('lastMessageId')
+                )
+                history_source = 'server'
+            conversation_history = conversation_history or []
             user_role = determine_user_role(user_id, body)
+            request_id = new_request_id(body.get('requestId'))
+            cancel_token = CancellationToken(connection_id, request_id)
+            
+            # 턴 단위 메트릭 (EMF, 핸들러 종료 시 출력)
+            turn_metrics = metrics.start_turn(EngineType=engine_type)
+            turn_metrics.set_property('requestId', request_id)
+            turn_metrics.set_property('conversationId', conversation_id)
+            turn_metrics.set_property('historySource', history_source)
             
-            logger.info(f"Processing message for {engine_type}, user: {user_id}, role: {user_role}")
+            logger.info("Processing message for %s, user: %s, role: %s", engine_type, user_id, user_role)
             
             # 1. 메시지 처리 시작
             process_result = websocket_service.process_message(
@@ -85,44 +155,135 @@ def handler(event, context):
             # 2. AI 시작 알림
             send_message_to_client(connection_id, {
                 'type': 'ai_start',
+                'requestId': request_id,
                 'timestamp': datetime.utcnow().isoformat() + 'Z'
             }, apigateway_client)
             
-            # 3. 스트리밍 응답 전송
+            # 3. 스트리밍 응답 전송 (재연결 시 이어받을 수 있도록 청크 체크포인트)
             chunk_index = 0
             total_response = ""
+            chunks = []
+            client_gone = False
+            target_connection = connection_id
+            sent_through = -1
+            detached_at = None
+            
+            checkpointer = StreamCheckpointer(request_id, connection_id, user_id, conversation_id, engine_type)
+            checkpointer.start()
+            chunk_frames = ChunkFrameEncoder(request_id)
             
-            for chunk in websocket_service.stream_response(
+            def notify_status(status):
+                """생성 상태 알림 (Bedrock 대기열 진입 등)"""
+                send_message_to_client(target_connection, {
+                    **status,
+                    'type': status.get('status', 'status'),
+                    'timestamp': datetime.utcnow().isoformat() + 'Z'
+                }, apigateway_client)
+            
+            response_stream = websocket_service.stream_response(
                 user_message=user_message,
                 engine_type=engine_type,
                 conversation_id=conversation_id,
                 user_id=user_id,
                 conversation_history=merged_history,
-                user_role=user_role
-            ):
-                total_response += chunk
-                
-                # 청크 전송
-                send_message_to_client(connection_id, {
-                    'type': 'ai_chunk',
-                    'chunk': chunk,
-                    'chunk_index': chunk_index,
-                    'timestamp': datetime.utcnow().isoformat() + 'Z'
-                }, apigateway_client)
-                
-                chunk_index += 1
+                user_role=user_role,
+                status_callback=notify_status,
+                cancel_check=cancel_token.is_cancelled
+            )
+            
+            try:
+                for chunk in response_stream:
+                    total_response += chunk
+                    chunks.append(chunk)
+                    checkpointer.append(chunk_index, chunk)
+                    chunk_index += 1
+                    
+                    # 연결이 끊어진 상태 - 재연결(resumeStream)을 유예 시간 동안만 대기
+                    if detached_at is not None:
+                        attached = checkpointer.poll_attached()
+                        if attached:
+                            target_connection, sent_through = attached
+                            cancel_token.connection_id = target_connection
+                            detached_at = None
+                            logger.info(f"Generation {request_id} resumed on {target_connection}")
+                        elif time.time() - detached_at > RESUME_GRACE_SECONDS:
+                            client_gone = True
+                            cancel_token.cancel()
+                            logger.info(f"Client gone, aborting generation {request_id} after {chunk_index} chunks")
+                            break
+                        else:
+                            continue
+                    
+                    # 청크 전송 (재연결 직후에는 아직 재전송되지 않은 청크부터)
+                    try:
+                        for index in range(sent_through + 1, chunk_index):
+                            send_message_to_client(
+                                target_connection,
+                                chunk_frames.encode(chunks[index], index),
+                                apigateway_client
+                            )
+                            sent_through = index
+                    except ClientGoneError:
+                        if RESUME_GRACE_SECONDS <= 0:
+                            client_gone = True
+                            cancel_token.cancel()
+                            logger.info(f"Client gone, aborting generation {request_id} after {chunk_index} chunks")
+                            break
+                        detached_at = time.time()
+                        logger.info(f"Client gone, waiting {RESUME_GRACE_SECONDS}s for resume of {request_id}")
+                        continue
+                    
+                    # 취소 요청 확인 (캐시된 플래그, 주기적으로만 DynamoDB 조회)
+                    if cancel_token.is_cancelled():
+                        logger.info(f"Generation {request_id} cancelled by client after {chunk_index} chunks")
+                        break
+            finally:
+                # 생성기를 닫아 Bedrock 스트림도 함께 종료
+                if hasattr(response_stream, 'close'):
+                    response_stream.close()
             
-            # 4. 사용량 추적
+            truncated = cancel_token.cancelled
+            turn_metrics.record('ResponseChunks', chunk_index, metrics.Unit.COUNT)
+            turn_metrics.record('Truncated', 1 if truncated else 0, metrics.Unit.COUNT)
+            checkpointer.finish(STATUS_CANCELLED if truncated else STATUS_DONE, chunk_index)
+            
+            # 4. 중단된 경우 부분 응답 저장
+            if truncated and total_response:
+                ConversationManager.save_message(
+                    conversation_id,
+                    'assistant',
+                    total_response,
+                    engine_type,
+                    user_id,
+                    truncated=True
+                )
+            
+            # 5. 사용량 추적 (중단된 경우 실제 생성된 분량만 반영)
             websocket_service.track_usage(
                 user_id=user_id,
                 engine_type=engine_type,
                 input_text=user_message,
-                output_text=total_response
+                output_text=total_response,
+                truncated=truncated
             )
             
-            # 5. 완료 알림
-            send_message_to_client(connection_id, {
+            if client_gone or detached_at is not None:
+                # 연결 없이 끝난 응답은 체크포인트에서 resumeStream으로 받을 수 있음
+                return {
+                    'statusCode': 410,
+                    'body': json.dumps({
+                        'message': 'Connection gone, generation aborted' if client_gone
+                                   else 'Connection gone, response checkpointed',
+                        'chunks_sent': sent_through + 1,
+                        'response_length': len(total_response)
+                    })
+                }
+            
+            # 6. 완료 알림
+            send_message_to_client(target_connection, {
                 'type': 'chat_end',
+                'requestId': request_id,
+                'cancelled': cancel_token.cancelled,
                 'engine': engine_type,
                 'conversationId': conversation_id,
                 'total_chunks': chunk_index,
@@ -131,7 +292,7 @@ def handler(event, context):
                 'timestamp': datetime.utcnow().isoformat() + 'Z'
             }, apigateway_client)
             
-            logger.info(f"Chat completed: {chunk_index} chunks, {len(total_response)} chars")
+            logger.info("Chat completed: %d chunks, %d chars", chunk_index, len(total_response))
             
             return {
                 'statusCode': 200,
@@ -154,6 +315,14 @@ def handler(event, context):
                 'body': json.dumps({'error': 'Unknown action'})
             }
             
+    except ClientGoneError:
+        # 응답할 대상이 없으므로 에러 전송 생략
+        logger.info(f"Connection {connection_id} gone before processing finished")
+        return {
+            'statusCode': 410,
+            'body': json.dumps({'error': 'Connection gone'})
+        }
+    
     except Exception as e:
         logger.error(f"Error processing message: {str(e)}", exc_info=True)
         
@@ -170,6 +339,74 @@ def handler(event, context):
             'statusCode': 500,
             'body': json.dumps({'error': str(e)})
         }
+    
+    finally:
+        metrics.end_turn()
+
+
+def resume_stream(connection_id, request_id, last_index, apigateway_client):
+    """
+    체크포인트에서 last_index 이후 청크를 재전송
+    생성이 진행 중이면 이 연결로 실시간 청크를 이어받고, 끝났으면 완료 알림까지 전송
+    """
+    meta = StreamCheckpointStore.load_meta(request_id)
+    
+    # 소유자가 확인된 스트림만 이어받음 - 메시지 본문의 userId가 아니라 $connect에서 연결에 기록된 사용자와 비교
+    # (연결 사용자/저장된 userId 중 하나라도 없거나 익명 연결이면 거부)
+    user_id = connection_user_id(connection_id) if meta else None
+    if meta and (not user_id or not meta.get('userId') or meta['userId'] != user_id):
+        logger.warning(f"Resume of {request_id} rejected for {connection_id}: owner mismatch")
+        meta = None
+    
+    if not meta or (meta.get('checkpointOverflow') and meta.get('status') != STATUS_STREAMING):
+        send_message_to_client(connection_id, {
+            'type': 'resume_unavailable',
+            'requestId': request_id,
+            'message': '이어받을 수 있는 응답이 없습니다.'
+        }, apigateway_client)
+        return False
+    
+    chunk_frames = ChunkFrameEncoder(request_id, replayed=True)
+    
+    def replay(after_index):
+        sent = after_index
+        for index, chunk in StreamCheckpointStore.load_chunks(request_id, after_index):
+            send_message_to_client(connection_id, chunk_frames.encode(chunk, index), apigateway_client)
+            sent = index
+        return sent
+    
+    replayed_through = replay(last_index)
+    live = meta.get('status') == STATUS_STREAMING and StreamCheckpointStore.attach(
+        request_id, connection_id, replayed_through
+    )
+    
+    if not live and meta.get('status') == STATUS_STREAMING:
+        # 재전송 도중 생성이 끝남 - 마지막 묶음까지 재전송
+        replayed_through = replay(replayed_through)
+        meta = StreamCheckpointStore.load_meta(request_id) or meta
+    
+    send_message_to_client(connection_id, {
+        'type': 'stream_resumed',
+        'requestId': request_id,
+        'live': live,
+        'replayedThrough': replayed_through,
+        'timestamp': datetime.utcnow().isoformat() + 'Z'
+    }, apigateway_client)
+    
+    if not live:
+        send_message_to_client(connection_id, {
+            'type': 'chat_end',
+            'requestId': request_id,
+            'cancelled': meta.get('status') == STATUS_CANCELLED,
+            'engine': meta.get('engineType'),
+            'conversationId': meta.get('conversationId'),
+            'total_chunks': int(meta.get('totalChunks', replayed_through + 1)),
+            'message': '응답 생성이 완료되었습니다.',
+            'timestamp': datetime.utcnow().isoformat() + 'Z'
+        }, apigateway_client)
+    
+    logger.info(f"Stream {request_id} resumed on {connection_id} from {last_index} (live: {live})")
+    return True
 
 
 def determine_user_role(user_id, body):
@@ -186,24 +423,27 @@ def determine_user_role(user_id, body):
 
 
 def send_message_to_client(connection_id, message, apigateway_client):
-    """클라이언트에게 메시지 전송"""
+    """
+    클라이언트에게 메시지 전송 (연결이 끊어졌으면 정리 후 ClientGoneError)
+    message는 dict 또는 미리 인코딩된 프레임(bytes, ChunkFrameEncoder)
+    """
     try:
+        started = time.perf_counter()
         apigateway_client.post_to_connection(
             ConnectionId=connection_id,
-            Data=json.dumps(message, ensure_ascii=False, default=str)
+            Data=message if isinstance(message, bytes) else dumps_bytes(message)
         )
-        logger.debug(f"Message sent to {connection_id}: {message.get('type', 'unknown')}")
+        metrics.sample('WebSocketPostLatency', (time.perf_counter() - started) * 1000)
+        if logger.isEnabledFor(logging.DEBUG):
+            message_type = 'ai_chunk' if isinstance(message, bytes) else message.get('type', 'unknown')
+            logger.debug("Message sent to %s: %s", connection_id, message_type)
         
     except apigateway_client.exceptions.GoneException:
         logger.warning(f"Connection {connection_id} is gone")
-        # 연결이 끊어진 경우 정리
-        try:
-            dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
-            connections_table = dynamodb.Table('nx-tt-dev-ver3-websocket-connections')
-            connections_table.delete_item(Key={'connectionId': connection_id})
-        except:
-            pass
-            
+        # 연결이 끊어진 경우 정리 후 호출자에게 전파 (생성 중단)
+        remove_connection(connection_id)
+        raise ClientGoneError(connection_id)
+        
     except Exception as e:
         logger.error(f"Error sending message to {connection_id}: {str(e)}")
         raise
\ No newline at end of file
@@ -0,0 +1,219 @@
+"""
+스트림 체크포인트 - 재연결한 클라이언트가 놓친 청크를 이어받을 수 있도록 응답 청크 저장
+요청 ID별로 청크를 묶어 TTL이 있는 테이블에 기록 (요청당 청크 수 상한)
+
+아이템 구조:
+- 메타 (chunkIndex = -1): status, connectionId(현재 수신 연결), userId, conversationId, replayedThrough
+- 청크 묶음 (chunkIndex = 묶음의 첫 인덱스): chunks
+"""
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import boto3
+from boto3.dynamodb.conditions import Key
+
+from src.monitoring import instrument_resource
+
+logger = logging.getLogger(__name__)
+
+# DynamoDB 설정
+dynamodb = instrument_resource(boto3.resource('dynamodb', region_name='us-east-1'))
+checkpoints_table = dynamodb.Table(
+    os.environ.get('STREAM_CHECKPOINT_TABLE', 'nx-tt-dev-ver3-stream-checkpoints')
+)
+
+# 체크포인트 보관 시간 및 요청당 최대 청크 수
+CHECKPOINT_TTL_SECONDS = int(os.environ.get('STREAM_CHECKPOINT_TTL', '600'))
+MAX_CHECKPOINT_CHUNKS = int(os.environ.get('STREAM_CHECKPOINT_MAX_CHUNKS', '4000'))
+
+# 묶음 기록 주기 (청크 수 또는 시간 중 먼저 도달하는 쪽)
+FLUSH_EVERY_CHUNKS = int(os.environ.get('STREAM_CHECKPOINT_FLUSH_CHUNKS', '20'))
+FLUSH_INTERVAL_SECONDS = float(os.environ.get('STREAM_CHECKPOINT_FLUSH_INTERVAL', '1.0'))
+
+# 연결이 끊어진 뒤 재연결을 기다리며 생성을 계속하는 시간 (0이면 즉시 중단)
+RESUME_GRACE_SECONDS = float(os.environ.get('STREAM_RESUME_GRACE', '10'))
+ATTACH_POLL_INTERVAL_SECONDS = float(os.environ.get('STREAM_ATTACH_POLL_INTERVAL', '0.5'))
+
+META_INDEX = -1
+
+# 스트림 상태
+STATUS_STREAMING = 'streaming'
+STATUS_DONE = 'done'
+STATUS_CANCELLED = 'cancelled'
+
+
+def _expires_at() -> int:
+    return int(time.time()) + CHECKPOINT_TTL_SECONDS
+
+
+class StreamCheckpointStore:
+    """체크포인트 조회/재연결 처리"""
+
+    @staticmethod
+    def load_meta(request_id: str) -> Optional[Dict[str, Any]]:
+        """스트림 메타 정보 조회"""
+        response = checkpoints_table.get_item(
+            Key={'requestId': request_id, 'chunkIndex': META_INDEX},
+            ConsistentRead=True
+        )
+        return response.get('Item')
+
+    @staticmethod
+    def load_chunks(request_id: str, after_index: int) -> List[Tuple[int, str]]:
+        """after_index 이후의 청크 목록 (인덱스 순)"""
+        chunks: List[Tuple[int, str]] = []
+        query = {
+            'KeyConditionExpression': Key('requestId').eq(request_id) & Key('chunkIndex').gte(0),
+            'ConsistentRead': True
+        }
+        while True:
+            response = checkpoints_table.query(**query)
+            for item in response.get('Items', []):
+                start = int(item['chunkIndex'])
+                for offset, chunk in enumerate(item.get('chunks', [])):
+                    index = start + offset
+                    if index > after_index:
+                        chunks.append((index, chunk))
+            if 'LastEvaluatedKey' not in response:
+                break
+            query['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        return chunks
+
+    @staticmethod
+    def attach(request_id: str, connection_id: str, replayed_through: int) -> bool:
+        """진행 중인 스트림의 수신 연결 교체 (이미 끝난 스트림이면 False)"""
+        try:
+            checkpoints_table.update_item(
+                Key={'requestId': request_id, 'chunkIndex': META_INDEX},
+                UpdateExpression='SET connectionId = :cid, replayedThrough = :through, updatedAt = :now',
+                ConditionExpression='#status = :streaming',
+                ExpressionAttributeNames={'#status': 'status'},
+                ExpressionAttributeValues={
+                    ':cid': connection_id,
+                    ':through': replayed_through,
+                    ':now': datetime.utcnow().isoformat() + 'Z',
+                    ':streaming': STATUS_STREAMING
+                }
+            )
+            return True
+        except checkpoints_table.meta.client.exceptions.ConditionalCheckFailedException:
+            return False
+
+
+class StreamCheckpointer:
+    """생성 중인 스트림의 청크 기록기 - 기록 실패는 스트리밍을 막지 않음"""
+
+    def __init__(self, request_id: str, connection_id: str, user_id: str, conversation_id: str, engine_type: str):
+        self.request_id = request_id
+        self.connection_id = connection_id
+        self.user_id = user_id
+        self.conversation_id = conversation_id
+        self.engine_type = engine_type
+        self.enabled = True
+        self.overflow = False
+        self._buffer: List[str] = []
+        self._buffer_start = 0
+        self._last_flush = time.time()
+        self._last_attach_poll = 0.0
+
+    def start(self) -> None:
+        """스트림 메타 기록"""
+        try:
+            checkpoints_table.put_item(Item={
+                'requestId': self.request_id,
+                'chunkIndex': META_INDEX,
+                'status': STATUS_STREAMING,
+                'connectionId': self.connection_id,
+                'userId': self.user_id,
+                'conversationId': self.conversation_id,
+                'engineType': self.engine_type,
+                'replayedThrough': META_INDEX,
+                'updatedAt': datetime.utcnow().isoformat() + 'Z',
+                'ttl': _expires_at()
+            })
+        except Exception as e:
+            logger.warning(f"Stream checkpointing disabled for {self.request_id}: {str(e)}")
+            self.enabled = False
+
+    def append(self, chunk_index: int, chunk: str) -> None:
+        """청크 추가 (묶음 단위로 기록)"""
+        if not self.enabled or self.overflow:
+            return
+        if chunk_index >= MAX_CHECKPOINT_CHUNKS:
+            self.flush()
+            self.overflow = True
+            logger.warning(f"Stream {self.request_id} exceeded {MAX_CHECKPOINT_CHUNKS} checkpoint chunks")
+            return
+
+        if not self._buffer:
+            self._buffer_start = chunk_index
+        self._buffer.append(chunk)
+
+        if (len(self._buffer) >= FLUSH_EVERY_CHUNKS
+                or time.time() - self._last_flush >= FLUSH_INTERVAL_SECONDS):
+            self.flush()
+
+    def flush(self) -> None:
+        """버퍼의 청크 묶음 기록"""
+        self._last_flush = time.time()
+        if not self.enabled or not self._buffer:
+            return
+        try:
+            checkpoints_table.put_item(Item={
+                'requestId': self.request_id,
+                'chunkIndex': self._buffer_start,
+                'chunks': self._buffer,
+                'ttl': _expires_at()
+            })
+        except Exception as e:
+            logger.warning(f"Stream checkpointing disabled for {self.request_id}: {str(e)}")
+            self.enabled = False
+        self._buffer = []
+
+    def finish(self, status: str, total_chunks: int) -> None:
+        """남은 청크 기록 후 스트림 종료 표시"""
+        self.flush()
+        if not self.enabled:
+            return
+        try:
+            checkpoints_table.update_item(
+                Key={'requestId': self.request_id, 'chunkIndex': META_INDEX},
+                UpdateExpression=(
+                    'SET #status = :status, totalChunks = :total, checkpointOverflow = :overflow, '
+                    'updatedAt = :now, #ttl = :ttl'
+                ),
+                ExpressionAttributeNames={'#status': 'status', '#ttl': 'ttl'},
+                ExpressionAttributeValues={
+                    ':status': status,
+                    ':total': total_chunks,
+                    ':overflow': self.overflow,
+                    ':now': datetime.utcnow().isoformat() + 'Z',
+                    ':ttl': _expires_at()
+                }
+            )
+        except Exception as e:
+            logger.warning(f"Error finishing stream checkpoint {self.request_id}: {str(e)}")
+
+    def poll_attached(self) -> Optional[Tuple[str, int]]:
+        """다른 연결이 스트림을 이어받았는지 확인 (연결 ID, 재전송 완료 인덱스)"""
+        if not self.enabled:
+            return None
+        now = time.time()
+        if now - self._last_attach_poll < ATTACH_POLL_INTERVAL_SECONDS:
+            return None
+        self._last_attach_poll = now
+
+        try:
+            meta = StreamCheckpointStore.load_meta(self.request_id) or {}
+        except Exception as e:
+            logger.warning(f"Error polling stream attachment {self.request_id}: {str(e)}")
+            return None
+
+        connection_id = meta.get('connectionId')
+        if not connection_id or connection_id == self.connection_id:
+            return None
+        self.connection_id = connection_id
+        return connection_id, int(meta.get('replayedThrough', META_INDEX))
@@ -0,0 +1,152 @@
+"""
+WebSocket 채팅 서비스
+메시지 핸들러가 사용하는 대화 저장/프롬프트 구성/Bedrock 스트리밍/사용량 추적
+(상태 알림, 취소 확인, 엔진 타입을 stream_claude_response_enhanced까지 그대로 전달)
+"""
+import logging
+import uuid
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from handlers.api.prompt import prompts_table, query_file_metadata
+from handlers.api.usage import update_usage
+from handlers.websocket.conversation_manager import ConversationManager, conversations_table
+from lib.bedrock_client_enhanced import (
+    ConstraintExtractor,
+    create_enhanced_system_prompt,
+    stream_claude_response_enhanced
+)
+from src.models import utc_timestamp
+from src.monitoring import trace_class
+
+logger = logging.getLogger(__name__)
+
+# 모델에 함께 보내는 최근 대화 수
+HISTORY_MESSAGES = 10
+# 히스토리 메시지당 최대 글자 수 (긴 이전 응답이 현재 요청을 밀어내지 않도록)
+HISTORY_MESSAGE_CHARS = 2000
+
+
+def _role(message: Dict[str, Any]) -> str:
+    # 프론트엔드는 type, 저장본은 role (둘 다 있을 수 있음)
+    role = message.get('role') or message.get('type')
+    return 'user' if role == 'user' else 'assistant'
+
+
+def format_history(history: List[Dict[str, Any]]) -> str:
+    """최근 대화를 사용자 메시지 앞에 붙일 맥락으로 변환"""
+    lines = []
+    for message in history[-HISTORY_MESSAGES:]:
+        content = (message.get('content') or '').strip()
+        if not content:
+            continue
+        speaker = '사용자' if _role(message) == 'user' else 'AI'
+        lines.append(f"{speaker}: {content[:HISTORY_MESSAGE_CHARS]}")
+    return '\n'.join(lines)
+
+
+@trace_class()
+class WebSocketService:
+    """WebSocket 메시지 처리 서비스"""
+
+    def load_prompt_data(self, engine_type: str, user_role: str) -> Dict[str, Any]:
+        """엔진 프롬프트와 지식 파일 메타데이터 (파일 본문은 프롬프트 구성 시 필요한 앞부분만 읽음)"""
+        prompt = prompts_table.get_item(Key={'id': engine_type}).get('Item', {})
+        return {
+            'prompt': prompt,
+            'files': query_file_metadata(engine_type, include_legacy_content=True),
+            'userRole': user_role
+        }
+
+    def process_message(
+        self,
+        user_message: str,
+        engine_type: str,
+        conversation_id: Optional[str],
+        user_id: str,
+        conversation_history: List[Dict[str, Any]],
+        user_role: str = 'user'
+    ) -> Dict[str, Any]:
+        """사용자 메시지 저장 후 모델에 보낼 히스토리 결정 (클라이언트 히스토리가 없으면 저장본)"""
+        conversation_id = conversation_id or str(uuid.uuid4())
+        merged_history = list(conversation_history or [])
+        if not merged_history:
+            merged_history = ConversationManager.get_conversation_history(conversation_id, HISTORY_MESSAGES)
+
+        ConversationManager.save_message(conversation_id, 'user', user_message, engine_type, user_id)
+        return {
+            'conversation_id': conversation_id,
+            'merged_history': merged_history
+        }
+
+    def stream_response(
+        self,
+        user_message: str,
+        engine_type: str,
+        conversation_id: str,
+        user_id: str,
+        conversation_history: List[Dict[str, Any]],
+        user_role: str = 'user',
+        status_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        cancel_check: Optional[Callable[[], bool]] = None
+    ) -> Iterator[str]:
+        """
+        Bedrock 응답 스트림 (끝까지 생성된 응답만 저장 - 취소된 부분 응답은 핸들러가 truncated로 저장)
+        지침/요청에 검증할 제약이 없으면 검증 없이 청크를 바로 전달
+        """
+        prompt_data = self.load_prompt_data(engine_type, user_role)
+        system_prompt = create_enhanced_system_prompt(prompt_data, engine_type)
+
+        context = format_history(conversation_history)
+        message = f"[이전 대화]\n{context}\n\n[현재 요청]\n{user_message}" if context else user_message
+        guidelines = prompt_data['prompt'].get('instruction', '')
+        validate = bool(ConstraintExtractor.extract(f"{guidelines} {user_message}"))
+
+        stream = stream_claude_response_enhanced(
+            message,
+            system_prompt,
+            validate_constraints=validate,
+            prompt_data=prompt_data,
+            status_callback=status_callback,
+            engine_type=engine_type,
+            cancel_check=cancel_check
+        )
+
+        parts = []
+        try:
+            for chunk in stream:
+                parts.append(chunk)
+                yield chunk
+        finally:
+            # 소비자가 중간에 닫으면 Bedrock 스트림도 닫음
+            stream.close()
+
+        if parts and not (cancel_check and cancel_check()):
+            ConversationManager.save_message(conversation_id, 'assistant', ''.join(parts), engine_type, user_id)
+
+    def track_usage(
+        self,
+        user_id: str,
+        engine_type: str,
+        input_text: str,
+        output_text: str,
+        truncated: bool = False
+    ) -> Dict[str, Any]:
+        """사용량 추적 (중단된 생성은 실제 생성된 분량만)"""
+        return update_usage(user_id, engine_type, input_text, output_text, truncated=truncated)
+
+    def clear_history(self, conversation_id: str) -> bool:
+        """대화 메시지 초기화 (대화 아이템은 유지)"""
+        try:
+            conversations_table.update_item(
+                Key={'conversationId': conversation_id},
+                UpdateExpression='SET messages = :empty, updatedAt = :updated',
+                ConditionExpression='attribute_exists(conversationId)',
+                ExpressionAttributeValues={
+                    ':empty': [],
+                    ':updated': utc_timestamp()
+                }
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Error clearing history: {str(e)}")
+            return False
@@ -2,24 +2,42 @@
 AWS Bedrock Claude 클라이언트 - 프롬프트 준수 강화 버전
 범용 서비스로서 관리자가 정의한 어떤 프롬프트든 정확히 준수하도록 설계
 """
-import boto3
 import json
 import logging
 import re
-from typing import Dict, Any, Iterator, List, Optional, Tuple
+import time
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
 from datetime import datetime
 
+from src.config.aws import BEDROCK_CONFIG, HEDGING_CONFIG, NBEST_CONFIG
+from lib.bedrock_governor import GovernorTimeoutError, get_governor
+from lib.bedrock_hedging import get_hedge_budget, get_ttft_tracker, hedged_text_stream
+from lib.bedrock_nbest import NBestResult, generate_first_valid
+from lib.model_router import CHARS_PER_TOKEN, ModelRoute, default_route, get_model_router
+from lib.file_content_store import load_file_content
+from src.monitoring import metrics, tracing
+from lib.bedrock_transport import (
+    DecorrelatedJitterBackoff,
+    ErrorClass,
+    classify_error,
+    get_bedrock_runtime_client,
+    get_error_code,
+    is_retryable,
+    record_attempt
+)
+
 logger = logging.getLogger(__name__)
 
-# Bedrock Runtime 클라이언트 초기화
-bedrock_runtime = boto3.client('bedrock-runtime', region_name='us-east-1')
+# Bedrock Runtime 클라이언트 초기화 (커넥션 풀/타임아웃 튜닝 적용)
+bedrock_runtime = get_bedrock_runtime_client()
 
-# Claude 4.0 모델 설정 - 준수 모드 최적화
-CLAUDE_MODEL_ID = "us.anthropic.claude-sonnet-4-20250514-v1:0"
-MAX_TOKENS = 16384
-TEMPERATURE = 0.81  # 더 창의적인 생성 (0.15 → 0.81)
-TOP_P = 0.9        # 더 다양한 선택 (0.6 → 0.9)
-TOP_K = 50         # 더 폭넓은 선택지 (25 → 50)
+# Claude 4.0 모델 설정 - 준수 모드 최적화 (기본 라우트, BEDROCK_CONFIG)
+# 엔진/요청별 모델 선택은 lib.model_router 규칙으로 재정의
+CLAUDE_MODEL_ID = BEDROCK_CONFIG['model_id']
+MAX_TOKENS = BEDROCK_CONFIG['max_tokens']
+TEMPERATURE = BEDROCK_CONFIG['temperature']  # 더 창의적인 생성 (0.15 → 0.81)
+TOP_P = BEDROCK_CONFIG['top_p']        # 더 다양한 선택 (0.6 → 0.9)
+TOP_K = BEDROCK_CONFIG['top_k']        # 더 폭넓은 선택지 (25 → 50)
 
 
 class PromptComponent:
@@ -74,23 +92,38 @@ class ConstraintExtractor:
         if any(word in prompt for word in ['스타일', '문체', '어조', '톤', '띄어쓰기', '맞춤법']):
             constraints['style_emphasis'] = True
         
-        logger.info(f"Extracted constraints: {constraints}")
+        logger.debug("Extracted constraints: %s", constraints)
         return constraints
 
 
 class ResponseValidator:
     """생성된 응답 검증"""
     
+    # 레이블이나 번호 (길이 측정 시 제외)
+    ITEM_PREFIX_PATTERN = r'^\d+\.\s*|^-\s*|^•\s*|^[가-힣]+:\s*'
+    
     @staticmethod
     def validate(response: str, constraints: Dict[str, Any]) -> Tuple[bool, str]:
         """응답이 제약 조건을 만족하는지 검증"""
-        errors = []
+        violations = ResponseValidator.find_violations(response, constraints)
+        if violations:
+            return False, ResponseValidator.format_violations(violations)
+        return True, ""
+    
+    @staticmethod
+    def find_violations(response: str, constraints: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """제약 조건 위반 항목을 구조화하여 반환 (부분 수정 재시도에 사용)"""
+        violations = []
         
         # 개수 검증
         if 'exact_count' in constraints:
             lines = [l for l in response.strip().split('\n') if l.strip()]
             if len(lines) != constraints['exact_count']:
-                errors.append(f"항목 개수가 {constraints['exact_count']}개가 아님 (현재: {len(lines)}개)")
+                violations.append({
+                    'kind': 'count',
+                    'expected': constraints['exact_count'],
+                    'actual': len(lines)
+                })
         
         # 길이 검증
         if 'char_range' in constraints:
@@ -98,29 +131,164 @@ class ResponseValidator:
             lines = response.strip().split('\n')
             for i, line in enumerate(lines, 1):
                 # 레이블이나 번호 제거 후 실제 내용만 측정
-                content = re.sub(r'^\d+\.\s*|^-\s*|^•\s*|^[가-힣]+:\s*', '', line)
+                content = re.sub(ResponseValidator.ITEM_PREFIX_PATTERN, '', line)
                 length = len(content)
                 if not (min_chars <= length <= max_chars):
-                    errors.append(f"{i}번째 항목 길이 {length}자 ({min_chars}-{max_chars}자 범위 벗어남)")
+                    violations.append({
+                        'kind': 'length',
+                        'line': i,
+                        'length': length,
+                        'range': (min_chars, max_chars)
+                    })
         
         # 형식 검증
         if constraints.get('format') == 'json':
             try:
                 json.loads(response)
-            except:
-                errors.append("유효한 JSON 형식이 아님")
+            except Exception as e:
+                violations.append({'kind': 'json', 'detail': str(e)})
         
         # 필수 필드 검증
         if 'required_fields' in constraints:
             for field in constraints['required_fields']:
                 if field not in response:
-                    errors.append(f"필수 필드 '{field}' 누락")
+                    violations.append({'kind': 'missing_field', 'field': field})
         
-        if errors:
-            return False, " / ".join(errors)
-        return True, ""
+        return violations
+    
+    @staticmethod
+    def format_violations(violations: List[Dict[str, Any]]) -> str:
+        """위반 항목을 사람이 읽을 수 있는 오류 메시지로 변환"""
+        errors = []
+        for violation in violations:
+            kind = violation['kind']
+            if kind == 'count':
+                errors.append(f"항목 개수가 {violation['expected']}개가 아님 (현재: {violation['actual']}개)")
+            elif kind == 'length':
+                min_chars, max_chars = violation['range']
+                errors.append(f"{violation['line']}번째 항목 길이 {violation['length']}자 ({min_chars}-{max_chars}자 범위 벗어남)")
+            elif kind == 'json':
+                errors.append("유효한 JSON 형식이 아님")
+            elif kind == 'missing_field':
+                errors.append(f"필수 필드 '{violation['field']}' 누락")
+        return " / ".join(errors)
+
+
+class ResponseRepairer:
+    """검증 실패 시 위반 항목만 다시 생성하여 기존 응답에 병합"""
+    
+    # 수정 항목 하나당 출력 토큰 예산
+    TOKENS_PER_ITEM = 160
+    BASE_REPAIR_TOKENS = 256
+    
+    PATCH_PATTERN = re.compile(r'^\s*(\d+)\s*[:.)]\s*(.*)$')
+    
+    @staticmethod
+    def trim_extra_items(response: str, constraints: Dict[str, Any]) -> str:
+        """항목이 초과된 경우 모델 호출 없이 앞에서부터 필요한 개수만 유지"""
+        expected = constraints.get('exact_count')
+        if not expected:
+            return response
+        lines = [l for l in response.strip().split('\n') if l.strip()]
+        if len(lines) <= expected:
+            return response
+        return '\n'.join(lines[:expected])
+    
+    @staticmethod
+    def build_repair_message(response: str, violations: List[Dict[str, Any]]) -> Optional[str]:
+        """이전 응답과 위반 항목으로 부분 수정 요청 메시지 구성"""
+        if not violations:
+            return None
+        
+        if any(v['kind'] in ('json', 'missing_field') for v in violations):
+            # 구조 오류는 항목 단위로 나눌 수 없으므로 교정된 전체 JSON만 요청
+            details = ResponseValidator.format_violations(violations)
+            json_errors = [v['detail'] for v in violations if v['kind'] == 'json']
+            if json_errors:
+                details += f"\n파싱 오류: {json_errors[0]}"
+            return f"""[부분 수정 요청]
+위 응답에 다음 문제가 있습니다:
+{details}
+
+설명 없이 문제를 수정한 최종 결과만 다시 출력하세요. 내용은 최대한 유지하세요."""
+        
+        lines = response.strip().split('\n')
+        requests = []
+        for violation in violations:
+            if violation['kind'] == 'length':
+                min_chars, max_chars = violation['range']
+                line_no = violation['line']
+                requests.append(
+                    f"- {line_no}번 항목: 현재 {violation['length']}자 → {min_chars}-{max_chars}자로 수정"
+                )
+            elif violation['kind'] == 'count' and violation['actual'] < violation['expected']:
+                start = len(lines) + 1
+                end = len(lines) + violation['expected'] - violation['actual']
+                requests.append(f"- {start}~{end}번 항목: 누락된 항목 새로 작성")
+        
+        if not requests:
+            return None
+        
+        numbered = '\n'.join(f"{i}: {line}" for i, line in enumerate(lines, 1))
+        return f"""[부분 수정 요청]
+이전 응답 (줄 번호 포함):
+{numbered}
+
+다음 항목만 수정하세요:
+{chr(10).join(requests)}
+
+다른 항목은 출력하지 말고, 수정한 항목만 "번호: 내용" 형식으로 한 줄씩 출력하세요."""
+    
+    @staticmethod
+    def estimate_max_tokens(violations: List[Dict[str, Any]]) -> int:
+        """위반 규모에 비례한 출력 토큰 예산"""
+        if any(v['kind'] in ('json', 'missing_field') for v in violations):
+            return MAX_TOKENS
+        items = 0
+        for violation in violations:
+            if violation['kind'] == 'length':
+                items += 1
+            elif violation['kind'] == 'count':
+                items += max(0, violation['expected'] - violation['actual'])
+        return min(MAX_TOKENS, ResponseRepairer.BASE_REPAIR_TOKENS + ResponseRepairer.TOKENS_PER_ITEM * items)
+    
+    @staticmethod
+    def parse_patches(repair_output: str) -> Dict[int, str]:
+        """'번호: 내용' 형식의 수정 결과 파싱"""
+        patches = {}
+        for line in repair_output.strip().split('\n'):
+            if match := ResponseRepairer.PATCH_PATTERN.match(line):
+                patches[int(match.group(1))] = match.group(2).strip()
+        return patches
+    
+    @staticmethod
+    def merge(response: str, repair_output: str, violations: List[Dict[str, Any]]) -> str:
+        """수정 결과를 이전 응답에 병합"""
+        if any(v['kind'] in ('json', 'missing_field') for v in violations):
+            return repair_output.strip()
+        
+        patches = ResponseRepairer.parse_patches(repair_output)
+        if not patches:
+            logger.warning("Repair output contained no patches, keeping previous response")
+            return response
+        
+        lines = response.strip().split('\n')
+        for line_no in sorted(patches):
+            patch = patches[line_no]
+            if 1 <= line_no <= len(lines):
+                # 기존 번호/레이블은 유지하고 내용만 교체
+                original = lines[line_no - 1]
+                prefix_match = re.match(ResponseValidator.ITEM_PREFIX_PATTERN, original)
+                prefix = prefix_match.group(0) if prefix_match else ''
+                patch = re.sub(ResponseValidator.ITEM_PREFIX_PATTERN, '', patch)
+                lines[line_no - 1] = prefix + patch
+            elif line_no == len(lines) + 1:
+                lines.append(patch)
+        
+        return '\n'.join(lines)
 
 
+@metrics.timed('PromptAssembly')
 def create_enhanced_system_prompt(
     prompt_data: Dict[str, Any], 
     engine_type: str,
@@ -280,7 +448,7 @@ def create_enhanced_system_prompt(
 목표: {guidelines}
 {_format_knowledge_base_basic(files)}"""
     
-    logger.info(f"System prompt created with strict compliance mode: {len(system_prompt)} chars")
+    logger.info("System prompt created with strict compliance mode: %d chars", len(system_prompt))
     return system_prompt
 
 
@@ -298,7 +466,8 @@ def _process_knowledge_base_summary(files: List[Dict], engine_type: str, max_fil
     
     for idx, file in enumerate(files[:max_files], 1):
         file_name = file.get('fileName', f'문서_{idx}')
-        file_content = file.get('fileContent', '')
+        # 필요한 앞부분만 읽음 (초과 여부 판단용 1자 추가)
+        file_content = load_file_content(file, max_chars + 1)
         
         if file_content.strip():
             # 긴 내용은 요약만
@@ -320,7 +489,7 @@ def _format_knowledge_base_basic(files: List[Dict]) -> str:
     contexts = ["\n=== 참고 자료 ==="]
     for file in files[:3]:  # 최대 3개만
         file_name = file.get('fileName', 'unknown')
-        file_content = file.get('fileContent', '')[:500]  # 500자로 제한
+        file_content = load_file_content(file, 500)  # 500자로 제한 (앞부분만 범위 읽기)
         if file_content.strip():
             contexts.append(f"\n[{file_name}]")
             contexts.append(file_content.strip())
@@ -338,7 +507,7 @@ def _process_file_contexts(files: List[Dict]) -> str:
     
     for idx, file in enumerate(files[:3], 1):  # 최대 3개로 제한
         file_name = file.get('fileName', f'문서_{idx}')
-        file_content = file.get('fileContent', '')[:500]  # 500자로 제한
+        file_content = load_file_content(file, 500)  # 500자로 제한 (앞부분만 범위 읽기)
         file_type = file.get('fileType', 'text')
         
         if file_content.strip():
@@ -361,7 +530,7 @@ def _format_file_contexts_basic(files: List[Dict]) -> str:
     contexts = ["\n=== 참조 자료 ==="]
     for file in files[:3]:  # 최대 3개로 제한
         file_name = file.get('fileName', 'unknown')
-        file_content = file.get('fileContent', '')[:500]  # 500자로 제한
+        file_content = load_file_content(file, 500)  # 500자로 제한 (앞부분만 범위 읽기)
         if file_content.strip():
             contexts.append(f"\n[{file_name}]")
             contexts.append(file_content.strip())
@@ -453,13 +622,149 @@ def validate_instruction_compliance(
     return validation_result
 
 
+def _build_invoke_params(
+    system_prompt: str,
+    messages: List[Dict[str, Any]],
+    prompt_data: Optional[Dict[str, Any]] = None,
+    max_tokens: Optional[int] = None,
+    route: Optional[ModelRoute] = None
+) -> Dict[str, Any]:
+    """Bedrock 스트리밍 호출 파라미터 구성"""
+    route = route or default_route()
+    body = {
+        "anthropic_version": "bedrock-2023-05-31",
+        "max_tokens": min(max_tokens or route.max_tokens, route.max_tokens),
+        "temperature": route.temperature,
+        "system": system_prompt,
+        "messages": messages,
+        "top_p": route.top_p,
+        "top_k": route.top_k
+        # stop_sequences 제거 - 빈 공백 문자열로 인한 에러 방지
+    }
+    
+    # 가드레일 설정 추가 (사용자 역할에 따라)
+    invoke_params = {
+        "modelId": route.model_id,
+        "body": json.dumps(body)
+    }
+    
+    # prompt_data에서 사용자 역할 확인
+    user_role = 'user'  # 기본값
+    if prompt_data and 'userRole' in prompt_data:
+        user_role = prompt_data.get('userRole', 'user')
+    
+    # 가드레일 임시 비활성화 (속도 최적화)
+    # TODO: 추후 비동기 처리로 전환
+    # if user_role != 'admin':
+    #     invoke_params["guardrailIdentifier"] = "ycwjnmzxut7k"
+    #     invoke_params["guardrailVersion"] = "1"
+    #     logger.info(f"Applying guardrail for user role: {user_role}")
+    # else:
+    #     logger.info(f"No guardrail applied for admin user")
+    
+    logger.info(f"Guardrails temporarily disabled for performance optimization")
+    
+    return invoke_params
+
+
+def _iter_text_deltas(stream) -> Iterator[str]:
+    """Bedrock 이벤트 스트림에서 텍스트 델타만 추출"""
+    try:
+        for event in stream:
+            chunk = event.get('chunk')
+            if chunk:
+                chunk_obj = json.loads(chunk.get('bytes').decode())
+                
+                if chunk_obj.get('type') == 'content_block_delta':
+                    delta = chunk_obj.get('delta', {})
+                    if delta.get('type') == 'text_delta':
+                        text = delta.get('text', '')
+                        if text:
+                            yield text
+                
+                elif chunk_obj.get('type') == 'message_stop':
+                    logger.info("Claude streaming completed")
+                    break
+    except GeneratorExit:
+        # 소비자가 중간에 중단 (취소/연결 종료) - HTTP 스트림을 닫아 생성을 멈춤
+        if hasattr(stream, 'close'):
+            try:
+                stream.close()
+            except Exception as e:
+                logger.debug(f"Error closing Bedrock stream: {str(e)}")
+        raise
+
+
+def _open_text_stream(invoke_params: Dict[str, Any], hedge: bool, governor=None) -> Iterator[str]:
+    """Bedrock 텍스트 스트림 열기 - 헤지 모드에서는 첫 토큰 지연 시 두 번째 요청으로 경쟁"""
+    def invoke():
+        return bedrock_runtime.invoke_model_with_response_stream(**invoke_params)
+    
+    if not hedge:
+        stream = invoke().get('body')
+        return _iter_text_deltas(stream) if stream else iter(())
+    
+    def can_hedge() -> bool:
+        # 헤지도 거버너 슬롯을 사용하되, 즉시 얻을 수 없으면 헤지하지 않음
+        if not governor:
+            return True
+        try:
+            governor.acquire(invoke_params['modelId'], max_wait=0)
+            return True
+        except GovernorTimeoutError:
+            return False
+    
+    return hedged_text_stream(
+        invoke,
+        _iter_text_deltas,
+        tracker=get_ttft_tracker(),
+        budget=get_hedge_budget(),
+        can_hedge=can_hedge
+    )
+
+
+def _generate_n_best(
+    invoke_params: Dict[str, Any],
+    candidates: int,
+    constraints: Dict[str, Any],
+    governor=None,
+    cancel_check: Optional[Callable[[], bool]] = None
+) -> NBestResult:
+    """후보를 병렬 생성하여 첫 번째 유효 응답 반환 (없으면 위반이 가장 적은 응답, 취소되면 부분 응답)"""
+    # 첫 후보는 호출자가 얻은 거버너 슬롯 사용, 나머지는 즉시 얻을 수 있는 만큼만 생성
+    if governor:
+        extra = 0
+        for _ in range(candidates - 1):
+            try:
+                governor.acquire(invoke_params['modelId'], max_wait=0)
+                extra += 1
+            except GovernorTimeoutError:
+                break
+        candidates = 1 + extra
+    
+    def invoke():
+        return bedrock_runtime.invoke_model_with_response_stream(**invoke_params)
+    
+    def find_violations(text: str) -> List[Dict[str, Any]]:
+        trimmed = ResponseRepairer.trim_extra_items(text, constraints)
+        return ResponseValidator.find_violations(trimmed, constraints)
+    
+    return generate_first_valid(invoke, _iter_text_deltas, find_violations, candidates, cancel_check)
+
+
+@tracing.traced('bedrock.stream')
 def stream_claude_response_enhanced(
     user_message: str,
     system_prompt: str,
     use_cot: bool = True,   # CoT 활성화로 변경 (꼼꼼한 처리)
     max_retries: int = 2,   # 재시도 횟수 증가
     validate_constraints: bool = True,  # 검증 활성화
-    prompt_data: Optional[Dict[str, Any]] = None  # 프롬프트 데이터 (사용자 역할 포함)
+    prompt_data: Optional[Dict[str, Any]] = None,  # 프롬프트 데이터 (사용자 역할 포함)
+    status_callback: Optional[Callable[[Dict[str, Any]], None]] = None,  # 대기열 등 상태 알림
+    hedge: Optional[bool] = None,  # 첫 토큰 지연 시 헤지 요청 (None이면 HEDGING_CONFIG 따름)
+    repair_on_failure: bool = True,  # 검증 실패 시 전체 재생성 대신 위반 항목만 수정
+    engine_type: Optional[str] = None,  # 엔진별 N-best 병렬 생성 적용 여부 판단
+    cancel_check: Optional[Callable[[], bool]] = None  # 클라이언트 취소 여부 (True면 스트림 중단)
 ) -> Iterator[str]:
     """
     향상된 Claude 스트리밍 응답 생성 - 검증 및 재시도 포함
@@ -478,74 +783,137 @@ def stream_claude_response_enhanced(
         if validate_constraints:
             constraints = ConstraintExtractor.extract(system_prompt + " " + user_message)
     
+    backoff = DecorrelatedJitterBackoff()
+    governor = get_governor()
+    use_hedge = HEDGING_CONFIG['enabled'] if hedge is None else hedge
+    
+    # 부분 수정 재시도 상태 (수정 대상 응답, 위반 항목, 출력 토큰 예산)
+    base_messages = messages
+    repair_base: Optional[str] = None
+    repair_violations: List[Dict[str, Any]] = []
+    max_tokens: Optional[int] = None
+    
+    # 엔진 타입/입력 크기/제약/역할에 따른 모델 선택
+    user_role = (prompt_data or {}).get('userRole', 'user')
+    router = get_model_router()
+    input_chars = len(system_prompt) + len(user_message)
+    route = router.resolve(engine_type, input_chars, constraints, user_role)
+    model_id = route.model_id
+    if route.name != 'default':
+        logger.info("Model route selected: %s (%s)", route.name, model_id)
+    tracing.set_attribute('modelRoute', route.name)
+    tracing.set_attribute('modelId', model_id)
+    
+    # 엄격한 형식 엔진은 첫 시도에서 후보 N개를 병렬 생성 (순차 재시도 지연 제거)
+    # 후보도 단일 호출과 같은 max_tokens - 출력 토큰 상한에 맞춰 후보 수를 줄이고, 긴 요청은 단일 호출
+    nbest_candidates = 0
+    if (validate_constraints and constraints
+            and engine_type in NBEST_CONFIG['enabled_engines']
+            and len(user_message) <= NBEST_CONFIG['max_message_chars']):
+        nbest_candidates = min(
+            NBEST_CONFIG['candidates'],
+            NBEST_CONFIG['max_total_output_tokens'] // max(1, route.max_tokens)
+        )
+    
     for attempt in range(max_retries + 1):
+        if cancel_check and cancel_check():
+            logger.info("Generation cancelled before attempt")
+            return
+        attempt_started = time.time()
+        streamed_any = False
         try:
-            body = {
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": MAX_TOKENS,
-                "temperature": TEMPERATURE,
-                "system": system_prompt,
-                "messages": messages,
-                "top_p": TOP_P,
-                "top_k": TOP_K
-                # stop_sequences 제거 - 빈 공백 문자열로 인한 에러 방지
-            }
-            
-            logger.info(f"Calling Bedrock (attempt {attempt + 1}/{max_retries + 1})")
-            
-            # 가드레일 설정 추가 (사용자 역할에 따라)
-            invoke_params = {
-                "modelId": CLAUDE_MODEL_ID,
-                "body": json.dumps(body)
-            }
-            
-            # prompt_data에서 사용자 역할 확인
-            user_role = 'user'  # 기본값
-            if prompt_data and 'userRole' in prompt_data:
-                user_role = prompt_data.get('userRole', 'user')
+            invoke_params = _build_invoke_params(system_prompt, messages, prompt_data, max_tokens, route)
             
-            # 가드레일 임시 비활성화 (속도 최적화)
-            # TODO: 추후 비동기 처리로 전환
-            # if user_role != 'admin':
-            #     invoke_params["guardrailIdentifier"] = "ycwjnmzxut7k"
-            #     invoke_params["guardrailVersion"] = "1"
-            #     logger.info(f"Applying guardrail for user role: {user_role}")
-            # else:
-            #     logger.info(f"No guardrail applied for admin user")
+            logger.info("Calling Bedrock (attempt %d/%d)", attempt + 1, max_retries + 1)
             
-            logger.info(f"Guardrails temporarily disabled for performance optimization")
+            # 모델별 호출 속도 제어 (슬롯이 없으면 queued 상태 알림 후 대기)
+            if governor:
+                with tracing.span('bedrock.governor.acquire', modelId=model_id):
+                    governor.acquire(model_id, on_queued=status_callback)
+            tracing.add_event('attempt', attempt=attempt + 1, repair=repair_base is not None)
             
-            response = bedrock_runtime.invoke_model_with_response_stream(**invoke_params)
+            if attempt == 0 and nbest_candidates > 1:
+                nbest = _generate_n_best(invoke_params, nbest_candidates, constraints, governor, cancel_check)
+                if nbest.cancelled:
+                    # 생성된(과금된) 분량은 부분 응답으로 전달 - 호출자가 잘린 응답 저장/사용량 기록
+                    if nbest.text:
+                        yield nbest.text
+                    return
+                response_text = nbest.text
+            else:
+                # 스트리밍 처리 (실시간 yield)
+                full_response = []
+                text_stream = _open_text_stream(invoke_params, use_hedge, governor)
+                first_token_at = None
+                try:
+                    for text in text_stream:
+                        if first_token_at is None:
+                            first_token_at = time.time()
+                            tracing.add_event('first_token', attempt=attempt + 1)
+                            metrics.record('BedrockTimeToFirstToken', (first_token_at - attempt_started) * 1000)
+                        full_response.append(text)
+                        # 취소 요청 시 Bedrock 스트림을 닫고 즉시 종료
+                        if cancel_check and cancel_check():
+                            logger.info(f"Generation cancelled after {len(full_response)} chunks")
+                            # 검증 모드는 아직 보내지 않은 버퍼가 있음 - 생성된(과금된) 분량을 부분 응답으로 전달
+                            if validate_constraints:
+                                yield ''.join(full_response)
+                            return
+                        # 실시간 스트리밍: 각 텍스트 청크를 즉시 yield
+                        if not validate_constraints:
+                            streamed_any = True
+                            yield text
+                finally:
+                    if hasattr(text_stream, 'close'):
+                        text_stream.close()
+                
+                # 전체 응답 조합 (검증이 필요한 경우에만)
+                response_text = ''.join(full_response)
+                if first_token_at is not None:
+                    stream_seconds = time.time() - first_token_at
+                    if stream_seconds > 0:
+                        metrics.record(
+                            'BedrockTokensPerSecond',
+                            len(response_text) / CHARS_PER_TOKEN / stream_seconds,
+                            metrics.Unit.COUNT_PER_SECOND
+                        )
             
-            # 스트리밍 처리 (실시간 yield)
-            full_response = []
-            stream = response.get('body')
-            if stream:
-                for event in stream:
-                    chunk = event.get('chunk')
-                    if chunk:
-                        chunk_obj = json.loads(chunk.get('bytes').decode())
-                        
-                        if chunk_obj.get('type') == 'content_block_delta':
-                            delta = chunk_obj.get('delta', {})
-                            if delta.get('type') == 'text_delta':
-                                text = delta.get('text', '')
-                                if text:
-                                    full_response.append(text)
-                                    # 실시간 스트리밍: 각 텍스트 청크를 즉시 yield
-                                    if not validate_constraints:
-                                        yield text
-                        
-                        elif chunk_obj.get('type') == 'message_stop':
-                            logger.info("Claude streaming completed")
-                            break
+            record_attempt(
+                attempt=attempt + 1,
+                outcome='success',
+                model_id=model_id,
+                latency_ms=(time.time() - attempt_started) * 1000
+            )
+            metrics.record('BedrockGenerationTime', (time.time() - attempt_started) * 1000)
+            router.record(
+                route,
+                latency_ms=(time.time() - attempt_started) * 1000,
+                input_chars=input_chars,
+                output_chars=len(response_text)
+            )
+            if governor:
+                governor.on_success(model_id)
             
-            # 전체 응답 조합 (검증이 필요한 경우에만)
-            response_text = ''.join(full_response)
+            # 부분 수정 응답이면 이전 응답에 병합
+            if repair_base is not None:
+                response_text = ResponseRepairer.merge(repair_base, response_text, repair_violations)
+                repair_base = None
             
             # 검증이 필요한 경우에만 검증 수행
             if validate_constraints and constraints:
-                is_valid, error_msg = ResponseValidator.validate(response_text, constraints)
+                violations = ResponseValidator.find_violations(response_text, constraints)
+                
+                # 초과 항목은 모델 호출 없이 잘라냄
+                if violations and repair_on_failure:
+                    trimmed = ResponseRepairer.trim_extra_items(response_text, constraints)
+                    if trimmed != response_text:
+                        response_text = trimmed
+                        violations = ResponseValidator.find_violations(response_text, constraints)
+                
+                is_valid = not violations
+                error_msg = ResponseValidator.format_violations(violations)
+                metrics.record('ValidationPassed', 1 if is_valid else 0, metrics.Unit.COUNT)
+                metrics.record('ValidationViolations', len(violations), metrics.Unit.COUNT)
                 
                 if is_valid:
                     logger.info("Response validated successfully")
@@ -557,6 +925,25 @@ def stream_claude_response_enhanced(
                     
                     # 재시도를 위한 메시지 수정
                     if attempt < max_retries:
+                        repair_message = None
+                        if repair_on_failure:
+                            repair_message = ResponseRepairer.build_repair_message(response_text, violations)
+                        
+                        if repair_message:
+                            # 이전 응답을 맥락으로 주고 위반 항목만 다시 생성
+                            repair_base = response_text
+                            repair_violations = violations
+                            max_tokens = ResponseRepairer.estimate_max_tokens(violations)
+                            messages = base_messages + [
+                                {"role": "assistant", "content": response_text},
+                                {"role": "user", "content": repair_message}
+                            ]
+                            logger.info(f"Requesting targeted repair (max_tokens={max_tokens})")
+                            metrics.increment('BedrockRepairRetries')
+                            continue
+                        
+                        max_tokens = None
+                        metrics.increment('BedrockRegenerateRetries')
                         messages = [{
                             "role": "user", 
                             "content": f"{user_message}\n\n[오류 수정 요청]\n다음 문제를 수정하여 다시 생성하세요: {error_msg}\n형식과 개수, 길이 지침을 정확히 지켜주세요."
@@ -571,13 +958,32 @@ def stream_claude_response_enhanced(
                 return
                 
         except Exception as e:
-            logger.error(f"Error in attempt {attempt + 1}: {str(e)}")
-            if attempt == max_retries:
+            error_class = classify_error(e)
+            # 이미 클라이언트로 보낸 청크가 있으면 재시도 시 중복 출력되므로 재시도하지 않음
+            should_retry = is_retryable(error_class) and attempt < max_retries and not streamed_any
+            backoff_s = backoff.next_delay(error_class) if should_retry else None
+            
+            if governor and error_class == ErrorClass.THROTTLING:
+                governor.on_throttle(model_id)
+            
+            record_attempt(
+                attempt=attempt + 1,
+                outcome='error',
+                model_id=model_id,
+                latency_ms=(time.time() - attempt_started) * 1000,
+                error_class=error_class,
+                error_code=get_error_code(e),
+                backoff_s=backoff_s
+            )
+            logger.error(f"Error in attempt {attempt + 1} ({error_class}): {str(e)}")
+            
+            if not should_retry:
                 yield f"\n\n[오류] AI 응답 생성 실패: {str(e)}"
-            else:
-                logger.info(f"Retrying in 1 second...")
-                import time
-                time.sleep(1)
+                return
+            
+            logger.info(f"Retrying in {backoff_s:.2f} seconds...")
+            metrics.increment('BedrockErrorRetries')
+            time.sleep(backoff_s)
 
 
 def get_prompt_effectiveness_metrics(
@@ -0,0 +1,246 @@
+"""
+Bedrock 동시성 거버너
+모델 ID별 토큰 버킷 + AIMD(가산 증가/승산 감소)로 호출 속도를 조절
+상태는 DynamoDB 아이템(컨테이너 간 공유) 또는 로컬 메모리에 저장
+
+DynamoDB 저장소 비용: acquire마다 일관된 읽기 1회 + 조건부 쓰기 1회 (경합 시 반복)
+성공 피드백은 컨테이너에 모았다가 다음 acquire의 쓰기에 합쳐 추가 왕복이 없고,
+스로틀링 피드백만 즉시 읽기 + 쓰기 (드물고 다른 컨테이너에 바로 알려야 함)
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Callable, Dict, Optional
+
+import boto3
+
+from src.config.aws import AWS_REGION, GOVERNOR_CONFIG
+from src.config.database import get_table_name
+from src.monitoring import instrument_resource
+
+logger = logging.getLogger(__name__)
+
+# 상태 갱신 경합 시 최대 재시도 횟수
+MAX_CAS_RETRIES = 5
+
+
+class GovernorTimeoutError(Exception):
+    """대기 시간 초과로 호출 슬롯을 얻지 못함"""
+
+
+@dataclass
+class BucketState:
+    """모델별 토큰 버킷 상태"""
+    tokens: float
+    rate: float
+    updated_at: float
+    version: int = 0
+
+
+class LocalGovernorStore:
+    """컨테이너 로컬 상태 저장소 (단일 컨테이너/로컬 실행용)"""
+
+    def __init__(self):
+        self._states: Dict[str, BucketState] = {}
+        self._lock = threading.Lock()
+
+    def load(self, model_id: str) -> Optional[BucketState]:
+        with self._lock:
+            state = self._states.get(model_id)
+            if state is None:
+                return None
+            return BucketState(state.tokens, state.rate, state.updated_at, state.version)
+
+    def compare_and_swap(self, model_id: str, expected_version: int, state: BucketState) -> bool:
+        with self._lock:
+            current = self._states.get(model_id)
+            current_version = current.version if current else 0
+            if current_version != expected_version:
+                return False
+            self._states[model_id] = state
+            return True
+
+
+class DynamoDBGovernorStore:
+    """DynamoDB 상태 저장소 - 모든 Lambda 컨테이너가 같은 버킷을 공유"""
+
+    def __init__(self, table_name: Optional[str] = None, region: str = AWS_REGION):
+        dynamodb = instrument_resource(boto3.resource('dynamodb', region_name=region))
+        self.table = dynamodb.Table(table_name or get_table_name('bedrock_governor'))
+
+    def load(self, model_id: str) -> Optional[BucketState]:
+        response = self.table.get_item(
+            Key={'modelId': model_id},
+            ConsistentRead=True
+        )
+        item = response.get('Item')
+        if not item:
+            return None
+        return BucketState(
+            tokens=float(item['tokens']),
+            rate=float(item['rate']),
+            updated_at=float(item['updatedAt']),
+            version=int(item['version'])
+        )
+
+    def compare_and_swap(self, model_id: str, expected_version: int, state: BucketState) -> bool:
+        try:
+            self.table.put_item(
+                Item={
+                    'modelId': model_id,
+                    'tokens': Decimal(str(round(state.tokens, 6))),
+                    'rate': Decimal(str(round(state.rate, 6))),
+                    'updatedAt': Decimal(str(round(state.updated_at, 6))),
+                    'version': state.version
+                },
+                ConditionExpression='attribute_not_exists(modelId) OR version = :expected',
+                ExpressionAttributeValues={':expected': expected_version}
+            )
+            return True
+        except self.table.meta.client.exceptions.ConditionalCheckFailedException:
+            return False
+
+
+class ConcurrencyGovernor:
+    """모델별 토큰 버킷 호출 제어기"""
+
+    def __init__(self, store=None, config: Optional[Dict[str, Any]] = None):
+        self.config = config or GOVERNOR_CONFIG
+        self.store = store or LocalGovernorStore()
+        # 아직 저장소에 반영하지 않은 성공 피드백 (모델별 가산 증가 합계)
+        self._pending_increase: Dict[str, float] = {}
+        self._pending_lock = threading.Lock()
+
+    def _initial_state(self, now: float) -> BucketState:
+        return BucketState(
+            tokens=self.config['burst'],
+            rate=self.config['initial_rate'],
+            updated_at=now,
+            version=0
+        )
+
+    def _refill(self, state: BucketState, now: float) -> BucketState:
+        elapsed = max(0.0, now - state.updated_at)
+        tokens = min(self.config['burst'], state.tokens + elapsed * state.rate)
+        return BucketState(tokens, state.rate, now, state.version)
+
+    def _clamp_rate(self, rate: float) -> float:
+        return min(self.config['max_rate'], max(self.config['min_rate'], rate))
+
+    def acquire(
+        self,
+        model_id: str,
+        on_queued: Optional[Callable[[Dict[str, Any]], None]] = None,
+        max_wait: Optional[float] = None
+    ) -> float:
+        """호출 슬롯 획득 (대기 시간 초 반환, 초과 시 GovernorTimeoutError)"""
+        started = time.time()
+        notified = False
+        max_wait = self.config['max_wait'] if max_wait is None else max_wait
+
+        while True:
+            now = time.time()
+            try:
+                stored = self.store.load(model_id)
+            except Exception as e:
+                # 상태 저장소 장애 시 호출을 막지 않음 (fail-open)
+                logger.warning(f"Governor store unavailable, skipping: {str(e)}")
+                return time.time() - started
+            state = self._refill(stored or self._initial_state(now), now)
+            expected_version = stored.version if stored else 0
+
+            if state.tokens >= 1:
+                state.tokens -= 1
+                state.version = expected_version + 1
+                # 모아 둔 성공 피드백을 같은 쓰기에 반영
+                with self._pending_lock:
+                    increase = self._pending_increase.get(model_id, 0.0)
+                if increase:
+                    state.rate = self._clamp_rate(state.rate + increase)
+                try:
+                    swapped = self.store.compare_and_swap(model_id, expected_version, state)
+                except Exception as e:
+                    logger.warning(f"Governor store unavailable, skipping: {str(e)}")
+                    return time.time() - started
+                if swapped:
+                    if increase:
+                        with self._pending_lock:
+                            remaining = self._pending_increase.get(model_id, 0.0) - increase
+                            if remaining > 1e-9:
+                                self._pending_increase[model_id] = remaining
+                            else:
+                                self._pending_increase.pop(model_id, None)
+                    waited = now - started
+                    if waited > 0:
+                        logger.info(f"Governor slot acquired for {model_id} after {waited:.2f}s")
+                    return waited
+                continue  # 다른 컨테이너가 먼저 갱신함 - 다시 읽기
+
+            wait = (1 - state.tokens) / max(state.rate, self.config['min_rate'])
+            if now - started + wait > max_wait:
+                raise GovernorTimeoutError(
+                    f"Bedrock capacity for {model_id} unavailable within {max_wait}s"
+                )
+
+            if not notified and on_queued:
+                notified = True
+                try:
+                    on_queued({
+                        'status': 'queued',
+                        'modelId': model_id,
+                        'estimatedWaitMs': int(wait * 1000)
+                    })
+                except Exception as e:
+                    logger.warning(f"Queued notification failed: {str(e)}")
+
+            time.sleep(min(wait, self.config['poll_interval']))
+
+    def _adjust_rate(self, model_id: str, adjust: Callable[[float], float]) -> None:
+        for _ in range(MAX_CAS_RETRIES):
+            now = time.time()
+            try:
+                stored = self.store.load(model_id)
+                state = self._refill(stored or self._initial_state(now), now)
+                expected_version = stored.version if stored else 0
+
+                state.rate = self._clamp_rate(adjust(state.rate))
+                state.version = expected_version + 1
+                if self.store.compare_and_swap(model_id, expected_version, state):
+                    return
+            except Exception as e:
+                logger.warning(f"Governor rate update for {model_id} failed: {str(e)}")
+                return
+        logger.warning(f"Governor rate update for {model_id} lost after {MAX_CAS_RETRIES} retries")
+
+    def on_success(self, model_id: str) -> None:
+        """성공 피드백 - 가산 증가 (저장소 호출 없이 모았다가 다음 acquire에서 반영)"""
+        with self._pending_lock:
+            self._pending_increase[model_id] = (
+                self._pending_increase.get(model_id, 0.0) + self.config['additive_increase']
+            )
+
+    def on_throttle(self, model_id: str) -> None:
+        """스로틀링 피드백 - 승산 감소 (즉시 반영, 모아 둔 증가분은 버림)"""
+        with self._pending_lock:
+            self._pending_increase.pop(model_id, None)
+        self._adjust_rate(model_id, lambda rate: rate * self.config['multiplicative_decrease'])
+        logger.warning(f"Bedrock throttled for {model_id}, governor rate decreased")
+
+
+_governor: Optional[ConcurrencyGovernor] = None
+
+
+def get_governor() -> Optional[ConcurrencyGovernor]:
+    """설정에 따른 거버너 싱글톤 (비활성화 시 None)"""
+    global _governor
+    if not GOVERNOR_CONFIG['enabled']:
+        return None
+    if _governor is None:
+        if GOVERNOR_CONFIG['store'] == 'dynamodb':
+            store = DynamoDBGovernorStore()
+        else:
+            store = LocalGovernorStore()
+        _governor = ConcurrencyGovernor(store=store)
+    return _governor
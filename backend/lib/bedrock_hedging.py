@@ -0,0 +1,221 @@
+"""
+Bedrock 헤지 요청
+첫 토큰(content_block_delta)이 p95 기반 기한 내에 오지 않으면 두 번째 요청을 병렬로 시작하고
+먼저 토큰을 만든 스트림만 사용 (나머지는 취소)
+"""
+import logging
+import math
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterator, Optional
+
+from src.config.aws import HEDGING_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# 이벤트 종류
+EVENT_TEXT = 'text'
+EVENT_DONE = 'done'
+EVENT_ERROR = 'error'
+
+
+class TTFTTracker:
+    """최근 첫 토큰 지연(TTFT) 샘플로 헤지 기한 계산"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = config or HEDGING_CONFIG
+        self._samples: Deque[float] = deque(maxlen=self.config['sample_window'])
+        self._lock = threading.Lock()
+
+    def record(self, ttft: float) -> None:
+        with self._lock:
+            self._samples.append(ttft)
+
+    def deadline(self) -> float:
+        """헤지 시작 기한 (초) - 샘플이 부족하면 기본값"""
+        with self._lock:
+            samples = sorted(self._samples)
+
+        if len(samples) < self.config['min_samples']:
+            deadline = self.config['default_deadline']
+        else:
+            index = min(len(samples) - 1, int(math.ceil(self.config['percentile'] * len(samples))) - 1)
+            deadline = samples[max(0, index)] * self.config['deadline_multiplier']
+
+        return min(self.config['max_deadline'], max(self.config['min_deadline'], deadline))
+
+
+class HedgeBudget:
+    """전체 요청 대비 헤지 비율 상한 (컨테이너 단위)"""
+
+    def __init__(self, max_ratio: Optional[float] = None):
+        self.max_ratio = HEDGING_CONFIG['max_hedge_ratio'] if max_ratio is None else max_ratio
+        self.requests = 0
+        self.hedges = 0
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def try_spend(self) -> bool:
+        """헤지 허용 여부 (허용 시 사용량 기록)"""
+        with self._lock:
+            if (self.hedges + 1) > self.requests * self.max_ratio:
+                return False
+            self.hedges += 1
+            return True
+
+
+class _StreamWorker(threading.Thread):
+    """Bedrock 스트림 하나를 읽어 공유 큐로 전달하는 작업자"""
+
+    def __init__(
+        self,
+        tag: str,
+        invoke: Callable[[], Dict[str, Any]],
+        iter_text: Callable[[Any], Iterator[str]],
+        events: 'queue.Queue'
+    ):
+        super().__init__(name=f"bedrock-{tag}", daemon=True)
+        self.tag = tag
+        self._invoke = invoke
+        self._iter_text = iter_text
+        self._events = events
+        self._cancelled = threading.Event()
+        self._stream = None
+
+    def run(self) -> None:
+        try:
+            response = self._invoke()
+            self._stream = response.get('body')
+            if self._cancelled.is_set():
+                self._close_stream()
+                return
+            if self._stream:
+                for text in self._iter_text(self._stream):
+                    if self._cancelled.is_set():
+                        break
+                    self._events.put((self.tag, EVENT_TEXT, text))
+            self._events.put((self.tag, EVENT_DONE, None))
+        except Exception as e:
+            if not self._cancelled.is_set():
+                self._events.put((self.tag, EVENT_ERROR, e))
+
+    def cancel(self) -> None:
+        """스트림 취소 (HTTP 연결을 닫아 더 이상 토큰을 받지 않음)"""
+        self._cancelled.set()
+        self._close_stream()
+
+    def _close_stream(self) -> None:
+        stream = self._stream
+        if stream is not None and hasattr(stream, 'close'):
+            try:
+                stream.close()
+            except Exception as e:
+                logger.debug(f"Error closing {self.tag} stream: {str(e)}")
+
+
+def _cancel_others(workers: Dict[str, _StreamWorker], winner: str) -> None:
+    for tag, worker in workers.items():
+        if tag != winner:
+            worker.cancel()
+
+
+def hedged_text_stream(
+    invoke: Callable[[], Dict[str, Any]],
+    iter_text: Callable[[Any], Iterator[str]],
+    tracker: TTFTTracker,
+    budget: HedgeBudget,
+    can_hedge: Optional[Callable[[], bool]] = None
+) -> Iterator[str]:
+    """
+    헤지 가능한 텍스트 스트림
+    - 기한 내 첫 토큰이 없으면 (예산 허용 시) 두 번째 요청 시작
+    - 먼저 토큰을 만든 스트림이 승자, 패자는 즉시 취소
+    """
+    events: 'queue.Queue' = queue.Queue()
+    workers: Dict[str, _StreamWorker] = {}
+    started = time.time()
+    budget.record_request()
+
+    def start(tag: str) -> None:
+        worker = _StreamWorker(tag, invoke, iter_text, events)
+        workers[tag] = worker
+        worker.start()
+
+    start('primary')
+    deadline: Optional[float] = started + tracker.deadline()
+    winner: Optional[str] = None
+    first_error: Optional[Exception] = None
+    finished = set()
+
+    try:
+        # 1. 첫 토큰 경쟁
+        while winner is None:
+            timeout = None
+            if 'hedge' not in workers and deadline is not None:
+                timeout = max(0.0, deadline - time.time())
+
+            try:
+                tag, kind, payload = events.get(timeout=timeout)
+            except queue.Empty:
+                if budget.try_spend() and (can_hedge is None or can_hedge()):
+                    logger.info(f"No first token after {time.time() - started:.2f}s, starting hedge request")
+                    start('hedge')
+                else:
+                    # 헤지 불가 - 기한 없이 primary만 대기
+                    deadline = None
+                continue
+
+            if kind == EVENT_TEXT:
+                winner = tag
+                tracker.record(time.time() - started)
+                _cancel_others(workers, tag)
+                logger.info(f"Hedge race won by {tag}")
+                yield payload
+                continue
+
+            finished.add(tag)
+            if kind == EVENT_DONE:
+                # 토큰 없이 정상 종료 - 빈 응답
+                winner = tag
+                _cancel_others(workers, tag)
+                continue
+
+            # 첫 토큰 전에 실패 - 남은 경쟁자가 있으면 계속 대기
+            if first_error is None:
+                first_error = payload
+            if len(finished) == len(workers):
+                raise first_error
+
+        # 2. 승자 스트림만 계속 전달
+        if winner in finished:
+            return
+        while True:
+            tag, kind, payload = events.get()
+            if tag != winner:
+                continue
+            if kind == EVENT_TEXT:
+                yield payload
+            elif kind == EVENT_DONE:
+                return
+            else:
+                raise payload
+    finally:
+        for worker in workers.values():
+            worker.cancel()
+
+
+_tracker = TTFTTracker()
+_budget = HedgeBudget()
+
+
+def get_ttft_tracker() -> TTFTTracker:
+    return _tracker
+
+
+def get_hedge_budget() -> HedgeBudget:
+    return _budget
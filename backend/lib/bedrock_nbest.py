@@ -0,0 +1,129 @@
+"""
+병렬 N-best 생성
+후보 N개를 동시에 생성하고 완료되는 순서대로 검증하여 첫 번째 유효 응답을 채택
+(나머지 후보는 즉시 취소)
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CandidateCancelled(Exception):
+    """다른 후보가 먼저 채택되어 취소됨"""
+
+
+@dataclass
+class NBestResult:
+    """N-best 생성 결과"""
+    text: str
+    violations: List[Dict[str, Any]] = field(default_factory=list)
+    candidate_index: int = 0
+    completed: int = 0
+    # 클라이언트 취소로 중단됨 (text는 가장 많이 생성된 후보의 부분 응답)
+    cancelled: bool = False
+
+    @property
+    def is_valid(self) -> bool:
+        return not self.violations
+
+
+class _Candidate:
+    """후보 하나의 스트림 상태"""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.stream = None
+        self.cancelled = threading.Event()
+        self.parts: List[str] = []
+
+    def cancel(self) -> None:
+        self.cancelled.set()
+        stream = self.stream
+        if stream is not None and hasattr(stream, 'close'):
+            try:
+                stream.close()
+            except Exception as e:
+                logger.debug(f"Error closing candidate {self.index} stream: {str(e)}")
+
+
+def generate_first_valid(
+    invoke: Callable[[], Dict[str, Any]],
+    iter_text: Callable[[Any], Iterator[str]],
+    find_violations: Callable[[str], List[Dict[str, Any]]],
+    candidates: int,
+    cancel_check: Optional[Callable[[], bool]] = None
+) -> NBestResult:
+    """
+    후보를 병렬 생성하여 첫 번째 유효 응답 반환
+    유효한 후보가 없으면 위반이 가장 적은 후보 반환, 모두 실패하면 첫 예외 전파
+    cancel_check가 True를 반환하면 모든 후보를 닫고 cancelled=True 결과 반환
+    """
+    states = [_Candidate(i) for i in range(candidates)]
+
+    def run(state: _Candidate) -> str:
+        if state.cancelled.is_set():
+            raise CandidateCancelled()
+        response = invoke()
+        state.stream = response.get('body')
+        if state.cancelled.is_set():
+            state.cancel()
+            raise CandidateCancelled()
+
+        if state.stream:
+            for text in iter_text(state.stream):
+                if state.cancelled.is_set():
+                    raise CandidateCancelled()
+                state.parts.append(text)
+                if cancel_check and cancel_check():
+                    raise CandidateCancelled()
+        return ''.join(state.parts)
+
+    best: Optional[NBestResult] = None
+    first_error: Optional[Exception] = None
+    completed = 0
+
+    executor = ThreadPoolExecutor(max_workers=candidates, thread_name_prefix='nbest')
+    try:
+        futures = {executor.submit(run, state): state for state in states}
+        for future in as_completed(futures):
+            state = futures[future]
+            try:
+                text = future.result()
+            except CandidateCancelled:
+                if cancel_check and cancel_check():
+                    partial = max((''.join(s.parts) for s in states), key=len)
+                    logger.info(f"N-best generation cancelled ({completed}/{candidates} completed)")
+                    return NBestResult(partial, completed=completed, cancelled=True)
+                continue
+            except Exception as e:
+                if not state.cancelled.is_set():
+                    logger.warning(f"N-best candidate {state.index} failed: {str(e)}")
+                    if first_error is None:
+                        first_error = e
+                continue
+
+            completed += 1
+            violations = find_violations(text)
+            result = NBestResult(text, violations, state.index, completed)
+
+            if result.is_valid:
+                logger.info(f"N-best candidate {state.index} accepted ({completed}/{candidates} completed)")
+                return result
+
+            if best is None or len(violations) < len(best.violations):
+                best = result
+    finally:
+        for state in states:
+            state.cancel()
+        executor.shutdown(wait=False)
+
+    if best is None:
+        raise first_error or RuntimeError("No N-best candidate completed")
+
+    best.completed = completed
+    logger.warning(f"No valid N-best candidate, best has {len(best.violations)} violations")
+    return best
@@ -0,0 +1,160 @@
+"""
+Bedrock 전송 계층
+커넥션 풀/타임아웃이 조정된 클라이언트, 오류 분류, 지터 백오프, 시도별 텔레메트리
+"""
+import logging
+import random
+from typing import Any, Callable, Dict, List, Optional
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import (
+    ClientError,
+    ConnectionClosedError,
+    ConnectTimeoutError,
+    EndpointConnectionError,
+    ReadTimeoutError
+)
+
+from src.config.aws import AWS_REGION, BEDROCK_TRANSPORT_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+class ErrorClass:
+    """Bedrock 오류 분류"""
+
+    THROTTLING = "throttling"   # 429 / 스로틀링 - 백오프 후 재시도
+    SERVER = "server"           # 5xx / 모델 준비 중 - 재시도
+    NETWORK = "network"         # 연결/타임아웃 - 재시도
+    CLIENT = "client"           # 4xx / 검증 오류 - 재시도 금지
+
+
+# 스트림 이벤트 오류는 소문자 카멜 케이스로 내려오므로 소문자로 비교
+THROTTLING_CODES = {
+    'throttlingexception',
+    'toomanyrequestsexception',
+    'provisionedthroughputexceededexception'
+}
+
+SERVER_CODES = {
+    'internalserverexception',
+    'serviceunavailableexception',
+    'modelnotreadyexception',
+    'modeltimeoutexception',
+    'modelstreamerrorexception'
+}
+
+RETRYABLE_CLASSES = {ErrorClass.THROTTLING, ErrorClass.SERVER, ErrorClass.NETWORK}
+
+_client = None
+_attempt_listeners: List[Callable[[Dict[str, Any]], None]] = []
+
+
+def get_bedrock_runtime_client():
+    """튜닝된 Bedrock Runtime 클라이언트 (컨테이너당 1회 생성)"""
+    global _client
+    if _client is None:
+        _client = boto3.client(
+            'bedrock-runtime',
+            config=Config(
+                region_name=AWS_REGION,
+                max_pool_connections=BEDROCK_TRANSPORT_CONFIG['max_pool_connections'],
+                tcp_keepalive=BEDROCK_TRANSPORT_CONFIG['tcp_keepalive'],
+                connect_timeout=BEDROCK_TRANSPORT_CONFIG['connect_timeout'],
+                read_timeout=BEDROCK_TRANSPORT_CONFIG['read_timeout'],
+                # 재시도는 아래 분류 로직에서 직접 수행 (botocore 재시도와 중복 방지)
+                retries={'total_max_attempts': 1}
+            )
+        )
+    return _client
+
+
+def classify_error(error: Exception) -> str:
+    """예외를 재시도 정책 분류로 변환"""
+    if isinstance(error, (ConnectTimeoutError, ReadTimeoutError,
+                          EndpointConnectionError, ConnectionClosedError)):
+        return ErrorClass.NETWORK
+
+    if isinstance(error, ClientError):
+        error_info = error.response.get('Error', {})
+        code = str(error_info.get('Code', '')).lower()
+        status = error.response.get('ResponseMetadata', {}).get('HTTPStatusCode', 0)
+
+        if code in THROTTLING_CODES or status == 429:
+            return ErrorClass.THROTTLING
+        if code in SERVER_CODES or status >= 500:
+            return ErrorClass.SERVER
+        return ErrorClass.CLIENT
+
+    # 알 수 없는 예외 (파싱 오류 등)는 재시도해도 같은 결과이므로 재시도하지 않음
+    return ErrorClass.CLIENT
+
+
+def is_retryable(error_class: str) -> bool:
+    """재시도 가능한 오류 분류인지 확인"""
+    return error_class in RETRYABLE_CLASSES
+
+
+def get_error_code(error: Exception) -> str:
+    """예외에서 오류 코드 추출"""
+    if isinstance(error, ClientError):
+        return str(error.response.get('Error', {}).get('Code', 'ClientError'))
+    return type(error).__name__
+
+
+class DecorrelatedJitterBackoff:
+    """Decorrelated jitter 백오프 (sleep = min(cap, uniform(base, prev * 3)))"""
+
+    def __init__(self, base: Optional[float] = None, cap: Optional[float] = None):
+        self.base = base if base is not None else BEDROCK_TRANSPORT_CONFIG['backoff_base']
+        self.cap = cap if cap is not None else BEDROCK_TRANSPORT_CONFIG['backoff_cap']
+        self._previous = self.base
+
+    def next_delay(self, error_class: str = ErrorClass.SERVER) -> float:
+        """다음 대기 시간 계산 (스로틀링은 하한을 높여 더 길게 대기)"""
+        base = self.base * 2 if error_class == ErrorClass.THROTTLING else self.base
+        delay = min(self.cap, random.uniform(base, max(base, self._previous * 3)))
+        self._previous = delay
+        return delay
+
+
+def add_attempt_listener(listener: Callable[[Dict[str, Any]], None]) -> None:
+    """시도별 텔레메트리 수신자 등록"""
+    _attempt_listeners.append(listener)
+
+
+def record_attempt(
+    attempt: int,
+    outcome: str,
+    model_id: str,
+    latency_ms: float,
+    error_class: Optional[str] = None,
+    error_code: Optional[str] = None,
+    backoff_s: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Bedrock 호출 시도 기록 (구조화 로그 extra 필드 + 등록된 수신자)
+    성공은 DEBUG (지연/횟수는 EMF 메트릭으로 집계), 실패한 시도만 INFO
+    """
+    record = {
+        'event': 'bedrock_attempt',
+        'attempt': attempt,
+        'outcome': outcome,
+        'modelId': model_id,
+        'latencyMs': round(latency_ms, 1),
+        'errorClass': error_class,
+        'errorCode': error_code,
+        'backoffS': round(backoff_s, 3) if backoff_s is not None else None
+    }
+    level = logging.DEBUG if outcome == 'success' else logging.INFO
+    if logger.isEnabledFor(level):
+        logger.log(level, "Bedrock attempt %d %s", attempt, outcome, extra={'bedrockAttempt': record})
+
+    for listener in _attempt_listeners:
+        try:
+            listener(record)
+        except Exception as e:
+            logger.warning(f"Attempt listener failed: {str(e)}")
+
+    return record
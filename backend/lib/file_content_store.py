@@ -0,0 +1,437 @@
+"""
+지식베이스 파일 본문 저장소
+본문은 S3(버킷 미설정 시 로컬 디렉터리)에 두고 DynamoDB에는 메타데이터/크기/해시만 저장
+메시지 처리 경로에서 실제로 필요할 때만 필요한 앞부분을 범위 읽기로 가져옴
+
+본문은 sha256 해시로 주소를 정하는 블롭으로 저장하여 엔진/파일 간 중복 제거
+(레지스트리에 참조 수와 블롭 단위 파생 데이터 기록)
+"""
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import boto3
+
+from src.config.aws import AWS_REGION, S3_CONFIG
+from src.config.database import get_table_name
+from src.monitoring import instrument_resource
+from lib.model_router import CHARS_PER_TOKEN
+
+logger = logging.getLogger(__name__)
+
+STORAGE_S3 = 's3'
+STORAGE_LOCAL = 'local'
+
+# UTF-8 문자당 최대 바이트 수 (문자 수 제한을 바이트 범위로 환산)
+MAX_BYTES_PER_CHAR = 4
+
+
+class S3ContentStore:
+    """S3 본문 저장소"""
+
+    storage = STORAGE_S3
+
+    def __init__(self, bucket: str, region: str):
+        self.bucket = bucket
+        self.client = boto3.client('s3', region_name=region)
+
+    def put(self, key: str, data: bytes) -> None:
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=key,
+            Body=data,
+            ContentType='text/plain; charset=utf-8'
+        )
+
+    def get(self, key: str, max_bytes: Optional[int] = None) -> bytes:
+        params = {'Bucket': self.bucket, 'Key': key}
+        if max_bytes is not None:
+            params['Range'] = f'bytes=0-{max_bytes - 1}'
+        return self.client.get_object(**params)['Body'].read()
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+
+class LocalContentStore:
+    """로컬 디렉터리 본문 저장소 (S3 대체, 로컬 실행/개발용)"""
+
+    storage = STORAGE_LOCAL
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, key: str) -> str:
+        path = os.path.normpath(os.path.join(self.root, key))
+        if not path.startswith(os.path.normpath(self.root) + os.sep):
+            raise ValueError(f"Invalid content key: {key}")
+        return path
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+
+    def get(self, key: str, max_bytes: Optional[int] = None) -> bytes:
+        with open(self._path(key), 'rb') as f:
+            return f.read() if max_bytes is None else f.read(max_bytes)
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+_store = None
+
+
+def get_content_store():
+    """설정에 따른 본문 저장소 싱글톤"""
+    global _store
+    if _store is None:
+        if S3_CONFIG['bucket']:
+            _store = S3ContentStore(S3_CONFIG['bucket'], S3_CONFIG['region'])
+        else:
+            _store = LocalContentStore(S3_CONFIG['local_content_dir'])
+    return _store
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _blob_key(digest: str) -> str:
+    """내용 주소 키 - 같은 본문은 엔진/파일과 무관하게 하나의 객체"""
+    return f"{S3_CONFIG['file_content_prefix']}blobs/sha256/{digest}"
+
+
+def estimate_token_count(text: str) -> int:
+    return int(len(text) / CHARS_PER_TOKEN)
+
+
+# 블롭 등록 시 한 번만 계산하는 파생 데이터
+DERIVED_ON_REGISTER: Dict[str, Callable[[str], Any]] = {
+    'tokenCount': estimate_token_count
+}
+
+
+class DynamoDBBlobRegistry:
+    """블롭 참조 수/파생 데이터 레지스트리 (contentHash 키)"""
+
+    def __init__(self, table_name: Optional[str] = None, region: str = AWS_REGION):
+        dynamodb = instrument_resource(boto3.resource('dynamodb', region_name=region))
+        self.table = dynamodb.Table(table_name or get_table_name('knowledge_blobs'))
+
+    def add_reference(self, digest: str) -> Optional[Dict[str, Any]]:
+        """이미 등록된 블롭이면 참조 수를 늘리고 항목 반환, 없으면 None"""
+        try:
+            response = self.table.update_item(
+                Key={'contentHash': digest},
+                UpdateExpression='ADD refCount :one',
+                ConditionExpression='attribute_exists(contentHash)',
+                ExpressionAttributeValues={':one': 1},
+                ReturnValues='ALL_NEW'
+            )
+            return response['Attributes']
+        except self.table.meta.client.exceptions.ConditionalCheckFailedException:
+            return None
+
+    def create(self, item: Dict[str, Any]) -> bool:
+        """새 블롭 등록 (다른 요청이 먼저 등록했으면 False)"""
+        try:
+            self.table.put_item(
+                Item=item,
+                ConditionExpression='attribute_not_exists(contentHash)'
+            )
+            return True
+        except self.table.meta.client.exceptions.ConditionalCheckFailedException:
+            return False
+
+    def release(self, digest: str) -> Optional[int]:
+        """참조 수 감소 후 남은 참조 수 (등록되지 않은 블롭이면 None)"""
+        try:
+            response = self.table.update_item(
+                Key={'contentHash': digest},
+                UpdateExpression='ADD refCount :minus',
+                ConditionExpression='attribute_exists(contentHash)',
+                ExpressionAttributeValues={':minus': -1},
+                ReturnValues='UPDATED_NEW'
+            )
+            return int(response['Attributes']['refCount'])
+        except self.table.meta.client.exceptions.ConditionalCheckFailedException:
+            return None
+
+    def remove_if_unreferenced(self, digest: str) -> bool:
+        try:
+            self.table.delete_item(
+                Key={'contentHash': digest},
+                ConditionExpression='refCount <= :zero',
+                ExpressionAttributeValues={':zero': 0}
+            )
+            return True
+        except self.table.meta.client.exceptions.ConditionalCheckFailedException:
+            return False
+
+    def get_derived(self, digest: str, name: str) -> Any:
+        response = self.table.get_item(
+            Key={'contentHash': digest},
+            ProjectionExpression='derived.#name',
+            ExpressionAttributeNames={'#name': name}
+        )
+        return response.get('Item', {}).get('derived', {}).get(name)
+
+    def put_derived(self, digest: str, name: str, value: Any) -> None:
+        self.table.update_item(
+            Key={'contentHash': digest},
+            UpdateExpression='SET derived.#name = :value',
+            ConditionExpression='attribute_exists(contentHash)',
+            ExpressionAttributeNames={'#name': name},
+            ExpressionAttributeValues={':value': value}
+        )
+
+
+class LocalBlobRegistry:
+    """컨테이너 로컬 레지스트리 (로컬 본문 저장소와 함께 사용)"""
+
+    def __init__(self):
+        self._items: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def add_reference(self, digest: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            item = self._items.get(digest)
+            if item is None:
+                return None
+            item['refCount'] += 1
+            return dict(item)
+
+    def create(self, item: Dict[str, Any]) -> bool:
+        with self._lock:
+            if item['contentHash'] in self._items:
+                return False
+            self._items[item['contentHash']] = dict(item)
+            return True
+
+    def release(self, digest: str) -> Optional[int]:
+        with self._lock:
+            item = self._items.get(digest)
+            if item is None:
+                return None
+            item['refCount'] -= 1
+            return item['refCount']
+
+    def remove_if_unreferenced(self, digest: str) -> bool:
+        with self._lock:
+            item = self._items.get(digest)
+            if item is None or item['refCount'] > 0:
+                return False
+            del self._items[digest]
+            return True
+
+    def get_derived(self, digest: str, name: str) -> Any:
+        with self._lock:
+            return self._items.get(digest, {}).get('derived', {}).get(name)
+
+    def put_derived(self, digest: str, name: str, value: Any) -> None:
+        with self._lock:
+            if digest in self._items:
+                self._items[digest].setdefault('derived', {})[name] = value
+
+
+_registry = None
+
+
+def get_blob_registry():
+    """본문 저장소 종류에 맞는 레지스트리 싱글톤"""
+    global _registry
+    if _registry is None:
+        if get_content_store().storage == STORAGE_S3:
+            _registry = DynamoDBBlobRegistry()
+        else:
+            _registry = LocalBlobRegistry()
+    return _registry
+
+
+def store_file_content(prompt_id: str, file_id: str, content: str) -> Dict[str, Any]:
+    """
+    본문 저장 후 DynamoDB 파일 아이템에 기록할 메타데이터 반환
+    이미 알려진 본문이면 업로드 없이 참조만 추가 (메타데이터만 기록)
+    """
+    data = (content or '').encode('utf-8')
+    if len(data) > S3_CONFIG['max_file_size']:
+        raise ValueError(f"File content exceeds {S3_CONFIG['max_file_size']} bytes")
+
+    store = get_content_store()
+    registry = get_blob_registry()
+    digest = content_hash(data)
+
+    blob = registry.add_reference(digest)
+    if blob is None:
+        key = _blob_key(digest)
+        store.put(key, data)
+        text = data.decode('utf-8')
+        blob = {
+            'contentHash': digest,
+            'contentKey': key,
+            'contentSize': len(data),
+            'refCount': 1,
+            'derived': {name: compute(text) for name, compute in DERIVED_ON_REGISTER.items()},
+            'createdAt': datetime.utcnow().isoformat() + 'Z'
+        }
+        if not registry.create(blob):
+            # 동시에 같은 본문이 등록됨 - 같은 키이므로 참조만 추가
+            blob = registry.add_reference(digest) or blob
+        logger.info(f"Knowledge blob stored: {digest} ({len(data)} bytes) for {prompt_id}/{file_id}")
+    else:
+        logger.info(f"Knowledge blob reused: {digest} for {prompt_id}/{file_id}")
+
+    return {
+        'contentKey': blob['contentKey'],
+        'contentStorage': store.storage,
+        'contentSize': int(blob['contentSize']),
+        'contentHash': digest,
+        'tokenCount': int(blob.get('derived', {}).get('tokenCount', estimate_token_count(content or '')))
+    }
+
+
+def delete_file_content(file_item: Dict[str, Any]) -> None:
+    """파일 아이템의 블롭 참조 해제 (마지막 참조였으면 본문 삭제)"""
+    key = file_item.get('contentKey')
+    digest = file_item.get('contentHash')
+    if not key:
+        return
+    try:
+        remaining = get_blob_registry().release(digest) if digest else None
+        if remaining is None:
+            # 레지스트리 도입 전에 파일별 키로 저장된 본문
+            if not key.startswith(_blob_key('')):
+                get_content_store().delete(key)
+            return
+        if remaining <= 0 and get_blob_registry().remove_if_unreferenced(digest):
+            get_content_store().delete(key)
+            _content_cache.pop(digest, None)
+            logger.info(f"Knowledge blob deleted: {digest}")
+    except Exception as e:
+        logger.warning(f"Error releasing file content {key}: {str(e)}")
+
+
+def blob_artifact(file_item: Dict[str, Any], name: str, compute: Callable[[str], Any]) -> Any:
+    """
+    블롭 단위 파생 데이터 (토큰 수, 검색 색인 등)
+    같은 본문을 참조하는 모든 파일이 한 번 계산한 결과를 공유
+    """
+    digest = file_item.get('contentHash')
+    if not digest:
+        return compute(load_file_content(file_item))
+
+    cache_key = (digest, name)
+    if cache_key in _artifact_cache:
+        return _artifact_cache[cache_key]
+
+    registry = get_blob_registry()
+    value = None
+    try:
+        value = registry.get_derived(digest, name)
+    except Exception as e:
+        logger.warning(f"Error reading blob artifact {name} for {digest}: {str(e)}")
+
+    if value is None:
+        value = compute(load_file_content(file_item))
+        try:
+            registry.put_derived(digest, name, value)
+        except Exception as e:
+            logger.warning(f"Error storing blob artifact {name} for {digest}: {str(e)}")
+
+    _artifact_cache[cache_key] = value
+    return value
+
+
+class _ContentCache:
+    """컨테이너 내 블롭 본문 캐시 (내용 주소이므로 무효화 불필요)"""
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, Tuple[str, Optional[int]]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, digest: str, max_bytes: Optional[int]) -> Optional[str]:
+        """캐시된 본문이 요청 범위를 포함하면 반환"""
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                return None
+            text, read_bytes = entry
+            if read_bytes is not None and (max_bytes is None or max_bytes > read_bytes):
+                return None
+            self._entries.move_to_end(digest)
+            return text
+
+    def put(self, digest: str, text: str, read_bytes: Optional[int]) -> None:
+        """read_bytes: 앞부분만 읽은 경우 읽은 바이트 수 (전체면 None)"""
+        with self._lock:
+            self._entries[digest] = (text, read_bytes)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def pop(self, digest: str, default=None):
+        with self._lock:
+            return self._entries.pop(digest, default)
+
+
+_content_cache = _ContentCache()
+_artifact_cache: Dict[Tuple[str, str], Any] = {}
+
+
+def _decode_prefix(data: bytes) -> str:
+    """범위 읽기로 잘린 마지막 멀티바이트 문자는 버림"""
+    return data.decode('utf-8', errors='ignore')
+
+
+def load_file_content(file_item: Dict[str, Any], max_chars: Optional[int] = None) -> str:
+    """
+    파일 본문 조회 (max_chars 지정 시 필요한 앞부분만 범위 읽기)
+    본문이 아이템에 직접 들어 있는 기존 데이터도 그대로 지원
+    """
+    if 'fileContent' in file_item:
+        content = file_item.get('fileContent') or ''
+        return content if max_chars is None else content[:max_chars]
+
+    key = file_item.get('contentKey')
+    if not key:
+        return ''
+
+    max_bytes = None
+    if max_chars is not None:
+        max_bytes = max_chars * MAX_BYTES_PER_CHAR
+        size = file_item.get('contentSize')
+        if size is not None and max_bytes >= int(size):
+            max_bytes = None
+
+    digest = file_item.get('contentHash')
+    content = _content_cache.get(digest, max_bytes) if digest else None
+    if content is None:
+        try:
+            content = _decode_prefix(get_content_store().get(key, max_bytes))
+        except Exception as e:
+            logger.error(f"Error loading file content {key}: {str(e)}")
+            return ''
+        if digest:
+            _content_cache.put(digest, content, max_bytes)
+    return content if max_chars is None else content[:max_chars]
+
+
+def file_metadata(file_item: Dict[str, Any]) -> Dict[str, Any]:
+    """목록 응답용 메타데이터 (본문 제외)"""
+    return {k: v for k, v in file_item.items() if k != 'fileContent'}
+
+
+def with_content(files: List[Dict[str, Any]], max_chars: Optional[int] = None) -> List[Dict[str, Any]]:
+    """본문을 채운 파일 목록 사본"""
+    return [{**f, 'fileContent': load_file_content(f, max_chars)} for f in files]
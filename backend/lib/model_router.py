@@ -0,0 +1,199 @@
+"""
+모델 라우팅
+엔진 타입과 요청 특성(입력 크기, 추출된 제약, 사용자 역할)에 따라 모델 ID와 샘플링 파라미터 선택
+규칙은 SSM 파라미터 / S3 객체 / 로컬 JSON에서 주기적으로 다시 읽어 재배포 없이 변경 가능
+
+규칙 예시:
+[
+  {
+    "name": "t5-short",
+    "match": {"engine_types": ["T5"], "max_input_chars": 3000, "required_constraints": ["exact_count"]},
+    "model_id": "us.anthropic.claude-3-5-haiku-20241022-v1:0",
+    "params": {"max_tokens": 2048, "temperature": 0.7},
+    "cost_per_1k_input": 0.0008,
+    "cost_per_1k_output": 0.004
+  }
+]
+"""
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import boto3
+
+from src.config.aws import AWS_REGION, BEDROCK_CONFIG, MODEL_ROUTING_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# 한국어 위주 텍스트의 문자당 토큰 근사치 (비용 추정용)
+CHARS_PER_TOKEN = 2.5
+
+
+@dataclass
+class ModelRoute:
+    """선택된 모델과 샘플링 파라미터"""
+    name: str
+    model_id: str
+    max_tokens: int
+    temperature: float
+    top_p: float
+    top_k: int
+    cost_per_1k_input: float = 0.003
+    cost_per_1k_output: float = 0.015
+    match: Dict[str, Any] = field(default_factory=dict)
+
+    def matches(self, profile: Dict[str, Any]) -> bool:
+        """요청 프로필이 이 규칙의 조건을 모두 만족하는지 확인"""
+        match = self.match
+        if 'engine_types' in match and profile.get('engine_type') not in match['engine_types']:
+            return False
+        if 'user_roles' in match and profile.get('user_role') not in match['user_roles']:
+            return False
+        if 'max_input_chars' in match and profile.get('input_chars', 0) > match['max_input_chars']:
+            return False
+        if 'min_input_chars' in match and profile.get('input_chars', 0) < match['min_input_chars']:
+            return False
+        constraints = profile.get('constraints') or {}
+        for name in match.get('required_constraints', []):
+            if name not in constraints:
+                return False
+        return True
+
+
+def default_route() -> ModelRoute:
+    """BEDROCK_CONFIG 기반 기본 라우트"""
+    return ModelRoute(
+        name='default',
+        model_id=BEDROCK_CONFIG['model_id'],
+        max_tokens=BEDROCK_CONFIG['max_tokens'],
+        temperature=BEDROCK_CONFIG['temperature'],
+        top_p=BEDROCK_CONFIG['top_p'],
+        top_k=BEDROCK_CONFIG['top_k']
+    )
+
+
+def _route_from_rule(rule: Dict[str, Any]) -> ModelRoute:
+    base = default_route()
+    params = rule.get('params', {})
+    return ModelRoute(
+        name=rule.get('name', rule.get('model_id', 'unnamed')),
+        model_id=rule.get('model_id', base.model_id),
+        max_tokens=int(params.get('max_tokens', base.max_tokens)),
+        temperature=float(params.get('temperature', base.temperature)),
+        top_p=float(params.get('top_p', base.top_p)),
+        top_k=int(params.get('top_k', base.top_k)),
+        cost_per_1k_input=float(rule.get('cost_per_1k_input', base.cost_per_1k_input)),
+        cost_per_1k_output=float(rule.get('cost_per_1k_output', base.cost_per_1k_output)),
+        match=rule.get('match', {})
+    )
+
+
+def _read_rules(source: str) -> List[Dict[str, Any]]:
+    """규칙 원본 읽기"""
+    if source.startswith('ssm:'):
+        ssm = boto3.client('ssm', region_name=AWS_REGION)
+        raw = ssm.get_parameter(Name=source[len('ssm:'):])['Parameter']['Value']
+    elif source.startswith('s3://'):
+        bucket, _, key = source[len('s3://'):].partition('/')
+        s3 = boto3.client('s3', region_name=AWS_REGION)
+        raw = s3.get_object(Bucket=bucket, Key=key)['Body'].read().decode('utf-8')
+    else:
+        with open(source, encoding='utf-8') as f:
+            raw = f.read()
+    return json.loads(raw)
+
+
+class ModelRouter:
+    """규칙 기반 모델 선택기 (규칙은 reload_interval마다 갱신)"""
+
+    def __init__(self, source: Optional[str] = None, reload_interval: Optional[int] = None):
+        self.source = MODEL_ROUTING_CONFIG['source'] if source is None else source
+        self.reload_interval = (
+            MODEL_ROUTING_CONFIG['reload_interval'] if reload_interval is None else reload_interval
+        )
+        self._routes: List[ModelRoute] = []
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def _routes_snapshot(self) -> List[ModelRoute]:
+        if not self.source:
+            return []
+        with self._lock:
+            if time.time() - self._loaded_at >= self.reload_interval:
+                try:
+                    self._routes = [_route_from_rule(rule) for rule in _read_rules(self.source)]
+                    logger.info(f"Loaded {len(self._routes)} model routes from {self.source}")
+                except Exception as e:
+                    # 읽기 실패 시 이전 규칙 유지
+                    logger.error(f"Failed to load model routes from {self.source}: {str(e)}")
+                self._loaded_at = time.time()
+            return list(self._routes)
+
+    def resolve(
+        self,
+        engine_type: Optional[str],
+        input_chars: int,
+        constraints: Optional[Dict[str, Any]] = None,
+        user_role: str = 'user'
+    ) -> ModelRoute:
+        """요청 프로필에 맞는 첫 번째 규칙 (없으면 기본 라우트)"""
+        profile = {
+            'engine_type': engine_type,
+            'input_chars': input_chars,
+            'constraints': constraints or {},
+            'user_role': user_role
+        }
+        for route in self._routes_snapshot():
+            if route.matches(profile):
+                return route
+        return default_route()
+
+    def record(self, route: ModelRoute, latency_ms: float, input_chars: int, output_chars: int) -> Dict[str, Any]:
+        """라우트별 지연 시간과 추정 비용 기록"""
+        input_tokens = input_chars / CHARS_PER_TOKEN
+        output_tokens = output_chars / CHARS_PER_TOKEN
+        cost = (input_tokens / 1000) * route.cost_per_1k_input + (output_tokens / 1000) * route.cost_per_1k_output
+
+        with self._lock:
+            stats = self._stats.setdefault(route.name, {'calls': 0, 'latency_ms': 0.0, 'cost': 0.0})
+            stats['calls'] += 1
+            stats['latency_ms'] += latency_ms
+            stats['cost'] += cost
+
+        record = {
+            'event': 'model_route',
+            'route': route.name,
+            'modelId': route.model_id,
+            'latencyMs': round(latency_ms, 1),
+            'estimatedInputTokens': int(input_tokens),
+            'estimatedOutputTokens': int(output_tokens),
+            'estimatedCost': round(cost, 6)
+        }
+        logger.info(json.dumps(record, ensure_ascii=False))
+        return record
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """컨테이너 누적 라우트 통계 (평균 지연/총 비용)"""
+        with self._lock:
+            return {
+                name: {
+                    'calls': s['calls'],
+                    'avg_latency_ms': s['latency_ms'] / s['calls'] if s['calls'] else 0.0,
+                    'total_cost': s['cost']
+                }
+                for name, s in self._stats.items()
+            }
+
+
+_router: Optional[ModelRouter] = None
+
+
+def get_model_router() -> ModelRouter:
+    global _router
+    if _router is None:
+        _router = ModelRouter()
+    return _router
@@ -116,6 +116,8 @@ CONVERSATION_ROUTES=(
     "PUT /conversations/{conversationId}"
     "PATCH /conversations/{conversationId}"
     "DELETE /conversations/{conversationId}"
+    "POST /conversations/bulk"
+    "DELETE /conversations"
     "GET /users/{userId}/conversations"
     "POST /conversations/{conversationId}/messages"
     "GET /conversations/{conversationId}/messages"
@@ -184,7 +186,8 @@ aws apigatewayv2 update-api \
     --cors-configuration \
         AllowOrigins="*",\
         AllowMethods="GET,POST,PUT,DELETE,PATCH,OPTIONS",\
-        AllowHeaders="Content-Type,Authorization,X-Amz-Date,X-Api-Key,X-Amz-Security-Token",\
+        AllowHeaders="Content-Type,Authorization,X-Amz-Date,X-Api-Key,X-Amz-Security-Token,If-None-Match",\
+        ExposeHeaders="ETag",\
         MaxAge=86400 \
     --region $REGION > /dev/null 2>&1
 
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+대화 테이블 메시지 본문 압축 마이그레이션 (1회성)
+기존 아이템을 스캔하여 임계값 이상의 content를 압축 형식으로 다시 기록
+압축 본문을 읽는 모든 경로(ConversationManager, conversation API)가 복원하는 버전으로 배포된 뒤에 실행
+
+사용법:
+    python scripts/migrate_compress_messages.py --table nx-tt-dev-ver3-conversations --dry-run
+    python scripts/migrate_compress_messages.py --table nx-tt-dev-ver3-conversations
+"""
+import argparse
+import logging
+import os
+import sys
+
+import boto3
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.compression import encode_message, is_encoded  # noqa: E402
+
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+
+def _content_size(message):
+    content = message.get('content') or b''
+    if isinstance(content, str):
+        return len(content.encode('utf-8'))
+    return len(getattr(content, 'value', content))
+
+
+def _size(messages):
+    return sum(_content_size(m) for m in messages)
+
+
+def migrate(table_name, region, dry_run):
+    table = boto3.resource('dynamodb', region_name=region).Table(table_name)
+    scan_kwargs = {}
+    stats = {'scanned': 0, 'updated': 0, 'skipped': 0, 'conflicts': 0, 'bytes_before': 0, 'bytes_after': 0}
+
+    while True:
+        response = table.scan(**scan_kwargs)
+        for item in response.get('Items', []):
+            stats['scanned'] += 1
+            messages = item.get('messages', [])
+            encoded = [encode_message(m) for m in messages]
+            changed = sum(1 for before, after in zip(messages, encoded)
+                          if not is_encoded(before) and is_encoded(after))
+            if not changed:
+                stats['skipped'] += 1
+                continue
+
+            before, after = _size(messages), _size(encoded)
+            stats['bytes_before'] += before
+            stats['bytes_after'] += after
+            logger.info(f"{item['conversationId']}: {changed} messages, {before} -> {after} bytes")
+            if dry_run:
+                stats['updated'] += 1
+                continue
+
+            # 마이그레이션 중 새 메시지가 추가된 아이템은 건너뜀 (다음 실행에서 처리)
+            condition = 'attribute_not_exists(updatedAt)'
+            values = {':msgs': encoded}
+            if 'updatedAt' in item:
+                condition = 'updatedAt = :updated'
+                values[':updated'] = item['updatedAt']
+            try:
+                table.update_item(
+                    Key={'conversationId': item['conversationId']},
+                    UpdateExpression='SET messages = :msgs',
+                    ConditionExpression=condition,
+                    ExpressionAttributeValues=values
+                )
+                stats['updated'] += 1
+            except table.meta.client.exceptions.ConditionalCheckFailedException:
+                stats['conflicts'] += 1
+                logger.warning(f"{item['conversationId']}: modified during migration, skipped")
+
+        if 'LastEvaluatedKey' not in response:
+            break
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='대화 메시지 본문 압축 마이그레이션')
+    parser.add_argument('--table', default=os.environ.get('CONVERSATIONS_TABLE', 'nx-tt-dev-ver3-conversations'))
+    parser.add_argument('--region', default=os.environ.get('AWS_REGION', 'us-east-1'))
+    parser.add_argument('--dry-run', action='store_true', help='기록하지 않고 예상 절감량만 출력')
+    args = parser.parse_args()
+
+    stats = migrate(args.table, args.region, args.dry_run)
+    logger.info(
+        f"scanned={stats['scanned']} updated={stats['updated']} skipped={stats['skipped']} "
+        f"conflicts={stats['conflicts']} content bytes {stats['bytes_before']} -> {stats['bytes_after']}"
+        + (' (dry run)' if args.dry_run else '')
+    )
+
+
+if __name__ == '__main__':
+    main()
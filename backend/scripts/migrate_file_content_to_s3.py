@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+지식베이스 파일 본문 S3 이전 마이그레이션 (1회성)
+fileContent가 아이템에 직접 들어 있는 기존 파일을 S3로 옮기고 메타데이터만 남김
+
+사용법:
+    python scripts/migrate_file_content_to_s3.py --table nx-tt-dev-ver3-files --dry-run
+    S3_BUCKET=my-bucket python scripts/migrate_file_content_to_s3.py --table nx-tt-dev-ver3-files
+"""
+import argparse
+import logging
+import os
+import sys
+
+import boto3
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lib.file_content_store import delete_file_content, store_file_content  # noqa: E402
+
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+
+def migrate(table_name, region, dry_run):
+    table = boto3.resource('dynamodb', region_name=region).Table(table_name)
+    scan_kwargs = {'FilterExpression': 'attribute_exists(fileContent)'}
+    stats = {'migrated': 0, 'conflicts': 0, 'bytes': 0}
+
+    while True:
+        response = table.scan(**scan_kwargs)
+        for item in response.get('Items', []):
+            content = item.get('fileContent') or ''
+            size = len(content.encode('utf-8'))
+            logger.info(f"{item['promptId']}/{item['fileId']}: {size} bytes")
+            stats['bytes'] += size
+            if dry_run:
+                stats['migrated'] += 1
+                continue
+
+            meta = store_file_content(item['promptId'], item['fileId'], content)
+            try:
+                # 이전 중 본문이 바뀐 파일은 건너뜀 (다음 실행에서 처리)
+                table.update_item(
+                    Key={'promptId': item['promptId'], 'fileId': item['fileId']},
+                    UpdateExpression=(
+                        'SET contentKey = :key, contentStorage = :storage, '
+                        'contentSize = :size, contentHash = :hash, tokenCount = :tokens REMOVE fileContent'
+                    ),
+                    ConditionExpression='fileContent = :content',
+                    ExpressionAttributeValues={
+                        ':key': meta['contentKey'],
+                        ':storage': meta['contentStorage'],
+                        ':size': meta['contentSize'],
+                        ':hash': meta['contentHash'],
+                        ':tokens': meta['tokenCount'],
+                        ':content': content
+                    }
+                )
+                stats['migrated'] += 1
+            except table.meta.client.exceptions.ConditionalCheckFailedException:
+                # 기록하지 못한 본문의 참조는 해제 (남겨 두면 블롭이 삭제되지 않음)
+                delete_file_content(meta)
+                stats['conflicts'] += 1
+                logger.warning(f"{item['promptId']}/{item['fileId']}: modified during migration, skipped")
+
+        if 'LastEvaluatedKey' not in response:
+            break
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='지식베이스 파일 본문 S3 이전')
+    parser.add_argument('--table', default=os.environ.get('FILES_TABLE', 'nx-tt-dev-ver3-files'))
+    parser.add_argument('--region', default=os.environ.get('AWS_REGION', 'us-east-1'))
+    parser.add_argument('--dry-run', action='store_true', help='옮기지 않고 대상만 출력')
+    args = parser.parse_args()
+
+    stats = migrate(args.table, args.region, args.dry_run)
+    logger.info(
+        f"migrated={stats['migrated']} conflicts={stats['conflicts']} content bytes={stats['bytes']}"
+        + (' (dry run)' if args.dry_run else '')
+    )
+
+
+if __name__ == '__main__':
+    main()
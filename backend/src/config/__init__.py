@@ -5,16 +5,27 @@ from .database import (
     TABLES,
     AWS_REGION,
     DYNAMODB_CONFIG,
+    BULK_OPERATIONS_CONFIG,
+    CONTENT_COMPRESSION_CONFIG,
     get_table_name,
     get_table_config
 )
 
 from .aws import (
     BEDROCK_CONFIG,
+    BEDROCK_TRANSPORT_CONFIG,
+    GOVERNOR_CONFIG,
+    HEDGING_CONFIG,
+    NBEST_CONFIG,
+    MODEL_ROUTING_CONFIG,
     API_GATEWAY_CONFIG,
     LAMBDA_CONFIG,
+    LOGGING_CONFIG,
+    SERIALIZATION_CONFIG,
+    RESPONSE_COMPRESSION_CONFIG,
     S3_CONFIG,
     CLOUDWATCH_CONFIG,
+    TRACING_CONFIG,
     COGNITO_CONFIG,
     GUARDRAIL_CONFIG
 )
@@ -24,14 +35,25 @@ __all__ = [
     'TABLES',
     'AWS_REGION',
     'DYNAMODB_CONFIG',
+    'BULK_OPERATIONS_CONFIG',
+    'CONTENT_COMPRESSION_CONFIG',
     'get_table_name',
     'get_table_config',
     # AWS Services
     'BEDROCK_CONFIG',
+    'BEDROCK_TRANSPORT_CONFIG',
+    'GOVERNOR_CONFIG',
+    'HEDGING_CONFIG',
+    'NBEST_CONFIG',
+    'MODEL_ROUTING_CONFIG',
     'API_GATEWAY_CONFIG',
     'LAMBDA_CONFIG',
+    'LOGGING_CONFIG',
+    'SERIALIZATION_CONFIG',
+    'RESPONSE_COMPRESSION_CONFIG',
     'S3_CONFIG',
     'CLOUDWATCH_CONFIG',
+    'TRACING_CONFIG',
     'COGNITO_CONFIG',
     'GUARDRAIL_CONFIG'
 ]
\ No newline at end of file
@@ -17,6 +17,64 @@ BEDROCK_CONFIG = {
     'top_k': int(os.environ.get('BEDROCK_TOP_K', '50'))
 }
 
+# Bedrock 전송 계층 설정 (커넥션 풀, 타임아웃, 재시도)
+BEDROCK_TRANSPORT_CONFIG = {
+    'max_pool_connections': int(os.environ.get('BEDROCK_MAX_POOL_CONNECTIONS', '16')),
+    'tcp_keepalive': os.environ.get('BEDROCK_TCP_KEEPALIVE', 'true').lower() == 'true',
+    'connect_timeout': float(os.environ.get('BEDROCK_CONNECT_TIMEOUT', '3')),
+    # 스트리밍 중 청크 사이 최대 대기 시간 (첫 토큰 지연 포함)
+    'read_timeout': float(os.environ.get('BEDROCK_READ_TIMEOUT', '60')),
+    'backoff_base': float(os.environ.get('BEDROCK_BACKOFF_BASE', '0.25')),
+    'backoff_cap': float(os.environ.get('BEDROCK_BACKOFF_CAP', '8'))
+}
+
+# Bedrock 동시성 거버너 설정 (모델별 토큰 버킷 + AIMD)
+GOVERNOR_CONFIG = {
+    'enabled': os.environ.get('GOVERNOR_ENABLED', 'true').lower() == 'true',
+    'store': os.environ.get('GOVERNOR_STORE', 'local'),  # 'local' | 'dynamodb'
+    'initial_rate': float(os.environ.get('GOVERNOR_INITIAL_RATE', '2')),  # 초당 요청 수
+    'min_rate': float(os.environ.get('GOVERNOR_MIN_RATE', '0.2')),
+    'max_rate': float(os.environ.get('GOVERNOR_MAX_RATE', '20')),
+    'burst': float(os.environ.get('GOVERNOR_BURST', '5')),
+    'additive_increase': float(os.environ.get('GOVERNOR_ADDITIVE_INCREASE', '0.1')),
+    'multiplicative_decrease': float(os.environ.get('GOVERNOR_MULTIPLICATIVE_DECREASE', '0.5')),
+    'max_wait': float(os.environ.get('GOVERNOR_MAX_WAIT', '20')),
+    'poll_interval': float(os.environ.get('GOVERNOR_POLL_INTERVAL', '0.25'))
+}
+
+# Bedrock 헤지 요청 설정 (첫 토큰 지연 꼬리 대응, 기본 비활성화)
+HEDGING_CONFIG = {
+    'enabled': os.environ.get('HEDGING_ENABLED', 'false').lower() == 'true',
+    'percentile': float(os.environ.get('HEDGING_PERCENTILE', '0.95')),
+    'deadline_multiplier': float(os.environ.get('HEDGING_DEADLINE_MULTIPLIER', '1.0')),
+    'default_deadline': float(os.environ.get('HEDGING_DEFAULT_DEADLINE', '2.0')),  # 초
+    'min_deadline': float(os.environ.get('HEDGING_MIN_DEADLINE', '0.5')),
+    'max_deadline': float(os.environ.get('HEDGING_MAX_DEADLINE', '5.0')),
+    'min_samples': int(os.environ.get('HEDGING_MIN_SAMPLES', '20')),
+    'sample_window': int(os.environ.get('HEDGING_SAMPLE_WINDOW', '200')),
+    'max_hedge_ratio': float(os.environ.get('HEDGING_MAX_RATIO', '0.05'))  # 전체 요청 대비 헤지 비율 상한
+}
+
+# 병렬 N-best 생성 설정 (엄격한 형식 엔진에서 첫 번째 유효 응답 채택)
+# 후보 수만큼 Bedrock 호출/출력 토큰이 늘어나므로 엔진을 지정해야 켜짐 (NBEST_ENGINES=T5)
+NBEST_CONFIG = {
+    'enabled_engines': [
+        e.strip() for e in os.environ.get('NBEST_ENGINES', '').split(',') if e.strip()
+    ],
+    'candidates': int(os.environ.get('NBEST_CANDIDATES', '3')),
+    # 후보 전체의 출력 토큰 상한 - 후보별 max_tokens는 단일 호출과 같고, 상한을 넘으면 후보 수를 줄임
+    'max_total_output_tokens': int(os.environ.get('NBEST_MAX_TOTAL_OUTPUT_TOKENS', '49152')),
+    # 사용자 메시지가 이보다 긴 요청(긴 출력이 예상됨)은 단일 호출
+    'max_message_chars': int(os.environ.get('NBEST_MAX_MESSAGE_CHARS', '4000'))
+}
+
+# 모델 라우팅 설정 (엔진/요청 특성별 모델 선택 규칙)
+MODEL_ROUTING_CONFIG = {
+    # 규칙 위치: 'ssm:/파라미터/이름' | 's3://버킷/키' | 로컬 JSON 파일 경로 | '' (기본 모델만 사용)
+    'source': os.environ.get('MODEL_ROUTES_SOURCE', ''),
+    'reload_interval': int(os.environ.get('MODEL_ROUTES_RELOAD_INTERVAL', '60'))  # 초
+}
+
 # API Gateway 설정
 API_GATEWAY_CONFIG = {
     'rest_api_url': os.environ.get('REST_API_URL', ''),
@@ -31,11 +89,47 @@ LAMBDA_CONFIG = {
     'log_level': os.environ.get('LOG_LEVEL', 'INFO')
 }
 
+# 구조화 로깅 설정
+LOGGING_CONFIG = {
+    'format': os.environ.get('LOG_FORMAT', 'json'),  # 'json' | 'text'
+    # 필드 하나/메시지 하나의 최대 길이 (초과분은 잘라내고 원래 길이 표시)
+    'max_field_chars': int(os.environ.get('LOG_MAX_FIELD_CHARS', '1000')),
+    'max_message_chars': int(os.environ.get('LOG_MAX_MESSAGE_CHARS', '4000')),
+    'max_items': int(os.environ.get('LOG_MAX_ITEMS', '20')),
+    # 전체 이벤트(요약 아닌 원문) 로그 샘플링 비율 - DEBUG 레벨이면 항상 출력
+    'event_sample_rate': float(os.environ.get('LOG_EVENT_SAMPLE_RATE', '0.01')),
+    # 값 대신 길이만 남길 필드 (본문/대화 내용/인증 정보)
+    'redact_fields': [
+        'body', 'fileContent', 'content', 'message', 'conversationHistory', 'messages',
+        'authorization', 'Authorization', 'password', 'token', 'idToken', 'accessToken'
+    ]
+}
+
+# 응답 직렬화 설정
+SERIALIZATION_CONFIG = {
+    # 'auto': orjson이 설치되어 있으면 사용, 없으면 표준 json | 'orjson' | 'json'
+    'json_backend': os.environ.get('JSON_BACKEND', 'auto')
+}
+
+# REST 응답 압축 설정 (HTTP API가 base64 본문을 디코딩해 그대로 전달)
+RESPONSE_COMPRESSION_CONFIG = {
+    'enabled': os.environ.get('RESPONSE_COMPRESSION_ENABLED', 'true').lower() == 'true',
+    # 이보다 작은 본문은 압축하지 않음 (base64 오버헤드와 CPU 대비 이득이 작음)
+    'min_bytes': int(os.environ.get('RESPONSE_COMPRESSION_MIN_BYTES', '2048')),
+    # 같은 q 값이면 앞쪽 우선 ('br'은 brotli 패키지가 설치된 경우만)
+    'encodings': ['br', 'gzip'],
+    'gzip_level': int(os.environ.get('RESPONSE_GZIP_LEVEL', '6')),
+    'brotli_quality': int(os.environ.get('RESPONSE_BROTLI_QUALITY', '5'))
+}
+
 # S3 설정 (파일 업로드용)
 S3_CONFIG = {
     'bucket': os.environ.get('S3_BUCKET', ''),
     'region': AWS_REGION,
-    'max_file_size': int(os.environ.get('MAX_FILE_SIZE', '10485760'))  # 10MB
+    'max_file_size': int(os.environ.get('MAX_FILE_SIZE', '10485760')),  # 10MB
+    'file_content_prefix': os.environ.get('FILE_CONTENT_PREFIX', 'knowledge-files/'),
+    # 버킷이 없을 때(로컬 실행) 파일 본문을 저장할 디렉터리
+    'local_content_dir': os.environ.get('FILE_CONTENT_LOCAL_DIR', '/tmp/nexus-file-content')
 }
 
 # CloudWatch 설정
@@ -45,6 +139,20 @@ CLOUDWATCH_CONFIG = {
     'metrics_enabled': os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
 }
 
+# 트레이싱 설정
+TRACING_CONFIG = {
+    'enabled': os.environ.get('TRACING_ENABLED', 'false').lower() == 'true',
+    'sample_rate': float(os.environ.get('TRACING_SAMPLE_RATE', '0.05')),
+    # 샘플링되지 않은 요청도 이 시간 이상 걸리거나 오류가 나면 보관
+    'slow_threshold_ms': float(os.environ.get('TRACING_SLOW_THRESHOLD_MS', '10000')),
+    'max_spans_per_trace': int(os.environ.get('TRACING_MAX_SPANS', '500')),
+    'exporters': [
+        name.strip() for name in os.environ.get('TRACING_EXPORTERS', 'jsonl').split(',') if name.strip()
+    ],  # 'jsonl' | 'xray'
+    'jsonl_path': os.environ.get('TRACING_JSONL_PATH', '/tmp/nexus-traces.jsonl'),
+    'xray_daemon_address': os.environ.get('AWS_XRAY_DAEMON_ADDRESS', '')
+}
+
 # Cognito 설정
 COGNITO_CONFIG = {
     'user_pool_id': os.environ.get('COGNITO_USER_POOL_ID', ''),
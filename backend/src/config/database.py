@@ -40,6 +40,20 @@ TABLES = {
     'websocket_connections': {
         'name': os.environ.get('WEBSOCKET_TABLE', 'nexus-websocket-connections'),
         'partition_key': 'connectionId'
+    },
+    'bedrock_governor': {
+        'name': os.environ.get('GOVERNOR_TABLE', 'nexus-bedrock-governor'),
+        'partition_key': 'modelId'
+    },
+    'stream_checkpoints': {
+        'name': os.environ.get('STREAM_CHECKPOINT_TABLE', 'nexus-stream-checkpoints'),
+        'partition_key': 'requestId',
+        'sort_key': 'chunkIndex',
+        'ttl_attribute': 'ttl'
+    },
+    'knowledge_blobs': {
+        'name': os.environ.get('KNOWLEDGE_BLOBS_TABLE', 'nexus-knowledge-blobs'),
+        'partition_key': 'contentHash'
     }
 }
 
@@ -50,7 +64,31 @@ AWS_REGION = os.environ.get('AWS_REGION', 'us-east-1')
 DYNAMODB_CONFIG = {
     'region_name': AWS_REGION,
     'max_retries': 3,
-    'timeout': 10
+    'timeout': 10,
+    # 호출마다 소비한 RCU/WCU를 응답으로 받아 집계 ('TOTAL' | 'INDEXES' | 'NONE')
+    'return_consumed_capacity': os.environ.get('DYNAMODB_RETURN_CONSUMED_CAPACITY', 'TOTAL').upper(),
+    # 리포지토리가 저수준 클라이언트 + 자체 코덱 사용 (숫자를 Decimal 대신 int/float로)
+    'fast_codec': os.environ.get('DYNAMODB_FAST_CODEC', 'true').lower() == 'true'
+}
+
+# 대량 작업(일괄 삭제/보관/제목 변경) 설정
+BULK_OPERATIONS_CONFIG = {
+    # BatchWriteItem(25개 단위)/UpdateItem 동시 호출 수
+    'max_workers': int(os.environ.get('BULK_MAX_WORKERS', '4')),
+    # 요청 하나가 처리하는 최대 아이템 수 (사용자 전체 삭제는 nextToken으로 이어서 호출)
+    'max_items': int(os.environ.get('BULK_MAX_ITEMS', '500')),
+    # UnprocessedItems 재시도 (지수 백오프 + 지터)
+    'max_attempts': int(os.environ.get('BULK_MAX_ATTEMPTS', '6')),
+    'backoff_base_seconds': float(os.environ.get('BULK_BACKOFF_BASE', '0.05')),
+    'backoff_max_seconds': float(os.environ.get('BULK_BACKOFF_MAX', '2.0'))
+}
+
+# 대용량 메시지 본문 압축 설정
+CONTENT_COMPRESSION_CONFIG = {
+    'enabled': os.environ.get('CONTENT_COMPRESSION_ENABLED', 'true').lower() == 'true',
+    'algorithm': os.environ.get('CONTENT_COMPRESSION', 'zlib'),  # 'zlib' | 'zstd'
+    'threshold_bytes': int(os.environ.get('CONTENT_COMPRESSION_THRESHOLD', '2048')),
+    'level': int(os.environ.get('CONTENT_COMPRESSION_LEVEL', '6'))
 }
 
 def get_table_name(table_type: str) -> str:
@@ -1,13 +1,26 @@
 """
 도메인 모델 패키지
 """
-from .conversation import Conversation, Message
+from .conversation import (
+    Conversation,
+    Message,
+    MessageList,
+    high_water_mark,
+    messages_since,
+    normalize_timestamp,
+    utc_timestamp
+)
 from .prompt import Prompt, PromptConfig, PromptFile
 from .usage import Usage, UsageSummary
 
 __all__ = [
     'Conversation',
     'Message',
+    'MessageList',
+    'high_water_mark',
+    'messages_since',
+    'normalize_timestamp',
+    'utc_timestamp',
     'Prompt',
     'PromptConfig',
     'PromptFile',
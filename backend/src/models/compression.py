@@ -0,0 +1,107 @@
+"""
+메시지 본문 압축
+임계값 이상의 content는 zlib/zstd 바이너리로 저장하고 contentEncoding에 방식을 기록
+(작은 메시지와 기존 아이템은 문자열 그대로 유지)
+"""
+import logging
+import zlib
+from typing import Any, Dict, Optional, Tuple
+
+from ..config.database import CONTENT_COMPRESSION_CONFIG
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+ENCODING_ZLIB = 'zlib'
+ENCODING_ZSTD = 'zstd'
+
+# 압축 후 크기가 원본 대비 이 비율 이상이면 압축하지 않음
+MIN_SAVING_RATIO = 0.9
+
+
+def _to_bytes(data: Any) -> bytes:
+    """boto3 Binary / bytes / bytearray -> bytes"""
+    if hasattr(data, 'value'):
+        data = data.value
+    return bytes(data)
+
+
+def _algorithm() -> str:
+    algorithm = CONTENT_COMPRESSION_CONFIG['algorithm']
+    if algorithm == ENCODING_ZSTD and zstandard is None:
+        logger.warning("zstandard is not installed, falling back to zlib")
+        return ENCODING_ZLIB
+    return algorithm
+
+
+def compress_text(text: str) -> Optional[Tuple[str, bytes]]:
+    """임계값 이상이고 이득이 있을 때만 (인코딩, 압축 바이트) 반환"""
+    if not CONTENT_COMPRESSION_CONFIG['enabled'] or not isinstance(text, str):
+        return None
+
+    raw = text.encode('utf-8')
+    if len(raw) < CONTENT_COMPRESSION_CONFIG['threshold_bytes']:
+        return None
+
+    algorithm = _algorithm()
+    level = CONTENT_COMPRESSION_CONFIG['level']
+    if algorithm == ENCODING_ZSTD:
+        data = zstandard.ZstdCompressor(level=level).compress(raw)
+    else:
+        algorithm = ENCODING_ZLIB
+        data = zlib.compress(raw, level)
+
+    if len(data) >= len(raw) * MIN_SAVING_RATIO:
+        return None
+    return algorithm, data
+
+
+def decompress_text(encoding: str, data: Any) -> str:
+    """압축된 본문 복원"""
+    raw = _to_bytes(data)
+    if encoding == ENCODING_ZLIB:
+        return zlib.decompress(raw).decode('utf-8')
+    if encoding == ENCODING_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to decode zstd message content")
+        return zstandard.ZstdDecompressor().decompress(raw).decode('utf-8')
+    raise ValueError(f"Unknown content encoding: {encoding}")
+
+
+def encode_content(text: str, encoded: Optional[Tuple[str, Any]] = None) -> Dict[str, Any]:
+    """
+    메시지 맵에 들어갈 content 속성
+    이미 압축된 본문(encoded)이 있으면 다시 압축하지 않고 그대로 사용
+    """
+    if encoded is None:
+        encoded = compress_text(text)
+    if encoded is None:
+        return {'content': text}
+    encoding, data = encoded
+    return {'content': _to_bytes(data), 'contentEncoding': encoding}
+
+
+def is_encoded(message: Dict[str, Any]) -> bool:
+    return bool(message.get('contentEncoding'))
+
+
+def decode_message(message: Dict[str, Any]) -> Dict[str, Any]:
+    """저장된 메시지 맵의 content를 문자열로 복원한 사본"""
+    if not is_encoded(message):
+        return message
+    decoded = {k: v for k, v in message.items() if k != 'contentEncoding'}
+    decoded['content'] = decompress_text(message['contentEncoding'], message['content'])
+    return decoded
+
+
+def encode_message(message: Dict[str, Any]) -> Dict[str, Any]:
+    """평문 메시지 맵을 저장 형식으로 변환 (이미 압축된 경우 그대로)"""
+    if is_encoded(message):
+        return message
+    encoded = {k: v for k, v in message.items() if k != 'content'}
+    encoded.update(encode_content(message.get('content', '')))
+    return encoded
@@ -1,20 +1,162 @@
 """
 대화(Conversation) 도메인 모델
 """
+from collections.abc import MutableSequence
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
-from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Dict, Any, Tuple, Union
+from datetime import datetime, timezone
+
+from .compression import decompress_text, encode_content, encode_message
+from .slots import slotted
+
+# 메시지/대화 타임스탬프 형식 (고정 길이라 문자열 비교 = 시간 비교)
+UTC_TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%S.%fZ'
 
 
-@dataclass
 class Message:
-    """메시지 모델"""
-    role: str  # 'user' or 'assistant'
-    content: str
-    timestamp: Optional[str] = None
-    metadata: Optional[Dict[str, Any]] = field(default_factory=dict)
+    """메시지 모델 (압축 저장된 content는 처음 접근할 때 복원)"""
+    
+    __slots__ = ('role', '_content', 'timestamp', 'metadata', 'encoded_content')
+    
+    def __init__(
+        self,
+        role: str,  # 'user' or 'assistant'
+        content: Optional[str],
+        timestamp: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        encoded_content: Optional[Tuple[str, Any]] = None
+    ):
+        self.role = role
+        self._content = content
+        self.timestamp = timestamp
+        self.metadata = {} if metadata is None else metadata
+        self.encoded_content = encoded_content
+    
+    @property
+    def content(self) -> Optional[str]:
+        if self._content is None and self.encoded_content is not None:
+            encoding, data = self.encoded_content
+            self._content = decompress_text(encoding, data)
+        return self._content
+    
+    @content.setter
+    def content(self, value: Optional[str]) -> None:
+        self._content = value
+        if value is not None:
+            # 본문이 바뀌면 기존 압축본은 무효
+            self.encoded_content = None
+    
+    def __repr__(self) -> str:
+        return (
+            f"Message(role={self.role!r}, content={self.content!r}, "
+            f"timestamp={self.timestamp!r}, metadata={self.metadata!r})"
+        )
+    
+    def __eq__(self, other: Any) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (
+            (self.role, self.content, self.timestamp, self.metadata)
+            == (other.role, other.content, other.timestamp, other.metadata)
+        )
+    
+    __hash__ = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """DynamoDB 저장용 메시지 맵 (복원하지 않은 본문은 압축 상태 그대로 저장)"""
+        if self.encoded_content is not None:
+            content = encode_content(None, self.encoded_content)
+        else:
+            content = encode_content(self._content)
+        return {
+            'role': self.role,
+            **content,
+            'timestamp': self.timestamp,
+            'metadata': self.metadata
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Message':
+        """저장된 메시지 맵에서 모델 생성 (압축 본문은 지연 복원)"""
+        encoding = data.get('contentEncoding')
+        return cls(
+            role=data['role'],
+            content=None if encoding else data['content'],
+            timestamp=data.get('timestamp'),
+            metadata=data.get('metadata', {}),
+            encoded_content=(encoding, data['content']) if encoding else None
+        )
 
 
+class MessageList(MutableSequence):
+    """
+    지연 메시지 목록
+    저장된 메시지 맵을 그대로 들고 있다가 접근한 항목만 Message로 만듦
+    (개수만 필요한 목록/통계 조회는 Message를 하나도 만들지 않음)
+    """
+    
+    __slots__ = ('_items',)
+    
+    def __init__(self, messages: Iterable[Message] = ()):
+        self._items: List[Union[Message, Dict[str, Any]]] = list(messages)
+    
+    @classmethod
+    def from_stored(cls, items: Iterable[Dict[str, Any]]) -> 'MessageList':
+        """DynamoDB에 저장된 메시지 맵 목록에서 생성"""
+        messages = cls()
+        messages._items = list(items)
+        return messages
+    
+    def _materialize(self, index: int) -> Message:
+        item = self._items[index]
+        if item.__class__ is not Message:
+            item = Message.from_dict(item)
+            self._items[index] = item
+        return item
+    
+    def __len__(self) -> int:
+        return len(self._items)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._materialize(i) for i in range(*index.indices(len(self._items)))]
+        return self._materialize(index)
+    
+    def __setitem__(self, index, value) -> None:
+        if isinstance(index, slice):
+            self._items[index] = list(value)
+        else:
+            self._items[index] = value
+    
+    def __delitem__(self, index) -> None:
+        del self._items[index]
+    
+    def __iter__(self) -> Iterator[Message]:
+        for index in range(len(self._items)):
+            yield self._materialize(index)
+    
+    def insert(self, index: int, value: Message) -> None:
+        self._items.insert(index, value)
+    
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (MessageList, list)):
+            return len(self) == len(other) and list(self) == list(other)
+        return NotImplemented
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return f"MessageList({len(self._items)} messages)"
+    
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """저장 형식 목록 (만들지 않은 항목은 저장된 맵을 그대로 사용)"""
+        return [
+            item.to_dict() if item.__class__ is Message else encode_message(item)
+            for item in self._items
+        ]
+
+
+@slotted
 @dataclass
 class Conversation:
     """대화 모델"""
@@ -22,10 +164,15 @@ class Conversation:
     user_id: str
     engine_type: str  # 'T5' or 'H8'
     title: Optional[str] = None
-    messages: List[Message] = field(default_factory=list)
+    messages: List[Message] = field(default_factory=MessageList)
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = field(default_factory=dict)
+    archived: bool = False
+    
+    def __post_init__(self):
+        if not isinstance(self.messages, MessageList):
+            self.messages = MessageList(self.messages)
     
     def to_dict(self) -> Dict[str, Any]:
         """DynamoDB 저장용 딕셔너리 변환"""
@@ -34,40 +181,75 @@ class Conversation:
             'userId': self.user_id,
             'engineType': self.engine_type,
             'title': self.title,
-            'messages': [
-                {
-                    'role': msg.role,
-                    'content': msg.content,
-                    'timestamp': msg.timestamp,
-                    'metadata': msg.metadata
-                }
-                for msg in self.messages
-            ],
-            'createdAt': self.created_at or datetime.now().isoformat(),
-            'updatedAt': self.updated_at or datetime.now().isoformat(),
-            'metadata': self.metadata
+            'messages': self.messages.to_dicts(),
+            'createdAt': self.created_at or utc_timestamp(),
+            'updatedAt': self.updated_at or utc_timestamp(),
+            'metadata': self.metadata,
+            'archived': self.archived
         }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Conversation':
-        """DynamoDB 데이터에서 모델 생성"""
-        messages = [
-            Message(
-                role=msg['role'],
-                content=msg['content'],
-                timestamp=msg.get('timestamp'),
-                metadata=msg.get('metadata', {})
-            )
-            for msg in data.get('messages', [])
-        ]
-        
+        """DynamoDB 데이터에서 모델 생성 (메시지는 접근할 때 생성)"""
         return cls(
             conversation_id=data['conversationId'],
             user_id=data['userId'],
             engine_type=data['engineType'],
             title=data.get('title'),
-            messages=messages,
+            messages=MessageList.from_stored(data.get('messages', [])),
             created_at=data.get('createdAt'),
             updated_at=data.get('updatedAt'),
-            metadata=data.get('metadata', {})
-        )
\ No newline at end of file
+            metadata=data.get('metadata', {}),
+            archived=data.get('archived', False)
+        )
+
+
+
+def utc_timestamp() -> str:
+    """저장용 타임스탬프 (UTC ISO 8601, 마이크로초 고정 + 'Z')"""
+    return datetime.utcnow().strftime(UTC_TIMESTAMP_FORMAT)
+
+
+def normalize_timestamp(value: Any) -> Optional[str]:
+    """
+    저장/요청 타임스탬프를 utc_timestamp 형식으로 변환 (문자열 비교가 시간 순서와 일치하도록)
+    'Z'/오프셋이 없는 값은 예전 datetime.now() 저장본 - Lambda 로컬 시간은 UTC이므로 UTC로 간주
+    해석할 수 없으면 None
+    """
+    if not value:
+        return None
+    text = str(value).strip()
+    if text.endswith('Z'):
+        # Python 3.9의 fromisoformat은 'Z' 접미사를 받지 않음
+        text = text[:-1] + '+00:00'
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.strftime(UTC_TIMESTAMP_FORMAT)
+
+
+def messages_since(messages: List[Dict[str, Any]], since: Optional[str]) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    저장된 메시지 맵 목록에서 since(메시지 id 또는 ISO 타임스탬프) 이후 메시지
+    반환: (메시지 목록, reset) - since를 찾지 못하면 전체 목록과 reset=True (클라이언트는 목록을 교체)
+    """
+    if not since:
+        return list(messages), True
+    for index in range(len(messages) - 1, -1, -1):
+        if messages[index].get('id') == since:
+            return list(messages[index + 1:]), False
+    cutoff = normalize_timestamp(since)
+    if cutoff:
+        return [m for m in messages if (normalize_timestamp(m.get('timestamp')) or '') > cutoff], False
+    return list(messages), True
+
+
+def high_water_mark(messages: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """마지막 메시지의 id/타임스탬프 (다음 요청의 since 값)"""
+    if not messages:
+        return None
+    last = messages[-1]
+    return {'messageId': last.get('id'), 'timestamp': normalize_timestamp(last.get('timestamp'))}
@@ -5,7 +5,10 @@ from dataclasses import dataclass, field
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 
+from .slots import slotted
 
+
+@slotted
 @dataclass
 class PromptFile:
     """프롬프트 파일 모델"""
@@ -15,7 +18,8 @@ class PromptFile:
     metadata: Optional[Dict[str, Any]] = field(default_factory=dict)
 
 
-@dataclass 
+@slotted
+@dataclass
 class PromptConfig:
     """프롬프트 설정 모델"""
     description: str
@@ -23,6 +27,7 @@ class PromptConfig:
     metadata: Optional[Dict[str, Any]] = field(default_factory=dict)
 
 
+@slotted
 @dataclass
 class Prompt:
     """프롬프트 모델"""
@@ -0,0 +1,24 @@
+"""
+dataclass용 __slots__ 지원
+Lambda 런타임(Python 3.9)에는 dataclass(slots=True)가 없어 클래스를 __slots__와 함께 다시 생성
+"""
+import dataclasses
+from typing import Type, TypeVar
+
+T = TypeVar('T')
+
+
+def slotted(cls: Type[T]) -> Type[T]:
+    """
+    @dataclass 위에 붙이는 데코레이터 - 필드를 __slots__로 가진 같은 클래스를 반환
+    인스턴스마다 __dict__가 생기지 않아 웜 컨테이너에 오래 남는 모델의 메모리가 줄어듦
+    """
+    names = tuple(f.name for f in dataclasses.fields(cls))
+    namespace = dict(cls.__dict__)
+    # 기본값 클래스 속성은 슬롯과 충돌 (기본값은 생성된 __init__ 시그니처에 이미 들어 있음)
+    for name in names:
+        namespace.pop(name, None)
+    namespace.pop('__dict__', None)
+    namespace.pop('__weakref__', None)
+    namespace['__slots__'] = names
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
@@ -6,7 +6,10 @@ from typing import Dict, Any, Optional
 from datetime import datetime
 from decimal import Decimal
 
+from .slots import slotted
 
+
+@slotted
 @dataclass
 class Usage:
     """사용량 모델"""
@@ -65,6 +68,7 @@ class Usage:
         self.updated_at = datetime.now().isoformat()
 
 
+@slotted
 @dataclass
 class UsageSummary:
     """사용량 요약 모델"""
@@ -0,0 +1,45 @@
+"""
+모니터링 패키지
+채팅 턴 메트릭(CloudWatch EMF), 스팬 트레이싱, DynamoDB 소비 용량
+"""
+from . import capacity, metrics, tracing
+from .metrics import (
+    Unit,
+    TurnMetrics,
+    start_turn,
+    end_turn,
+    timed,
+    instrument_repository
+)
+from .capacity import ConsumedCapacity, instrument_client, instrument_resource
+from .invocation import instrument_handler
+from .tracing import (
+    Span,
+    span,
+    traced,
+    traced_root,
+    trace_class,
+    register_exporter
+)
+
+__all__ = [
+    'metrics',
+    'Unit',
+    'TurnMetrics',
+    'start_turn',
+    'end_turn',
+    'timed',
+    'instrument_repository',
+    'capacity',
+    'ConsumedCapacity',
+    'instrument_client',
+    'instrument_resource',
+    'instrument_handler',
+    'tracing',
+    'Span',
+    'span',
+    'traced',
+    'traced_root',
+    'trace_class',
+    'register_exporter'
+]
@@ -0,0 +1,140 @@
+"""
+DynamoDB 소비 용량(RCU/WCU) 집계
+클라이언트에 botocore 이벤트 훅을 달아 모든 호출에 ReturnConsumedCapacity를 붙이고,
+응답의 ConsumedCapacity를 핸들러 호출 단위로 테이블/작업별 합산
+"""
+import logging
+import weakref
+from contextvars import ContextVar
+from typing import Any, Dict, Optional, Tuple
+
+from ..config.database import DYNAMODB_CONFIG
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+# ReturnConsumedCapacity를 지원하는 작업 (읽기/쓰기 구분)
+READ_OPERATIONS = {'GetItem', 'Query', 'Scan', 'BatchGetItem', 'TransactGetItems'}
+WRITE_OPERATIONS = {'PutItem', 'UpdateItem', 'DeleteItem', 'BatchWriteItem', 'TransactWriteItems'}
+
+
+class ConsumedCapacity:
+    """핸들러 호출 하나의 소비 용량 합계"""
+
+    def __init__(self):
+        self.read = 0.0
+        self.write = 0.0
+        # 테이블 → {'read': RCU, 'write': WCU}
+        self.by_table: Dict[str, Dict[str, float]] = {}
+        # 작업 → {'calls': 횟수, 'units': 용량}
+        self.by_operation: Dict[str, Dict[str, float]] = {}
+
+    @property
+    def total(self) -> float:
+        return self.read + self.write
+
+    def add(self, operation: str, table: str, read: float, write: float, new_call: bool = True) -> None:
+        self.read += read
+        self.write += write
+        table_usage = self.by_table.setdefault(table, {'read': 0.0, 'write': 0.0})
+        table_usage['read'] += read
+        table_usage['write'] += write
+        op_usage = self.by_operation.setdefault(operation, {'calls': 0, 'units': 0.0})
+        if new_call:
+            op_usage['calls'] += 1
+        op_usage['units'] += read + write
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'read': self.read,
+            'write': self.write,
+            'byTable': self.by_table,
+            'byOperation': self.by_operation
+        }
+
+
+_current: ContextVar = ContextVar('consumed_capacity', default=None)
+_instrumented = weakref.WeakSet()
+
+
+def begin() -> Tuple[ConsumedCapacity, Optional[Any]]:
+    """집계 시작 (이미 집계 중이면 같은 객체를 공유하고 토큰은 None)"""
+    usage = _current.get()
+    if usage is not None:
+        return usage, None
+    usage = ConsumedCapacity()
+    return usage, _current.set(usage)
+
+
+def end(token: Optional[Any]) -> None:
+    """begin()에서 받은 토큰으로 집계 종료"""
+    if token is not None:
+        _current.reset(token)
+
+
+def current() -> Optional[ConsumedCapacity]:
+    return _current.get()
+
+
+def _split_units(operation: str, entry: Dict[str, Any]) -> Tuple[float, float]:
+    units = float(entry.get('CapacityUnits', 0) or 0)
+    read = entry.get('ReadCapacityUnits')
+    write = entry.get('WriteCapacityUnits')
+    if read is not None or write is not None:
+        return float(read or 0), float(write or 0)
+    if operation in READ_OPERATIONS:
+        return units, 0.0
+    return 0.0, units
+
+
+def record(operation: str, consumed: Any) -> None:
+    """응답의 ConsumedCapacity (단건은 dict, 배치/트랜잭션은 list) 기록"""
+    entries = consumed if isinstance(consumed, list) else [consumed]
+    usage = _current.get()
+    turn = metrics.current()
+    for index, entry in enumerate(entries):
+        if not entry:
+            continue
+        table = entry.get('TableName', 'unknown')
+        read, write = _split_units(operation, entry)
+        if usage is not None:
+            usage.add(operation, table, read, write, new_call=index == 0)
+        if read:
+            turn.increment('DynamoDBReadCapacity', read)
+        if write:
+            turn.increment('DynamoDBWriteCapacity', write)
+    if usage is not None:
+        # 테이블별 내역은 EMF 속성으로 (턴 종료 시 그 시점 값이 출력됨)
+        turn.set_property('consumedCapacity', usage.by_table)
+
+
+def _inject_parameter(params: Dict[str, Any], model=None, **kwargs) -> None:
+    if model is not None and model.name in READ_OPERATIONS | WRITE_OPERATIONS:
+        params.setdefault('ReturnConsumedCapacity', DYNAMODB_CONFIG['return_consumed_capacity'])
+
+
+def _record_response(parsed: Optional[Dict[str, Any]] = None, model=None, **kwargs) -> None:
+    if not parsed or model is None:
+        return
+    consumed = parsed.get('ConsumedCapacity')
+    if consumed:
+        try:
+            record(model.name, consumed)
+        except Exception as e:
+            # 계측 실패가 요청 처리를 막지 않도록 함
+            logger.debug(f"Failed to record consumed capacity: {str(e)}")
+
+
+def instrument_client(client) -> None:
+    """DynamoDB 클라이언트에 소비 용량 훅 등록 (같은 클라이언트는 한 번만)"""
+    if DYNAMODB_CONFIG['return_consumed_capacity'] == 'NONE' or client in _instrumented:
+        return
+    client.meta.events.register('provide-client-params.dynamodb.*', _inject_parameter)
+    client.meta.events.register('after-call.dynamodb.*', _record_response)
+    _instrumented.add(client)
+
+
+def instrument_resource(resource):
+    """boto3 DynamoDB 리소스의 클라이언트에 훅 등록 후 리소스 반환"""
+    instrument_client(resource.meta.client)
+    return resource
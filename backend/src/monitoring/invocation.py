@@ -0,0 +1,38 @@
+"""
+Lambda 핸들러 호출 단위 계측
+호출마다 DynamoDB 소비 용량을 집계하고, REST 핸들러는 호출 하나를 메트릭 턴으로 기록
+"""
+import functools
+import logging
+from typing import Callable
+
+from . import capacity, metrics
+
+logger = logging.getLogger(__name__)
+
+
+def instrument_handler(name: str, start_turn: bool = True) -> Callable:
+    """
+    핸들러 데코레이터
+    start_turn=False는 핸들러가 직접 턴을 시작하는 경우 (WebSocket 메시지 핸들러)
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            usage, token = capacity.begin()
+            owns_turn = start_turn and metrics.current() is metrics.NULL_METRICS
+            if owns_turn:
+                metrics.start_turn(Handler=name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                if owns_turn:
+                    metrics.end_turn()
+                capacity.end(token)
+                if token is not None and usage.total:
+                    logger.info(
+                        f"{name} consumed capacity: read={usage.read:g} write={usage.write:g} "
+                        f"tables={usage.by_table}"
+                    )
+        return wrapper
+    return decorator
@@ -0,0 +1,231 @@
+"""
+임베디드 메트릭(CloudWatch EMF) 계측
+채팅 턴 단위로 단계별 시간/횟수를 모아 턴 종료 시 EMF 로그 한 줄로 출력
+CLOUDWATCH_CONFIG['metrics_enabled']가 False이면 모든 기록 호출은 no-op
+"""
+import functools
+import json
+import math
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from ..config.aws import CLOUDWATCH_CONFIG
+
+# EMF 메트릭 하나에 담을 수 있는 최대 값 개수
+MAX_VALUES_PER_METRIC = 100
+
+# 턴 내 샘플을 백분위로 요약해 출력할 값
+SUMMARY_PERCENTILES = (50, 99)
+
+
+class Unit:
+    """CloudWatch 메트릭 단위"""
+
+    MILLISECONDS = 'Milliseconds'
+    COUNT = 'Count'
+    COUNT_PER_SECOND = 'Count/Second'
+    NONE = 'None'
+
+
+def _percentile(sorted_values: List[float], percentile: float) -> float:
+    index = max(0, int(math.ceil(percentile / 100 * len(sorted_values))) - 1)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+class TurnMetrics:
+    """채팅 턴 하나의 메트릭 모음"""
+
+    def __init__(self, namespace: str, dimensions: Dict[str, str]):
+        self.namespace = namespace
+        self.dimensions = {k: str(v) for k, v in dimensions.items() if v is not None}
+        self.started = time.time()
+        self._values: Dict[str, List[float]] = {}
+        self._units: Dict[str, str] = {}
+        self._samples: Dict[str, List[float]] = {}
+        self._properties: Dict[str, Any] = {}
+
+    def record(self, name: str, value: float, unit: str = Unit.MILLISECONDS) -> None:
+        """값 기록 (같은 이름으로 여러 번 기록하면 값 목록으로 출력)"""
+        values = self._values.setdefault(name, [])
+        if len(values) < MAX_VALUES_PER_METRIC:
+            values.append(value)
+        self._units[name] = unit
+
+    def increment(self, name: str, value: float = 1) -> None:
+        """카운터 증가 (턴 전체 합계 하나로 출력)"""
+        values = self._values.setdefault(name, [0])
+        values[0] += value
+        self._units[name] = Unit.COUNT
+
+    def sample(self, name: str, value: float) -> None:
+        """턴 종료 시 P50/P99로 요약할 지연 샘플 (밀리초)"""
+        self._samples.setdefault(name, []).append(value)
+
+    def set_property(self, key: str, value: Any) -> None:
+        """검색용 속성 (메트릭이 아닌 로그 필드)"""
+        self._properties[key] = value
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - started) * 1000)
+
+    def to_emf(self) -> Dict[str, Any]:
+        """EMF 문서 생성"""
+        values = dict(self._values)
+        units = dict(self._units)
+        for name, samples in self._samples.items():
+            ordered = sorted(samples)
+            for p in SUMMARY_PERCENTILES:
+                values[f'{name}P{p}'] = [_percentile(ordered, p)]
+                units[f'{name}P{p}'] = Unit.MILLISECONDS
+            values[f'{name}Count'] = [len(samples)]
+            units[f'{name}Count'] = Unit.COUNT
+        values['TurnDuration'] = [(time.time() - self.started) * 1000]
+        units['TurnDuration'] = Unit.MILLISECONDS
+
+        document: Dict[str, Any] = {
+            '_aws': {
+                'Timestamp': int(time.time() * 1000),
+                'CloudWatchMetrics': [{
+                    'Namespace': self.namespace,
+                    'Dimensions': [sorted(self.dimensions)],
+                    'Metrics': [{'Name': name, 'Unit': units[name]} for name in sorted(values)]
+                }]
+            },
+            **self._properties,
+            **self.dimensions
+        }
+        for name, metric_values in values.items():
+            document[name] = metric_values[0] if len(metric_values) == 1 else metric_values
+        return document
+
+    def flush(self) -> None:
+        """EMF 로그 한 줄 출력 (Lambda 표준 출력 → CloudWatch Logs가 메트릭으로 추출)"""
+        sys.stdout.write(json.dumps(self.to_emf(), ensure_ascii=False, default=str) + '\n')
+        sys.stdout.flush()
+
+
+class _NullMetrics:
+    """비활성화/턴 밖에서 사용되는 no-op 구현"""
+
+    def record(self, name: str, value: float, unit: str = Unit.MILLISECONDS) -> None:
+        pass
+
+    def increment(self, name: str, value: float = 1) -> None:
+        pass
+
+    def sample(self, name: str, value: float) -> None:
+        pass
+
+    def set_property(self, key: str, value: Any) -> None:
+        pass
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        yield
+
+    def flush(self) -> None:
+        pass
+
+
+NULL_METRICS = _NullMetrics()
+_current: ContextVar = ContextVar('turn_metrics', default=NULL_METRICS)
+
+
+def start_turn(**dimensions: Any):
+    """채팅 턴 시작 (비활성화 시 no-op 객체 반환)"""
+    if not CLOUDWATCH_CONFIG['metrics_enabled']:
+        return NULL_METRICS
+    turn = TurnMetrics(CLOUDWATCH_CONFIG['namespace'], dimensions)
+    _current.set(turn)
+    return turn
+
+
+def end_turn() -> None:
+    """현재 턴의 메트릭 출력 후 종료"""
+    turn = _current.get()
+    _current.set(NULL_METRICS)
+    try:
+        turn.flush()
+    except Exception:
+        # 계측 실패가 요청 처리를 막지 않도록 함
+        pass
+
+
+def current():
+    """현재 턴 메트릭 (턴 밖이면 no-op)"""
+    return _current.get()
+
+
+def record(name: str, value: float, unit: str = Unit.MILLISECONDS) -> None:
+    _current.get().record(name, value, unit)
+
+
+def increment(name: str, value: float = 1) -> None:
+    _current.get().increment(name, value)
+
+
+def sample(name: str, value: float) -> None:
+    _current.get().sample(name, value)
+
+
+def timer(name: str):
+    return _current.get().timer(name)
+
+
+def timed(name: str) -> Callable:
+    """함수 실행 시간을 name으로 기록하는 데코레이터"""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            metrics = _current.get()
+            if metrics is NULL_METRICS:
+                return func(*args, **kwargs)
+            with metrics.timer(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _wrap_latency(func: Callable, metric: str) -> Callable:
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        metrics = _current.get()
+        if metrics is NULL_METRICS:
+            return func(*args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            metrics.record(metric, elapsed)
+            metrics.record('DynamoDBLatency', elapsed)
+    return wrapper
+
+
+def instrument_repository(name: Optional[str] = None) -> Callable:
+    """
+    리포지토리 클래스의 공개 메서드마다 DynamoDB 호출 지연 기록
+    (메트릭: DynamoDB.<클래스>.<메서드>, 전체 합산 DynamoDBLatency)
+    """
+    def decorator(cls):
+        prefix = name or cls.__name__
+        for attr, value in list(vars(cls).items()):
+            if attr.startswith('_'):
+                continue
+            metric = f'DynamoDB.{prefix}.{attr}'
+            if isinstance(value, staticmethod):
+                setattr(cls, attr, staticmethod(_wrap_latency(value.__func__, metric)))
+            elif isinstance(value, classmethod):
+                setattr(cls, attr, classmethod(_wrap_latency(value.__func__, metric)))
+            elif callable(value):
+                setattr(cls, attr, _wrap_latency(value, metric))
+        return cls
+    return decorator
@@ -0,0 +1,375 @@
+"""
+스팬 기반 트레이싱
+핸들러 → 서비스 → 리포지토리 → Bedrock 호출을 하나의 트레이스로 연결 (contextvars로 전파)
+
+- 루트 스팬 시작 시 sample_rate로 샘플링 결정, 샘플링되지 않아도 느리거나 실패한 요청은 보관
+- 트레이스 종료 시 등록된 내보내기(JSON Lines 파일 / X-Ray 세그먼트 형식)로 출력
+- TRACING_CONFIG['enabled']가 False이면 데코레이터와 스팬은 no-op
+"""
+import functools
+import inspect
+import json
+import logging
+import os
+import random
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from ..config.aws import TRACING_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+def _new_trace_id() -> str:
+    """X-Ray 호환 트레이스 ID (1-<epoch hex>-<96bit hex>)"""
+    return f"1-{int(time.time()):08x}-{random.getrandbits(96):024x}"
+
+
+def _new_span_id() -> str:
+    return f"{random.getrandbits(64):016x}"
+
+
+class Span:
+    """작업 구간 하나"""
+
+    __slots__ = ('trace', 'name', 'span_id', 'parent_id', 'start_time', 'end_time',
+                 'attributes', 'events', 'error')
+
+    def __init__(self, trace: 'Trace', name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace = trace
+        self.name = name
+        self.span_id = _new_span_id()
+        self.parent_id = parent_id
+        self.start_time = time.time()
+        self.end_time: Optional[float] = None
+        self.attributes = attributes
+        self.events: List[Dict[str, Any]] = []
+        self.error: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_time if self.end_time is not None else time.time()
+        return (end - self.start_time) * 1000
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def add_event(self, name: str, **attributes: Any) -> None:
+        self.events.append({'name': name, 'time': time.time(), **attributes})
+
+    def record_error(self, error: BaseException) -> None:
+        self.error = f"{type(error).__name__}: {error}"
+
+    def end(self) -> None:
+        if self.end_time is None:
+            self.end_time = time.time()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'traceId': self.trace.trace_id,
+            'spanId': self.span_id,
+            'parentId': self.parent_id,
+            'name': self.name,
+            'startTime': self.start_time,
+            'endTime': self.end_time,
+            'durationMs': round(self.duration_ms, 3),
+            'attributes': self.attributes,
+            'events': self.events,
+            'error': self.error
+        }
+
+
+class Trace:
+    """루트 스팬부터 시작된 스팬 모음"""
+
+    def __init__(self, sampled: bool, trace_id: Optional[str] = None, parent_id: Optional[str] = None):
+        self.trace_id = trace_id or _new_trace_id()
+        # 외부(Lambda/X-Ray)에서 이어받은 상위 세그먼트 ID
+        self.parent_id = parent_id
+        self.sampled = sampled
+        self.spans: List[Span] = []
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def add(self, span: Span) -> None:
+        with self._lock:
+            if len(self.spans) < TRACING_CONFIG['max_spans_per_trace']:
+                self.spans.append(span)
+            else:
+                self.dropped += 1
+
+
+class JsonLinesExporter:
+    """스팬을 JSON Lines 파일에 추가 (로컬 실행용)"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or TRACING_CONFIG['jsonl_path']
+        self._lock = threading.Lock()
+
+    def export(self, trace: Trace) -> None:
+        lines = [json.dumps(span.to_dict(), ensure_ascii=False, default=str) for span in trace.spans]
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+
+
+class XRayExporter:
+    """
+    X-Ray 세그먼트 문서 형식 내보내기
+    데몬 주소가 있으면 UDP로 전송, 없으면 표준 출력에 한 줄씩 기록
+    Lambda 안에서는 Lambda가 만든 세그먼트의 하위 세그먼트로 기록
+    """
+
+    HEADER = '{"format": "json", "version": 1}\n'
+
+    def __init__(self, daemon_address: Optional[str] = None):
+        address = daemon_address if daemon_address is not None else TRACING_CONFIG['xray_daemon_address']
+        self._address = None
+        if address:
+            host, _, port = address.rpartition(':')
+            self._address = (host or '127.0.0.1', int(port))
+        self._socket = None
+
+    @staticmethod
+    def to_document(span: Span) -> Dict[str, Any]:
+        parent_id = span.parent_id or span.trace.parent_id
+        document = {
+            'name': span.name[:200],
+            'id': span.span_id,
+            'trace_id': span.trace.trace_id,
+            'start_time': span.start_time,
+            'end_time': span.end_time or time.time(),
+            'annotations': {
+                k: v for k, v in span.attributes.items()
+                if isinstance(v, (str, int, float, bool))
+            },
+            'metadata': {'nexus': {'events': span.events}}
+        }
+        if parent_id:
+            document['parent_id'] = parent_id
+            document['type'] = 'subsegment'
+        if span.error:
+            document['fault'] = True
+            document['cause'] = {'exceptions': [{'message': span.error}]}
+        return document
+
+    def export(self, trace: Trace) -> None:
+        for span in trace.spans:
+            payload = json.dumps(self.to_document(span), ensure_ascii=False, default=str)
+            if self._address:
+                if self._socket is None:
+                    self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                self._socket.sendto((self.HEADER + payload).encode('utf-8'), self._address)
+            else:
+                print(payload, flush=True)
+
+
+EXPORTER_FACTORIES: Dict[str, Callable[[], Any]] = {
+    'jsonl': JsonLinesExporter,
+    'xray': XRayExporter
+}
+
+_exporters: Optional[List[Any]] = None
+_current_span: ContextVar = ContextVar('current_span', default=None)
+
+
+def get_exporters() -> List[Any]:
+    """설정된 내보내기 목록 (처음 사용 시 생성)"""
+    global _exporters
+    if _exporters is None:
+        _exporters = []
+        for name in TRACING_CONFIG['exporters']:
+            factory = EXPORTER_FACTORIES.get(name)
+            if factory is None:
+                logger.warning(f"Unknown trace exporter: {name}")
+                continue
+            _exporters.append(factory())
+    return _exporters
+
+
+def register_exporter(exporter: Any) -> None:
+    """내보내기 추가 (export(trace) 메서드를 가진 객체)"""
+    get_exporters().append(exporter)
+
+
+def _lambda_trace_context() -> Dict[str, Optional[str]]:
+    """Lambda가 넘겨준 X-Ray 트레이스 헤더 (Root=...;Parent=...;Sampled=...)"""
+    header = os.environ.get('_X_AMZN_TRACE_ID', '')
+    parts = dict(part.split('=', 1) for part in header.split(';') if '=' in part)
+    return {
+        'trace_id': parts.get('Root'),
+        'parent_id': parts.get('Parent'),
+        'sampled': parts.get('Sampled')
+    }
+
+
+def _should_keep(trace: Trace, root: Span) -> bool:
+    if trace.sampled:
+        return True
+    if root.duration_ms >= TRACING_CONFIG['slow_threshold_ms']:
+        return True
+    return any(span.error for span in trace.spans)
+
+
+def _export(trace: Trace) -> None:
+    for exporter in get_exporters():
+        try:
+            exporter.export(trace)
+        except Exception as e:
+            # 트레이스 내보내기 실패가 요청 처리를 막지 않도록 함
+            logger.warning(f"Trace export failed ({type(exporter).__name__}): {str(e)}")
+
+
+@contextmanager
+def start_trace(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """루트 스팬 (이미 트레이스 안이면 하위 스팬으로 동작)"""
+    if not TRACING_CONFIG['enabled']:
+        yield None
+        return
+    if _current_span.get() is not None:
+        with span(name, **attributes) as child:
+            yield child
+        return
+
+    context = _lambda_trace_context()
+    sampled = context['sampled'] == '1' or random.random() < TRACING_CONFIG['sample_rate']
+    trace = Trace(sampled, context['trace_id'], context['parent_id'])
+    root = Span(trace, name, None, attributes)
+    trace.add(root)
+    token = _current_span.set(root)
+    try:
+        yield root
+    except BaseException as e:
+        root.record_error(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        root.end()
+        if trace.dropped:
+            root.set_attribute('droppedSpans', trace.dropped)
+        if _should_keep(trace, root):
+            _export(trace)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """현재 스팬의 하위 스팬 (트레이스 밖이면 no-op)"""
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+
+    child = Span(parent.trace, name, parent.span_id, attributes)
+    parent.trace.add(child)
+    token = _current_span.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        if not isinstance(e, GeneratorExit):
+            child.record_error(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        child.end()
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def set_attribute(key: str, value: Any) -> None:
+    current = _current_span.get()
+    if current is not None:
+        current.set_attribute(key, value)
+
+
+def add_event(name: str, **attributes: Any) -> None:
+    current = _current_span.get()
+    if current is not None:
+        current.add_event(name, **attributes)
+
+
+def _trace_generator(func: Callable, name: str) -> Callable:
+    """제너레이터 함수용 - 소비가 끝날 때까지를 한 스팬으로 기록"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        parent = _current_span.get()
+        if parent is None:
+            return (yield from func(*args, **kwargs))
+
+        child = Span(parent.trace, name, parent.span_id, {})
+        parent.trace.add(child)
+        generator = func(*args, **kwargs)
+        try:
+            while True:
+                # 재개될 때마다 이 스팬을 현재 스팬으로 설정 (호출자 쪽에는 노출하지 않음)
+                token = _current_span.set(child)
+                try:
+                    value = next(generator)
+                except StopIteration as stop:
+                    return stop.value
+                finally:
+                    _current_span.reset(token)
+                yield value
+        except GeneratorExit:
+            raise
+        except BaseException as e:
+            child.record_error(e)
+            raise
+        finally:
+            # 소비자가 중간에 닫으면 내부 제너레이터도 닫아 자원(Bedrock 스트림 등) 정리
+            generator.close()
+            child.end()
+    return wrapper
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """함수/메서드 실행을 스팬으로 기록하는 데코레이터"""
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+        if inspect.isgeneratorfunction(func):
+            return _trace_generator(func, span_name)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                return func(*args, **kwargs)
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def traced_root(name: str) -> Callable:
+    """Lambda 핸들러용 - 호출 하나를 루트 트레이스로 기록"""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not TRACING_CONFIG['enabled']:
+                return func(*args, **kwargs)
+            with start_trace(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def trace_class(prefix: Optional[str] = None) -> Callable:
+    """서비스/리포지토리 클래스의 공개 메서드를 모두 스팬으로 기록하는 클래스 데코레이터"""
+    def decorator(cls):
+        class_name = prefix or cls.__name__
+        for attr, value in list(vars(cls).items()):
+            if attr.startswith('_'):
+                continue
+            span_name = f'{class_name}.{attr}'
+            if isinstance(value, staticmethod):
+                setattr(cls, attr, staticmethod(traced(span_name)(value.__func__)))
+            elif isinstance(value, classmethod):
+                setattr(cls, attr, classmethod(traced(span_name)(value.__func__)))
+            elif callable(value):
+                setattr(cls, attr, traced(span_name)(value))
+        return cls
+    return decorator
@@ -0,0 +1,202 @@
+"""
+DynamoDB 대량 쓰기
+- 삭제: BatchWriteItem(요청당 25개)을 스레드 풀에서 동시 호출, UnprocessedItems는 지수 백오프로 재시도
+- 갱신: BatchWriteItem은 UpdateItem을 지원하지 않아 아이템별 UpdateItem을 같은 풀에서 동시 호출
+- 진행 상황: 묶음/아이템이 끝날 때마다 progress 콜백에 BulkResult 전달
+"""
+import contextvars
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from botocore.exceptions import ClientError
+
+from ..config.database import BULK_OPERATIONS_CONFIG
+from ..monitoring import metrics
+from .dynamodb_codec import FastTable, serialize_item
+
+logger = logging.getLogger(__name__)
+
+# BatchWriteItem 한 번에 보낼 수 있는 최대 요청 수
+BATCH_WRITE_LIMIT = 25
+
+ProgressCallback = Callable[['BulkResult'], None]
+
+
+class BulkResult:
+    """대량 작업 결과 (워커 스레드에서 갱신, 진행 중에는 progress 콜백으로 전달)"""
+
+    def __init__(self, action: str, requested: int):
+        self.action = action
+        self.requested = requested
+        self.succeeded: List[str] = []
+        self.failed: List[Dict[str, str]] = []
+        # UnprocessedItems 재전송 횟수
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    @property
+    def processed(self) -> int:
+        return len(self.succeeded) + len(self.failed)
+
+    def add(self, succeeded: Sequence[str] = (), failed: Sequence[str] = (), reason: str = '') -> None:
+        with self._lock:
+            self.succeeded.extend(succeeded)
+            self.failed.extend({'id': item_id, 'reason': reason} for item_id in failed)
+
+    def add_retry(self) -> None:
+        with self._lock:
+            self.retries += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'action': self.action,
+            'requested': self.requested,
+            'processed': self.processed,
+            'succeeded': list(self.succeeded),
+            'failed': list(self.failed),
+            'retries': self.retries
+        }
+
+
+def _batch_client(table):
+    """(저수준 클라이언트, 테이블 이름, 키 변환 함수)"""
+    if isinstance(table, FastTable):
+        return table.client, table.name, serialize_item
+    # boto3 리소스 Table의 클라이언트에는 리소스의 직렬화 훅이 걸려 있어 파이썬 값을 그대로 받음
+    return table.meta.client, table.name, lambda key: key
+
+
+def _key_id(key: Dict[str, Any], key_name: str) -> str:
+    value = key[key_name]
+    # 저수준 응답의 UnprocessedItems 키는 {'S': ...} 형식
+    return value['S'] if isinstance(value, dict) else value
+
+
+def _backoff(attempt: int) -> float:
+    config = BULK_OPERATIONS_CONFIG
+    delay = min(config['backoff_max_seconds'], config['backoff_base_seconds'] * (2 ** attempt))
+    return random.uniform(delay / 2, delay)
+
+
+def _client_error_code(error: ClientError) -> str:
+    return error.response.get('Error', {}).get('Code', 'ClientError')
+
+
+def _run(tasks: Sequence[Any], worker: Callable[[Any], None]) -> None:
+    """tasks를 스레드 풀에서 실행 (메트릭/소비 용량 컨텍스트는 워커에도 전달)"""
+    workers = max(1, min(BULK_OPERATIONS_CONFIG['max_workers'], len(tasks)))
+    if workers == 1:
+        for task in tasks:
+            worker(task)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(contextvars.copy_context().run, worker, task) for task in tasks]
+        for future in futures:
+            future.result()
+
+
+def _finish(result: BulkResult, started: float) -> BulkResult:
+    elapsed = (time.perf_counter() - started) * 1000
+    metrics.record(f'Bulk.{result.action}.Latency', elapsed)
+    metrics.record(f'Bulk.{result.action}.Succeeded', len(result.succeeded), metrics.Unit.COUNT)
+    metrics.record(f'Bulk.{result.action}.Failed', len(result.failed), metrics.Unit.COUNT)
+    metrics.record(f'Bulk.{result.action}.Retries', result.retries, metrics.Unit.COUNT)
+    logger.info(
+        f"Bulk {result.action} finished: {len(result.succeeded)}/{result.requested} succeeded, "
+        f"{len(result.failed)} failed, {result.retries} retries ({elapsed:.0f}ms)"
+    )
+    return result
+
+
+def batch_delete(
+    table,
+    key_name: str,
+    ids: Sequence[str],
+    progress: Optional[ProgressCallback] = None,
+    action: str = 'delete'
+) -> BulkResult:
+    """
+    단일 파티션 키 테이블의 아이템 일괄 삭제
+    25개씩 묶은 BatchWriteItem을 동시에 보내고, 재시도를 다 써도 남은 항목은 'unprocessed'로 실패 처리
+    """
+    client, table_name, encode_key = _batch_client(table)
+    ids = list(dict.fromkeys(ids))
+    result = BulkResult(action, len(ids))
+    max_attempts = BULK_OPERATIONS_CONFIG['max_attempts']
+    started = time.perf_counter()
+
+    def write_chunk(chunk: List[str]) -> None:
+        pending = [{'DeleteRequest': {'Key': encode_key({key_name: item_id})}} for item_id in chunk]
+        remaining_ids = chunk
+        attempt = 0
+        while True:
+            try:
+                response = client.batch_write_item(RequestItems={table_name: pending})
+            except ClientError as e:
+                # 묶음 전체 실패 (SDK 재시도 후에도 스로틀링, 검증 오류 등)
+                logger.error(f"Bulk {action} chunk failed: {e}")
+                result.add(failed=remaining_ids, reason=_client_error_code(e))
+                break
+
+            unprocessed = (response.get('UnprocessedItems') or {}).get(table_name) or []
+            unprocessed_ids = {_key_id(request['DeleteRequest']['Key'], key_name) for request in unprocessed}
+            result.add(succeeded=[item_id for item_id in remaining_ids if item_id not in unprocessed_ids])
+            if not unprocessed:
+                break
+
+            attempt += 1
+            remaining_ids = [item_id for item_id in remaining_ids if item_id in unprocessed_ids]
+            if attempt >= max_attempts:
+                logger.warning(f"Bulk {action}: {len(remaining_ids)} items still unprocessed after {attempt} attempts")
+                result.add(failed=remaining_ids, reason='unprocessed')
+                break
+            result.add_retry()
+            time.sleep(_backoff(attempt))
+            pending = unprocessed
+
+        logger.debug(f"Bulk {action} progress: {result.processed}/{result.requested}")
+        if progress:
+            progress(result)
+
+    chunks = [ids[i:i + BATCH_WRITE_LIMIT] for i in range(0, len(ids), BATCH_WRITE_LIMIT)]
+    _run(chunks, write_chunk)
+    return _finish(result, started)
+
+
+def batch_update(
+    table,
+    key_name: str,
+    ids: Sequence[str],
+    build_update: Callable[[str], Dict[str, Any]],
+    action: str,
+    progress: Optional[ProgressCallback] = None
+) -> BulkResult:
+    """
+    아이템별 UpdateItem 동시 호출
+    build_update(id)는 UpdateExpression 등 update_item 인자를 반환
+    (ConditionExpression을 지정하지 않으면 없는 아이템을 새로 만들지 않도록 attribute_exists 조건 추가)
+    """
+    ids = list(dict.fromkeys(ids))
+    result = BulkResult(action, len(ids))
+    started = time.perf_counter()
+
+    def update_one(item_id: str) -> None:
+        params = build_update(item_id)
+        params.setdefault('ConditionExpression', f'attribute_exists({key_name})')
+        try:
+            table.update_item(Key={key_name: item_id}, **params)
+            result.add(succeeded=[item_id])
+        except ClientError as e:
+            code = _client_error_code(e)
+            if code != 'ConditionalCheckFailedException':
+                logger.error(f"Bulk {action} failed for {item_id}: {e}")
+            result.add(failed=[item_id], reason='not_found' if code == 'ConditionalCheckFailedException' else code)
+        if progress:
+            progress(result)
+
+    _run(ids, update_one)
+    return _finish(result, started)
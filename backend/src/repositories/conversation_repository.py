@@ -2,23 +2,27 @@
 대화(Conversation) 리포지토리
 DynamoDB와의 모든 상호작용을 캡슐화
 """
-import boto3
-from typing import List, Optional, Dict, Any
-from datetime import datetime
+from typing import List, Optional, Dict, Any, Tuple
+from datetime import datetime, timedelta
 import uuid
 import logging
 
-from ..models import Conversation, Message
+from ..models import Conversation, Message, MessageList, utc_timestamp
+from ..models.conversation import UTC_TIMESTAMP_FORMAT
+from ..monitoring import instrument_repository, trace_class
+from .batch_operations import BulkResult, ProgressCallback, batch_delete, batch_update
+from .dynamodb_codec import open_table
 
 logger = logging.getLogger(__name__)
 
 
+@trace_class()
+@instrument_repository()
 class ConversationRepository:
     """대화 데이터 접근 계층"""
     
-    def __init__(self, table_name: str = 'nexus-conversations', region: str = 'us-east-1'):
-        self.dynamodb = boto3.resource('dynamodb', region_name=region)
-        self.table = self.dynamodb.Table(table_name)
+    def __init__(self, table_name: str = 'nexus-conversations', region: str = 'us-east-1', fast_codec: Optional[bool] = None):
+        self.table = open_table(table_name, region, fast=fast_codec)
         logger.info(f"ConversationRepository initialized with table: {table_name}")
     
     def save(self, conversation: Conversation) -> Conversation:
@@ -29,7 +33,7 @@ class ConversationRepository:
                 conversation.conversation_id = str(uuid.uuid4())
             
             # 타임스탬프 업데이트
-            now = datetime.now().isoformat()
+            now = utc_timestamp()
             if not conversation.created_at:
                 conversation.created_at = now
             conversation.updated_at = now
@@ -86,14 +90,13 @@ class ConversationRepository:
     def update_messages(self, conversation_id: str, messages: List[Message]) -> bool:
         """대화의 메시지 업데이트"""
         try:
+            # 대용량 본문은 압축 저장, 조회 후 건드리지 않은 메시지는 저장된 맵 그대로
+            if not isinstance(messages, MessageList):
+                messages = MessageList(messages)
+            now = utc_timestamp()
             messages_data = [
-                {
-                    'role': msg.role,
-                    'content': msg.content,
-                    'timestamp': msg.timestamp or datetime.now().isoformat(),
-                    'metadata': msg.metadata
-                }
-                for msg in messages
+                data if data.get('timestamp') else {**data, 'timestamp': now}
+                for data in messages.to_dicts()
             ]
             
             self.table.update_item(
@@ -101,7 +104,7 @@ class ConversationRepository:
                 UpdateExpression='SET messages = :messages, updatedAt = :updatedAt',
                 ExpressionAttributeValues={
                     ':messages': messages_data,
-                    ':updatedAt': datetime.now().isoformat()
+                    ':updatedAt': utc_timestamp()
                 }
             )
             
@@ -120,7 +123,7 @@ class ConversationRepository:
                 UpdateExpression='SET title = :title, updatedAt = :updatedAt',
                 ExpressionAttributeValues={
                     ':title': title,
-                    ':updatedAt': datetime.now().isoformat()
+                    ':updatedAt': utc_timestamp()
                 }
             )
             
@@ -148,8 +151,7 @@ class ConversationRepository:
     def find_recent(self, user_id: str, engine_type: Optional[str] = None, days: int = 30) -> List[Conversation]:
         """최근 대화 조회"""
         try:
-            from datetime import timedelta
-            cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
+            cutoff_date = (datetime.utcnow() - timedelta(days=days)).strftime(UTC_TIMESTAMP_FORMAT)
             
             filter_expression = 'updatedAt > :cutoff'
             expression_values = {
@@ -177,4 +179,91 @@ class ConversationRepository:
             
         except Exception as e:
             logger.error(f"Error finding recent conversations: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+    
+    def find_ids_by_user(
+        self,
+        user_id: str,
+        limit: Optional[int] = None,
+        start_key: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[str], Optional[Dict[str, Any]]]:
+        """
+        사용자별 대화 ID 조회 (userId-index, 키만 프로젝션 - 메시지는 읽지 않음)
+        반환: (ID 목록, 이어서 조회할 LastEvaluatedKey - 끝까지 읽었으면 None)
+        """
+        try:
+            ids: List[str] = []
+            last_key = start_key
+            while True:
+                params = {
+                    'IndexName': 'userId-index',
+                    'KeyConditionExpression': 'userId = :userId',
+                    'ExpressionAttributeValues': {':userId': user_id},
+                    'ProjectionExpression': 'conversationId'
+                }
+                if limit is not None:
+                    params['Limit'] = limit - len(ids)
+                if last_key:
+                    params['ExclusiveStartKey'] = last_key
+                
+                response = self.table.query(**params)
+                ids.extend(item['conversationId'] for item in response.get('Items', []))
+                last_key = response.get('LastEvaluatedKey')
+                
+                if not last_key or (limit is not None and len(ids) >= limit):
+                    return ids, last_key
+            
+        except Exception as e:
+            logger.error(f"Error finding conversation ids by user: {str(e)}")
+            raise
+    
+    def batch_delete(self, conversation_ids: List[str], progress: Optional[ProgressCallback] = None) -> BulkResult:
+        """대화 일괄 삭제 (BatchWriteItem 동시 호출, 미처리 항목 재시도)"""
+        try:
+            return batch_delete(self.table, 'conversationId', conversation_ids, progress)
+        except Exception as e:
+            logger.error(f"Error deleting conversations in bulk: {str(e)}")
+            raise
+    
+    def batch_update_archived(
+        self,
+        conversation_ids: List[str],
+        archived: bool = True,
+        progress: Optional[ProgressCallback] = None
+    ) -> BulkResult:
+        """대화 일괄 보관/보관 해제"""
+        try:
+            now = utc_timestamp()
+            return batch_update(
+                self.table,
+                'conversationId',
+                conversation_ids,
+                lambda conversation_id: {
+                    'UpdateExpression': 'SET archived = :archived, updatedAt = :updatedAt',
+                    'ExpressionAttributeValues': {':archived': archived, ':updatedAt': now}
+                },
+                'archive' if archived else 'unarchive',
+                progress
+            )
+        except Exception as e:
+            logger.error(f"Error archiving conversations in bulk: {str(e)}")
+            raise
+    
+    def batch_update_titles(self, titles: Dict[str, str], progress: Optional[ProgressCallback] = None) -> BulkResult:
+        """대화 제목 일괄 변경 ({conversationId: title})"""
+        try:
+            now = utc_timestamp()
+            return batch_update(
+                self.table,
+                'conversationId',
+                list(titles),
+                lambda conversation_id: {
+                    'UpdateExpression': 'SET title = :title, updatedAt = :updatedAt',
+                    'ExpressionAttributeValues': {':title': titles[conversation_id], ':updatedAt': now}
+                },
+                'retitle',
+                progress
+            )
+        except Exception as e:
+            logger.error(f"Error updating titles in bulk: {str(e)}")
+            raise
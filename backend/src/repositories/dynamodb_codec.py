@@ -0,0 +1,207 @@
+"""
+DynamoDB 저수준 코덱
+boto3 리소스(Table)의 TypeSerializer/TypeDeserializer를 거치지 않고 저수준 클라이언트 응답을
+바로 파이썬 값으로 변환 (숫자는 int/float - Decimal이 필요한 비용 필드만 지정해서 유지)
+"""
+import logging
+import math
+from decimal import Decimal
+from typing import Any, Dict, FrozenSet, Iterable, Optional
+
+import boto3
+from boto3.dynamodb.conditions import ConditionBase, ConditionExpressionBuilder
+
+from ..config.database import DYNAMODB_CONFIG
+from ..monitoring import instrument_client, instrument_resource
+
+logger = logging.getLogger(__name__)
+
+
+def _number(text: str) -> Any:
+    if '.' in text or 'e' in text or 'E' in text:
+        return float(text)
+    return int(text)
+
+
+def deserialize(value: Dict[str, Any], exact_fields: FrozenSet[str] = frozenset()) -> Any:
+    """DynamoDB 속성 값({'S': ...}, {'N': ...} 등) -> 파이썬 값"""
+    (tag, data), = value.items()
+    if tag == 'S':
+        return data
+    if tag == 'N':
+        return _number(data)
+    if tag == 'M':
+        return deserialize_item(data, exact_fields)
+    if tag == 'L':
+        return [deserialize(v, exact_fields) for v in data]
+    if tag == 'BOOL':
+        return data
+    if tag == 'NULL':
+        return None
+    if tag == 'B':
+        return bytes(data)
+    if tag == 'SS':
+        return set(data)
+    if tag == 'NS':
+        return {_number(n) for n in data}
+    if tag == 'BS':
+        return {bytes(b) for b in data}
+    raise TypeError(f"Unknown DynamoDB type: {tag}")
+
+
+def deserialize_item(item: Dict[str, Any], exact_fields: FrozenSet[str] = frozenset()) -> Dict[str, Any]:
+    """아이템(속성 맵) 변환 - exact_fields의 숫자는 Decimal로 유지"""
+    result = {}
+    for key, value in item.items():
+        if key in exact_fields and 'N' in value:
+            result[key] = Decimal(value['N'])
+        else:
+            result[key] = deserialize(value, exact_fields)
+    return result
+
+
+def _number_text(value: Any) -> str:
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            raise TypeError(f"DynamoDB does not support {value!r}")
+        return repr(value)
+    if isinstance(value, Decimal) and not value.is_finite():
+        raise TypeError(f"DynamoDB does not support {value!r}")
+    return str(value)
+
+
+def serialize(value: Any) -> Dict[str, Any]:
+    """파이썬 값 -> DynamoDB 속성 값 (float도 허용)"""
+    if value is None:
+        return {'NULL': True}
+    if isinstance(value, bool):
+        return {'BOOL': value}
+    if isinstance(value, str):
+        return {'S': value}
+    if isinstance(value, (int, float, Decimal)):
+        return {'N': _number_text(value)}
+    if isinstance(value, dict):
+        return {'M': serialize_item(value)}
+    if isinstance(value, (list, tuple)):
+        return {'L': [serialize(v) for v in value]}
+    if isinstance(value, (bytes, bytearray)):
+        return {'B': bytes(value)}
+    if hasattr(value, 'value') and isinstance(value.value, (bytes, bytearray)):
+        # boto3.dynamodb.types.Binary
+        return {'B': bytes(value.value)}
+    if isinstance(value, (set, frozenset)) and value:
+        if all(isinstance(v, str) for v in value):
+            return {'SS': list(value)}
+        if all(isinstance(v, (int, float, Decimal)) and not isinstance(v, bool) for v in value):
+            return {'NS': [_number_text(v) for v in value]}
+        if all(isinstance(v, (bytes, bytearray)) for v in value):
+            return {'BS': [bytes(v) for v in value]}
+    raise TypeError(f"Unsupported type for DynamoDB: {type(value).__name__}")
+
+
+def serialize_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: serialize(value) for key, value in item.items()}
+
+
+class _BatchWriter:
+    """boto3 BatchWriter (미처리 항목 재시도 포함) 앞에서 아이템/키를 직렬화"""
+
+    def __init__(self, writer):
+        self._writer = writer
+
+    def put_item(self, Item: Dict[str, Any]) -> None:
+        self._writer.put_item(Item=serialize_item(Item))
+
+    def delete_item(self, Key: Dict[str, Any]) -> None:
+        self._writer.delete_item(Key=serialize_item(Key))
+
+    def __enter__(self):
+        self._writer.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        return self._writer.__exit__(exc_type, exc_value, tb)
+
+
+class FastTable:
+    """
+    boto3 Table과 같은 호출 형태의 저수준 클라이언트 래퍼
+    (get_item/put_item/update_item/delete_item/query/scan/batch_writer)
+    """
+
+    def __init__(self, client, table_name: str, exact_fields: Iterable[str] = ()):
+        self.client = client
+        self.name = table_name
+        self.exact_fields = frozenset(exact_fields)
+
+    def _request(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        params['TableName'] = self.name
+        for key in ('Key', 'Item', 'ExclusiveStartKey'):
+            if key in params:
+                params[key] = serialize_item(params[key])
+
+        names = dict(params.get('ExpressionAttributeNames') or {})
+        values = dict(params.get('ExpressionAttributeValues') or {})
+        builder = None
+        for key in ('KeyConditionExpression', 'FilterExpression', 'ConditionExpression'):
+            condition = params.get(key)
+            if isinstance(condition, ConditionBase):
+                builder = builder or ConditionExpressionBuilder()
+                built = builder.build_expression(condition, is_key_condition=key == 'KeyConditionExpression')
+                params[key] = built.condition_expression
+                names.update(built.attribute_name_placeholders)
+                values.update(built.attribute_value_placeholders)
+        if names:
+            params['ExpressionAttributeNames'] = names
+        if values:
+            params['ExpressionAttributeValues'] = serialize_item(values)
+        return params
+
+    def _response(self, response: Dict[str, Any]) -> Dict[str, Any]:
+        exact = self.exact_fields
+        if 'Item' in response:
+            response['Item'] = deserialize_item(response['Item'], exact)
+        if 'Attributes' in response:
+            response['Attributes'] = deserialize_item(response['Attributes'], exact)
+        if 'Items' in response:
+            response['Items'] = [deserialize_item(item, exact) for item in response['Items']]
+        if 'LastEvaluatedKey' in response:
+            response['LastEvaluatedKey'] = deserialize_item(response['LastEvaluatedKey'])
+        return response
+
+    def get_item(self, **kwargs) -> Dict[str, Any]:
+        return self._response(self.client.get_item(**self._request(kwargs)))
+
+    def put_item(self, **kwargs) -> Dict[str, Any]:
+        return self._response(self.client.put_item(**self._request(kwargs)))
+
+    def update_item(self, **kwargs) -> Dict[str, Any]:
+        return self._response(self.client.update_item(**self._request(kwargs)))
+
+    def delete_item(self, **kwargs) -> Dict[str, Any]:
+        return self._response(self.client.delete_item(**self._request(kwargs)))
+
+    def query(self, **kwargs) -> Dict[str, Any]:
+        return self._response(self.client.query(**self._request(kwargs)))
+
+    def scan(self, **kwargs) -> Dict[str, Any]:
+        return self._response(self.client.scan(**self._request(kwargs)))
+
+    def batch_writer(self, overwrite_by_pkeys: Optional[list] = None) -> _BatchWriter:
+        from boto3.dynamodb.table import BatchWriter
+
+        return _BatchWriter(BatchWriter(self.name, self.client, overwrite_by_pkeys=overwrite_by_pkeys))
+
+
+def open_table(table_name: str, region: str, exact_fields: Iterable[str] = (), fast: Optional[bool] = None):
+    """
+    리포지토리용 테이블 객체
+    fast(기본 DYNAMODB_CONFIG['fast_codec'])면 FastTable, 아니면 boto3 리소스 Table
+    """
+    if fast is None:
+        fast = DYNAMODB_CONFIG['fast_codec']
+    if fast:
+        client = boto3.client('dynamodb', region_name=region)
+        instrument_client(client)
+        return FastTable(client, table_name, exact_fields)
+    return instrument_resource(boto3.resource('dynamodb', region_name=region)).Table(table_name)
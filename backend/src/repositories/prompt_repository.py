@@ -2,23 +2,25 @@
 프롬프트(Prompt) 리포지토리
 DynamoDB와의 모든 상호작용을 캡슐화
 """
-import boto3
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 import uuid
 import logging
 
 from ..models import Prompt, PromptConfig, PromptFile
+from ..monitoring import instrument_repository, trace_class
+from .dynamodb_codec import open_table
 
 logger = logging.getLogger(__name__)
 
 
+@trace_class()
+@instrument_repository()
 class PromptRepository:
     """프롬프트 데이터 접근 계층"""
     
-    def __init__(self, table_name: str = 'nexus-prompts', region: str = 'us-east-1'):
-        self.dynamodb = boto3.resource('dynamodb', region_name=region)
-        self.table = self.dynamodb.Table(table_name)
+    def __init__(self, table_name: str = 'nexus-prompts', region: str = 'us-east-1', fast_codec: Optional[bool] = None):
+        self.table = open_table(table_name, region, fast=fast_codec)
         logger.info(f"PromptRepository initialized with table: {table_name}")
     
     def save(self, prompt: Prompt) -> Prompt:
@@ -2,23 +2,28 @@
 사용량(Usage) 리포지토리
 DynamoDB와의 모든 상호작용을 캡슐화
 """
-import boto3
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from decimal import Decimal
 import logging
 
 from ..models import Usage, UsageSummary
+from ..monitoring import instrument_repository, trace_class
+from .dynamodb_codec import open_table
 
 logger = logging.getLogger(__name__)
 
 
+@trace_class()
+@instrument_repository()
 class UsageRepository:
     """사용량 데이터 접근 계층"""
     
-    def __init__(self, table_name: str = 'nexus-usage', region: str = 'us-east-1'):
-        self.dynamodb = boto3.resource('dynamodb', region_name=region)
-        self.table = self.dynamodb.Table(table_name)
+    # 합산 시 오차가 없어야 하는 비용 필드 (코덱 사용 시에도 Decimal 유지)
+    EXACT_FIELDS = ('estimatedCost', 'totalCost', 'cost')
+    
+    def __init__(self, table_name: str = 'nexus-usage', region: str = 'us-east-1', fast_codec: Optional[bool] = None):
+        self.table = open_table(table_name, region, exact_fields=self.EXACT_FIELDS, fast=fast_codec)
         logger.info(f"UsageRepository initialized with table: {table_name}")
     
     def save(self, usage: Usage) -> Usage:
@@ -2,11 +2,13 @@
 서비스 패키지
 비즈니스 로직 계층
 """
+from .conversation_bulk_service import ConversationBulkService
 from .conversation_service import ConversationService
 from .prompt_service import PromptService
 from .usage_service import UsageService
 
 __all__ = [
+    'ConversationBulkService',
     'ConversationService',
     'PromptService', 
     'UsageService'
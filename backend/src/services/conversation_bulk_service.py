@@ -0,0 +1,127 @@
+"""
+대화 대량 작업 비즈니스 로직
+일괄 삭제/보관/제목 변경과 사용자 대화 전체 삭제 (소유권 확인 후 BatchWriteItem/UpdateItem 동시 호출)
+"""
+from typing import List, Optional, Dict, Any
+import base64
+import json
+import logging
+
+from ..config.database import BULK_OPERATIONS_CONFIG
+from ..repositories import ConversationRepository
+from ..repositories.batch_operations import BulkResult, ProgressCallback
+from ..monitoring import trace_class
+
+logger = logging.getLogger(__name__)
+
+
+@trace_class()
+class ConversationBulkService:
+    """대화 대량 작업"""
+    
+    def __init__(self, repository: Optional[ConversationRepository] = None):
+        self.repository = repository or ConversationRepository()
+    
+    def _owned_ids(self, user_id: str, conversation_ids: List[str]) -> List[str]:
+        """요청 ID 검증 - 개수 제한, 다른 사용자의 대화 제외 (userId-index 키 조회)"""
+        conversation_ids = list(dict.fromkeys(conversation_ids))
+        if not conversation_ids:
+            raise ValueError("conversationIds is required")
+        if len(conversation_ids) > BULK_OPERATIONS_CONFIG['max_items']:
+            raise ValueError(f"Too many conversations (max {BULK_OPERATIONS_CONFIG['max_items']})")
+        owned, _ = self.repository.find_ids_by_user(user_id)
+        owned = set(owned)
+        return [conversation_id for conversation_id in conversation_ids if conversation_id in owned]
+    
+    @staticmethod
+    def _with_not_found(result: BulkResult, conversation_ids: List[str], owned_ids: List[str]) -> BulkResult:
+        # 없거나 다른 사용자의 대화는 쓰기 없이 실패로 기록
+        owned = set(owned_ids)
+        missing = [conversation_id for conversation_id in dict.fromkeys(conversation_ids) if conversation_id not in owned]
+        result.requested += len(missing)
+        result.add(failed=missing, reason='not_found')
+        return result
+    
+    def bulk_delete(
+        self,
+        user_id: str,
+        conversation_ids: List[str],
+        progress: Optional[ProgressCallback] = None
+    ) -> BulkResult:
+        """사용자 대화 일괄 삭제"""
+        try:
+            owned_ids = self._owned_ids(user_id, conversation_ids)
+            result = self.repository.batch_delete(owned_ids, progress)
+            return self._with_not_found(result, conversation_ids, owned_ids)
+        except Exception as e:
+            logger.error(f"Error deleting conversations in bulk: {str(e)}")
+            raise
+    
+    def bulk_archive(
+        self,
+        user_id: str,
+        conversation_ids: List[str],
+        archived: bool = True,
+        progress: Optional[ProgressCallback] = None
+    ) -> BulkResult:
+        """사용자 대화 일괄 보관/보관 해제"""
+        try:
+            owned_ids = self._owned_ids(user_id, conversation_ids)
+            result = self.repository.batch_update_archived(owned_ids, archived, progress)
+            return self._with_not_found(result, conversation_ids, owned_ids)
+        except Exception as e:
+            logger.error(f"Error archiving conversations in bulk: {str(e)}")
+            raise
+    
+    def bulk_update_titles(
+        self,
+        user_id: str,
+        titles: Dict[str, str],
+        progress: Optional[ProgressCallback] = None
+    ) -> BulkResult:
+        """사용자 대화 제목 일괄 변경 ({conversationId: title})"""
+        try:
+            if any(not isinstance(title, str) or not title.strip() for title in titles.values()):
+                raise ValueError("titles must be non-empty strings")
+            owned_ids = self._owned_ids(user_id, list(titles))
+            result = self.repository.batch_update_titles(
+                {conversation_id: titles[conversation_id].strip() for conversation_id in owned_ids},
+                progress
+            )
+            return self._with_not_found(result, list(titles), owned_ids)
+        except Exception as e:
+            logger.error(f"Error updating titles in bulk: {str(e)}")
+            raise
+    
+    def delete_all_for_user(
+        self,
+        user_id: str,
+        next_token: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, Any]:
+        """
+        사용자 대화 전체 삭제 (userId-index 키 조회 -> 일괄 삭제)
+        호출 한 번에 최대 BULK_OPERATIONS_CONFIG['max_items']개, 남았으면 nextToken으로 이어서 호출
+        """
+        try:
+            start_key = json.loads(base64.urlsafe_b64decode(next_token)) if next_token else None
+            if start_key and start_key.get('userId') != user_id:
+                raise ValueError("Invalid nextToken")
+            
+            conversation_ids, last_key = self.repository.find_ids_by_user(
+                user_id, BULK_OPERATIONS_CONFIG['max_items'], start_key
+            )
+            result = self.repository.batch_delete(conversation_ids, progress).to_dict()
+            
+            # 삭제된 아이템 뒤에서 이어서 조회해도 인덱스 키 순서는 유지됨
+            result['nextToken'] = (
+                base64.urlsafe_b64encode(json.dumps(last_key).encode('utf-8')).decode('ascii')
+                if last_key else None
+            )
+            result['hasMore'] = last_key is not None
+            logger.info(f"Deleted {len(result['succeeded'])} conversations for user {user_id} (hasMore={result['hasMore']})")
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error deleting all conversations: {str(e)}")
+            raise
@@ -5,12 +5,14 @@ from typing import List, Optional, Dict, Any
 import logging
 from datetime import datetime
 
-from ..models import Conversation, Message
+from ..models import Conversation, Message, utc_timestamp
 from ..repositories import ConversationRepository
+from ..monitoring import trace_class
 
 logger = logging.getLogger(__name__)
 
 
+@trace_class()
 class ConversationService:
     """대화 관련 비즈니스 로직"""
     
@@ -39,7 +41,7 @@ class ConversationService:
                 message = Message(
                     role='user',
                     content=initial_message,
-                    timestamp=datetime.now().isoformat()
+                    timestamp=utc_timestamp()
                 )
                 conversation.messages.append(message)
             
@@ -91,7 +93,7 @@ class ConversationService:
             message = Message(
                 role=role,
                 content=content,
-                timestamp=datetime.now().isoformat(),
+                timestamp=utc_timestamp(),
                 metadata=metadata or {}
             )
             
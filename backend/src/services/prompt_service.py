@@ -6,10 +6,12 @@ import logging
 
 from ..models import Prompt, PromptConfig, PromptFile
 from ..repositories import PromptRepository
+from ..monitoring import trace_class
 
 logger = logging.getLogger(__name__)
 
 
+@trace_class()
 class PromptService:
     """프롬프트 관련 비즈니스 로직"""
     
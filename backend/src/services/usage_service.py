@@ -8,10 +8,12 @@ import logging
 
 from ..models import Usage, UsageSummary
 from ..repositories import UsageRepository
+from ..monitoring import trace_class
 
 logger = logging.getLogger(__name__)
 
 
+@trace_class()
 class UsageService:
     """사용량 관련 비즈니스 로직"""
     
@@ -1,33 +1,158 @@
 """
 Logging Utilities
 통합 로깅 설정 및 헬퍼 함수
+- LAMBDA_CONFIG['log_level'] 기본 레벨, JSON 한 줄 출력 (LOGGING_CONFIG['format'])
+- 필드/메시지 길이 제한, 본문 필드 마스킹, 전체 이벤트 로그 샘플링
+- lazy(): 레벨이 꺼져 있으면 평가하지 않는 로그 인자
 """
-import logging
 import json
-from typing import Any, Dict
+import logging
+import random
+import time
+from typing import Any, Callable, Dict, Optional
+
+from src.config.aws import LAMBDA_CONFIG, LOGGING_CONFIG
+
+# LogRecord 기본 속성 (extra 필드와 구분)
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+def truncate(value: Any, max_chars: Optional[int] = None, max_items: Optional[int] = None, _depth: int = 0) -> Any:
+    """문자열/목록/딕셔너리를 로그에 남길 크기로 축소"""
+    max_chars = max_chars if max_chars is not None else LOGGING_CONFIG['max_field_chars']
+    max_items = max_items if max_items is not None else LOGGING_CONFIG['max_items']
+    if isinstance(value, str):
+        if len(value) > max_chars:
+            return f"{value[:max_chars]}...(+{len(value) - max_chars} chars)"
+        return value
+    if _depth >= 4:
+        return f"<{type(value).__name__}>"
+    if isinstance(value, dict):
+        items = list(value.items())
+        result = {str(k): truncate(v, max_chars, max_items, _depth + 1) for k, v in items[:max_items]}
+        if len(items) > max_items:
+            result['...'] = f"+{len(items) - max_items} keys"
+        return result
+    if isinstance(value, (list, tuple)):
+        result = [truncate(v, max_chars, max_items, _depth + 1) for v in value[:max_items]]
+        if len(value) > max_items:
+            result.append(f"...(+{len(value) - max_items} items)")
+        return result
+    return value
+
+
+def redact(value: Any, fields: Optional[set] = None) -> Any:
+    """본문/인증 필드를 길이 정보로 대체"""
+    fields = fields if fields is not None else set(LOGGING_CONFIG['redact_fields'])
+    if isinstance(value, dict):
+        result = {}
+        for k, v in value.items():
+            if k in fields and v is not None:
+                size = len(v) if isinstance(v, (str, bytes, list, dict)) else None
+                result[k] = f"<redacted len={size}>" if size is not None else "<redacted>"
+            else:
+                result[k] = redact(v, fields)
+        return result
+    if isinstance(value, list):
+        return [redact(v, fields) for v in value]
+    return value
+
+
+class lazy:
+    """로그 인자 지연 평가 - logger.info("x: %s", lazy(func, arg))는 레벨이 켜져 있을 때만 func 호출"""
+
+    __slots__ = ('_func', '_args')
+
+    def __init__(self, func: Callable[..., Any], *args: Any):
+        self._func = func
+        self._args = args
+
+    def __str__(self) -> str:
+        value = self._func(*self._args)
+        return value if isinstance(value, str) else json.dumps(value, ensure_ascii=False, default=str)
+
 
+class JsonFormatter(logging.Formatter):
+    """로그 레코드를 JSON 한 줄로 출력 (extra 필드 포함, 길이 제한)"""
 
-def setup_logger(name: str, level: str = 'INFO') -> logging.Logger:
-    """로거 설정"""
+    def format(self, record: logging.LogRecord) -> str:
+        message = record.getMessage()
+        max_message = LOGGING_CONFIG['max_message_chars']
+        if len(message) > max_message:
+            message = f"{message[:max_message]}...(+{len(message) - max_message} chars)"
+
+        document: Dict[str, Any] = {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(record.created))
+                         + f'.{int(record.msecs):03d}Z',
+            'level': record.levelname,
+            'logger': record.name,
+            'message': message
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                document[key] = truncate(value)
+        if record.exc_info:
+            document['exception'] = self.formatException(record.exc_info)
+        return json.dumps(document, ensure_ascii=False, default=str)
+
+
+def _formatter() -> logging.Formatter:
+    if LOGGING_CONFIG['format'] == 'json':
+        return JsonFormatter()
+    return logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+
+def setup_logger(name: str, level: Optional[str] = None) -> logging.Logger:
+    """로거 설정 (레벨 미지정 시 LAMBDA_CONFIG['log_level'])"""
     logger = logging.getLogger(name)
-    
+
     if not logger.handlers:
         handler = logging.StreamHandler()
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        handler.setFormatter(formatter)
+        handler.setFormatter(_formatter())
         logger.addHandler(handler)
-    
-    logger.setLevel(getattr(logging, level.upper(), logging.INFO))
+        # Lambda 런타임의 루트 핸들러로 같은 줄이 한 번 더 나가지 않도록 함
+        logger.propagate = False
+
+    logger.setLevel(getattr(logging, (level or LAMBDA_CONFIG['log_level']).upper(), logging.INFO))
     return logger
 
 
-def log_lambda_event(logger: logging.Logger, event: Dict[str, Any]) -> None:
-    """Lambda 이벤트 로깅"""
-    logger.info(f"Lambda Event: {json.dumps(event, default=str)}")
-    
-    # 주요 정보 추출 로깅
-    http_method = event.get('httpMethod', 'N/A')
-    path = event.get('path', event.get('rawPath', 'N/A'))
-    logger.info(f"Request: {http_method} {path}")
\ No newline at end of file
+# 기존 핸들러 호환 이름
+get_logger = setup_logger
+
+
+def summarize_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Lambda 이벤트 요약 (본문 대신 크기/키만)"""
+    request_context = event.get('requestContext') or {}
+    summary = {
+        'method': event.get('httpMethod') or (request_context.get('http') or {}).get('method'),
+        'path': event.get('path') or event.get('rawPath') or request_context.get('routeKey'),
+        'connectionId': request_context.get('connectionId'),
+        'pathParameters': event.get('pathParameters'),
+        'queryStringParameters': redact(event.get('queryStringParameters'))
+    }
+    body = event.get('body')
+    if body:
+        summary['bodySize'] = len(body) if isinstance(body, (str, bytes)) else None
+        try:
+            parsed = json.loads(body) if isinstance(body, (str, bytes)) else body
+        except ValueError:
+            parsed = None
+        if isinstance(parsed, dict):
+            summary['bodyKeys'] = sorted(parsed)[:LOGGING_CONFIG['max_items']]
+            if 'action' in parsed:
+                summary['action'] = parsed['action']
+    return {k: v for k, v in summary.items() if v is not None}
+
+
+def log_lambda_event(logger: logging.Logger, event: Dict[str, Any], label: str = 'Lambda Event') -> None:
+    """Lambda 이벤트 로깅 - 요약은 INFO, 마스킹된 전체 이벤트는 DEBUG 또는 샘플링된 호출만"""
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(label, extra={'event': summarize_event(event)})
+
+    if logger.isEnabledFor(logging.DEBUG) or random.random() < LOGGING_CONFIG['event_sample_rate']:
+        logger.log(
+            max(logger.getEffectiveLevel(), logging.DEBUG),
+            f"{label} (full)",
+            extra={'event': redact(event), 'sampled': not logger.isEnabledFor(logging.DEBUG)}
+        )
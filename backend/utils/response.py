@@ -1,9 +1,97 @@
 """
 API Response Utilities
 통일된 API 응답 포맷 제공
+- 라우트별 Cache-Control, ETag / If-None-Match 조건부 응답(304)
+- Accept-Encoding에 따른 gzip/brotli 응답 압축 (base64 본문)
 """
-import json
-from typing import Any, Dict, Optional
+import base64
+import functools
+import gzip
+import hashlib
+from typing import Any, Callable, Dict, Optional
+
+from src.config.aws import RESPONSE_COMPRESSION_CONFIG
+from utils.serialization import dumps
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성
+    brotli = None
+
+
+def request_header(event: Dict[str, Any], name: str) -> Optional[str]:
+    """요청 헤더 조회 (REST API는 원래 대소문자, HTTP API는 소문자로 전달)"""
+    headers = event.get('headers') or {}
+    value = headers.get(name)
+    if value is None:
+        lowered = name.lower()
+        for key, header_value in headers.items():
+            if key.lower() == lowered:
+                return header_value
+    return value
+
+
+def make_etag(*parts: Any) -> str:
+    """버전 값(updatedAt 등)으로 약한 ETag 생성 - 같은 값이면 같은 표현"""
+    digest = hashlib.sha1('\x1f'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    return f'W/"{digest[:20]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    """If-None-Match 비교 (약한 비교, 목록과 * 지원)"""
+    if not if_none_match or not etag:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    opaque = etag[2:] if etag.startswith('W/') else etag
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def parse_accept_encoding(header: Optional[str]) -> Dict[str, float]:
+    """Accept-Encoding -> {인코딩: q 값}"""
+    accepted = {}
+    for part in (header or '').split(','):
+        name, _, params = part.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[name] = quality
+    return accepted
+
+
+def negotiate_encoding(header: Optional[str]) -> Optional[str]:
+    """지원하는 압축 방식 중 클라이언트가 받는 것 (q 값이 높은 순, 같으면 설정 순서)"""
+    accepted = parse_accept_encoding(header)
+    if not accepted:
+        return None
+    best, best_quality = None, 0.0
+    for encoding in RESPONSE_COMPRESSION_CONFIG['encodings']:
+        if encoding == 'br' and brotli is None:
+            continue
+        quality = accepted.get(encoding, accepted.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def _compress(encoding: str, raw: bytes) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(raw, quality=RESPONSE_COMPRESSION_CONFIG['brotli_quality'])
+    return gzip.compress(raw, compresslevel=RESPONSE_COMPRESSION_CONFIG['gzip_level'])
 
 
 class APIResponse:
@@ -13,17 +101,93 @@ class APIResponse:
     CORS_HEADERS = {
         'Content-Type': 'application/json',
         'Access-Control-Allow-Origin': '*',
-        'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-        'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS,PATCH'
+        'Access-Control-Allow-Headers': 'Content-Type,Authorization,If-None-Match',
+        'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS,PATCH',
+        'Access-Control-Expose-Headers': 'ETag'
     }
     
+    # Cache-Control 정책
+    NO_STORE = 'no-store'
+    # 캐시는 하되 매번 ETag로 재검증 (사용자별 데이터라 공유 캐시는 금지)
+    REVALIDATE = 'private, no-cache'
+    
+    @classmethod
+    def headers(cls, cache_control: Optional[str] = None, etag: Optional[str] = None) -> Dict[str, str]:
+        """CORS 헤더 + 라우트별 캐시 헤더"""
+        headers = dict(cls.CORS_HEADERS)
+        headers['Cache-Control'] = cache_control or cls.NO_STORE
+        if etag:
+            headers['ETag'] = etag
+        return headers
+    
     @classmethod
-    def success(cls, data: Any = None, status_code: int = 200) -> Dict:
+    def success(
+        cls,
+        data: Any = None,
+        status_code: int = 200,
+        cache_control: Optional[str] = None,
+        etag: Optional[str] = None
+    ) -> Dict:
         """성공 응답 생성"""
         return {
             'statusCode': status_code,
-            'headers': cls.CORS_HEADERS,
-            'body': json.dumps(data, default=str, ensure_ascii=False)
+            'headers': cls.headers(cache_control, etag),
+            'body': dumps(data)
+        }
+    
+    @classmethod
+    def not_modified(cls, etag: str, cache_control: Optional[str] = None) -> Dict:
+        """304 응답 (본문 없음)"""
+        return {
+            'statusCode': 304,
+            'headers': cls.headers(cache_control or cls.REVALIDATE, etag),
+            'body': ''
+        }
+    
+    @classmethod
+    def conditional(
+        cls,
+        event: Dict[str, Any],
+        etag: Optional[str],
+        cache_control: Optional[str] = None
+    ) -> Optional[Dict]:
+        """요청의 If-None-Match가 etag와 일치하면 304 응답, 아니면 None"""
+        if etag_matches(request_header(event, 'If-None-Match'), etag):
+            return cls.not_modified(etag, cache_control)
+        return None
+    
+    @classmethod
+    def compress(cls, response: Dict, event: Dict[str, Any]) -> Dict:
+        """
+        큰 본문을 Accept-Encoding에 맞춰 압축 (base64 본문 + Content-Encoding)
+        작거나 압축 이득이 없는 본문은 그대로 반환
+        """
+        body = response.get('body') if isinstance(response, dict) else None
+        if (
+            not RESPONSE_COMPRESSION_CONFIG['enabled']
+            or not isinstance(body, str)
+            or response.get('isBase64Encoded')
+            or len(body) * 4 < RESPONSE_COMPRESSION_CONFIG['min_bytes']
+        ):
+            return response
+        raw = body.encode('utf-8')
+        if len(raw) < RESPONSE_COMPRESSION_CONFIG['min_bytes']:
+            return response
+        
+        # 크기 기준을 넘는 응답은 압축 여부가 요청에 따라 달라짐
+        headers = dict(response.get('headers') or {})
+        headers['Vary'] = 'Accept-Encoding'
+        encoding = negotiate_encoding(request_header(event, 'Accept-Encoding'))
+        data = _compress(encoding, raw) if encoding else None
+        if data is None or len(data) >= len(raw):
+            return {**response, 'headers': headers}
+        
+        headers['Content-Encoding'] = encoding
+        return {
+            **response,
+            'headers': headers,
+            'body': base64.b64encode(data).decode('ascii'),
+            'isBase64Encoded': True
         }
     
     @classmethod
@@ -31,8 +195,8 @@ class APIResponse:
         """에러 응답 생성"""
         return {
             'statusCode': status_code,
-            'headers': cls.CORS_HEADERS,
-            'body': json.dumps({'error': message}, ensure_ascii=False)
+            'headers': cls.headers(),
+            'body': dumps({'error': message})
         }
     
     @classmethod
@@ -45,6 +209,14 @@ class APIResponse:
         }
 
 
+def compress_response(handler: Callable) -> Callable:
+    """REST 핸들러 데코레이터 - 반환한 응답을 APIResponse.compress로 협상/압축"""
+    @functools.wraps(handler)
+    def wrapper(event, context):
+        return APIResponse.compress(handler(event, context), event)
+    return wrapper
+
+
 class WebSocketResponse:
     """WebSocket 응답 생성 헬퍼"""
     
@@ -0,0 +1,97 @@
+"""
+JSON Serialization Utilities
+응답/WebSocket 프레임 직렬화
+- DynamoDB Decimal을 한 번의 인코딩 과정에서 숫자로 변환 (정수는 int, 나머지는 float)
+- orjson이 설치되어 있으면 사용, 없으면 표준 json (SERIALIZATION_CONFIG['json_backend'])
+- ai_chunk 프레임은 요청별 고정 부분을 미리 인코딩해 청크마다 dict를 만들지 않음
+"""
+import json
+import logging
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Optional
+
+from src.config.aws import SERIALIZATION_CONFIG
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def _default(obj: Any) -> Any:
+    """기본 인코더가 처리하지 못하는 값 (Decimal은 숫자, 나머지는 기존과 같이 str)"""
+    if isinstance(obj, Decimal):
+        if not obj.is_finite():
+            return str(obj)
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    return str(obj)
+
+
+# 표준 json 인코더 (공백 없는 구분자, 한글 그대로)
+_stdlib_encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=_default)
+
+# datetime은 기존 default=str과 같은 형식을 유지하도록 _default로 넘김
+_ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if orjson else 0
+
+
+def _select_backend() -> str:
+    backend = SERIALIZATION_CONFIG['json_backend']
+    if backend == 'json':
+        return 'json'
+    if orjson is None:
+        if backend == 'orjson':
+            logger.warning("orjson is not installed, falling back to json")
+        return 'json'
+    return 'orjson'
+
+
+BACKEND = _select_backend()
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """UTF-8 JSON 바이트 (WebSocket 전송용)"""
+    if BACKEND == 'orjson':
+        try:
+            return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+        except TypeError:
+            # 64비트 범위를 넘는 정수 등 orjson이 거부하는 값은 표준 json으로
+            pass
+    return _stdlib_encoder.encode(obj).encode('utf-8')
+
+
+def dumps(obj: Any) -> str:
+    """JSON 문자열 (Lambda 프록시 응답 body용)"""
+    if BACKEND == 'orjson':
+        try:
+            return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS).decode('utf-8')
+        except TypeError:
+            pass
+    return _stdlib_encoder.encode(obj)
+
+
+class ChunkFrameEncoder:
+    """
+    ai_chunk 프레임 인코더
+    {"type":"ai_chunk","requestId":...,"chunk":...,"chunk_index":...,["replayed":true,]"timestamp":...}
+    type/requestId/replayed 부분은 생성 시 한 번만 인코딩
+    """
+
+    __slots__ = ('_head', '_tail')
+
+    def __init__(self, request_id: str, replayed: bool = False):
+        self._head = b'{"type":"ai_chunk","requestId":' + dumps_bytes(request_id) + b',"chunk":'
+        self._tail = (b',"replayed":true' if replayed else b'') + b',"timestamp":"'
+
+    def encode(self, chunk: str, chunk_index: int, timestamp: Optional[str] = None) -> bytes:
+        return b''.join((
+            self._head,
+            dumps_bytes(chunk),
+            b',"chunk_index":',
+            str(chunk_index).encode('ascii'),
+            self._tail,
+            (timestamp or datetime.utcnow().isoformat() + 'Z').encode('ascii'),
+            b'"}'
+        ))